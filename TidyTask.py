@@ -11,12 +11,95 @@
 #               (3) Search Service (big pool), (4) Sort Service (big pool), (5) Filter Service (big pool)
 
 
-from TidyTaskModules import print_welcome, import_list, main_menu, main_menu_route
+import argparse
+from TidyTaskDuplicates import use_near_duplicates
+from TidyTaskModules import (bench_formats, print_memory_report, print_welcome, main_menu, main_menu_route,
+                             set_list_bodies, set_list_storage, use_daemon, validate_workspace_name, workspaces)
 
 def main():
+    parser = argparse.ArgumentParser(description="Tidy Task: a simple terminal to do list.")
+    parser.add_argument('command', nargs='?', choices=['bench-formats', 'sync', 'sync-serve', 'shard', 'unshard',
+                                                       'split', 'unsplit', 'memory'],
+                        help="bench-formats: time list file formats on your list and pick the fastest; "
+                             "sync: sync your list with --peer; sync-serve: serve your list for syncing; "
+                             "shard/unshard: store your list in shards by due month, or in one file; "
+                             "split/unsplit: keep descriptions in a separate file loaded when needed, or in the list; "
+                             "memory: show how much memory your list takes")
+    parser.add_argument('--list', default=None, metavar='NAME',
+                        help="name of the list (workspace) to use; lists other than 'default' are kept in lists/")
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help="also flag new tasks whose titles are similar to a task due the same day")
+    parser.add_argument('--peer', default=None, help="list file or tcp:// endpoint to sync with")
+    parser.add_argument('--tui', action='store_true', help="use the full-screen (curses) interface")
+    parser.add_argument('--daemon', action='store_true', help="serve the list to many clients at once")
+    parser.add_argument('--connect', action='store_true', help="use the list served by a running daemon")
+    parser.add_argument('--endpoint', default=None, help="daemon endpoint (default tcp://127.0.0.1:5570)")
+    args = parser.parse_args()
+
+    if args.list:
+        try:
+            workspaces.switch(validate_workspace_name(args.list))
+        except ValueError as e:
+            parser.error(str(e))
+    filename = workspaces.current_file
+    if args.near_duplicates:
+        use_near_duplicates(True)
+
+    if args.command == 'bench-formats':
+        bench_formats(filename)
+        return
+    if args.command in ('shard', 'unshard'):
+        set_list_storage(filename, args.command == 'shard')
+        print("Your list is now stored in shards by due month." if args.command == 'shard'
+              else "Your list is now stored in a single file.")
+        return
+    if args.command in ('split', 'unsplit'):
+        if not set_list_bodies(filename, args.command == 'split'):
+            print("Your list is stored in shards. Run 'unshard' first.")
+        else:
+            print("Your list now keeps descriptions in a separate file." if args.command == 'split'
+                  else "Your list now keeps descriptions in the list file.")
+        return
+    if args.command == 'memory':
+        print_memory_report(filename)
+        return
+    if args.command in ('sync', 'sync-serve'):
+        from TidyTaskSync import SYNC_ENDPOINT, serve_sync, sync_with_peer
+        if args.command == 'sync-serve':
+            serve_sync(filename, args.endpoint or SYNC_ENDPOINT)
+        elif not args.peer:
+            parser.error("sync needs --peer (list file or tcp:// endpoint)")
+        else:
+            sync_with_peer(filename, args.peer)
+        return
+
+    if args.tui and args.connect:
+        parser.error("--tui shows local lists only; it can't be used with --connect")
+
+    if args.daemon or args.connect:
+        from TidyTaskDaemon import DAEMON_ENDPOINT, DaemonClient, TaskDaemon
+        endpoint = args.endpoint or DAEMON_ENDPOINT
+        if args.daemon:
+            TaskDaemon(filename, endpoint).serve()
+            return
+        client = DaemonClient(endpoint)
+        use_daemon(client)
+
+    if args.tui:
+        from TidyTaskTUI import run_tui
+        run_tui()
+        return
+
     print_welcome()
     while True:
-        user_list = import_list('userlist.pkl')
+        try:
+            user_list = client.fetch_list() if args.connect else workspaces.current_list()
+        # Task daemon did not respond
+        except RuntimeError as e:
+            print(f"\n(!) {e}")
+            if input("\nPress ENTER to try again, or 'Q' to quit: ").strip().upper() == 'Q':
+                break
+            continue
         main_menu_response = main_menu()
         continue_app = main_menu_route(main_menu_response, user_list)
         if not continue_app:
@@ -0,0 +1,183 @@
+# Description:  Productivity analytics computed locally with NumPy: burndown,
+#               throughput per week, mean time-to-complete by priority, and overdue aging.
+#               Task fields are loaded as columns (one array per field), straight from the
+#               snapshot's fixed-width records where possible, and every metric is computed
+#               with array operations rather than a loop over tasks.
+#               Requires numpy.
+
+
+from datetime import date, datetime
+import numpy as np
+from TidyTaskSnapshot import RECORD, STATUS_CODES, open_snapshot
+
+
+# Snapshot record layout (see TidyTaskSnapshot.RECORD)
+RECORD_DTYPE = np.dtype({
+    'names': ['id', 'priority', 'status', 'due', 'created', 'completed'],
+    'formats': ['<i8', 'i1', 'i1', '<i4', '<i8', '<i8'],
+    'offsets': [0, 8, 9, 10, 38, 46],
+    'itemsize': RECORD.size
+})
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+AGING_BUCKETS = [(1, 7), (8, 30), (31, None)]
+
+
+def utc_offset(seconds):
+    """
+    Get local UTC offset in seconds at an epoch time (DST aware).
+    """
+    return int(datetime.fromtimestamp(int(seconds)).astimezone().utcoffset().total_seconds())
+
+
+def local_utc_offsets(seconds):
+    """
+    Get local UTC offset in force at each of an array of epoch seconds.
+    The offset is looked up once per UTC day, and per timestamp only on days it changes (DST).
+
+    :param seconds:     Array of epoch seconds
+    :return:            Array of UTC offsets in seconds (int64)
+    """
+    days, inverse = np.unique(seconds // 86400, return_inverse=True)
+    day_start = np.fromiter((utc_offset(day * 86400) for day in days), np.int64, len(days))
+    day_end = np.fromiter((utc_offset(day * 86400 + 86399) for day in days), np.int64, len(days))
+    offsets = day_start[inverse]
+    for row in np.flatnonzero((day_start != day_end)[inverse]):
+        offsets[row] = utc_offset(seconds[row])
+    return offsets
+
+
+def epoch_to_day(seconds):
+    """
+    Convert array of epoch seconds (0 if unknown) to local day ordinals (0 if unknown).
+    Each time is converted with the UTC offset in force at that time, so days stay right across DST.
+
+    :param seconds:     Array of epoch seconds
+    :return:            Array of day ordinals (int64)
+    """
+    seconds = np.asarray(seconds, dtype=np.int64)
+    known = seconds > 0
+    days = np.zeros(len(seconds), dtype=np.int64)
+    days[known] = (seconds[known] + local_utc_offsets(seconds[known])) // 86400 + EPOCH_ORDINAL
+    return days
+
+
+def columns_from_records(records):
+    """
+    Load task columns from snapshot records without decoding them one by one.
+
+    :param records:     Bytes of snapshot records (SnapshotReader.records)
+    :return:            Dictionary of column name -> array
+    """
+    table = np.frombuffer(records, dtype=RECORD_DTYPE)
+    return {
+        "id": table['id'].copy(),
+        "priority": table['priority'].astype(np.int8),
+        "complete": table['status'] == STATUS_CODES['complete'],
+        "due": table['due'].astype(np.int64),
+        "created": epoch_to_day(table['created'] // 1000000),
+        "completed": epoch_to_day(table['completed'] // 1000000),
+    }
+
+
+def columns_from_tasks(task_list):
+    """
+    Load task columns from Task objects (when there is no usable snapshot).
+
+    :param task_list:   Dictionary of user tasks
+    :return:            Dictionary of column name -> array
+    """
+    tasks = list(task_list.values())
+    count = len(tasks)
+    return {
+        "id": np.fromiter((task.id for task in tasks), np.int64, count),
+        "priority": np.fromiter((int(task.priority) if task.priority else 0 for task in tasks), np.int8, count),
+        "complete": np.fromiter((task.status == 'complete' for task in tasks), bool, count),
+        "due": np.fromiter((task.due_date.toordinal() if task.due_date else 0 for task in tasks), np.int64, count),
+        "created": epoch_to_day(np.fromiter(
+            (int(task.created_at.timestamp()) if task.created_at else 0 for task in tasks), np.int64, count)),
+        "completed": epoch_to_day(np.fromiter(
+            (int(task.completed_at.timestamp()) if task.completed_at else 0 for task in tasks), np.int64, count)),
+    }
+
+
+def load_columns(filename, task_list):
+    """
+    Load task columns from the saved list's snapshot, or from task_list if it has none.
+
+    :param filename:    Filepath of saved list
+    :param task_list:   Dictionary of user tasks
+    :return:            Dictionary of column name -> array
+    """
+    snapshot = open_snapshot(filename)
+    if snapshot is None:
+        return columns_from_tasks(task_list)
+    with snapshot:
+        return columns_from_records(snapshot.records())
+
+
+def burndown(columns, today, days=14):
+    """
+    Count tasks still open at the end of each of the last days.
+    Tasks with no created date count as open from the start. Completed tasks with no
+    completed date are left out, as it is not known on which days they were open.
+
+    :param columns:     Task columns
+    :param today:       Day ordinal of today
+    :param days:        Number of days
+    :return:            Array of day ordinals, array of open task counts
+    """
+    day_range = np.arange(today - days + 1, today + 1)
+    done = columns["complete"] & (columns["completed"] > 0)
+    created = np.sort(columns["created"][done | ~columns["complete"]])
+    completed = np.sort(columns["completed"][done])
+    opened = np.searchsorted(created, day_range, side='right')
+    closed = np.searchsorted(completed, day_range, side='right')
+    return day_range, opened - closed
+
+
+def weekly_throughput(columns, today, weeks=8):
+    """
+    Count tasks completed in each of the last weeks (weeks start on Monday).
+
+    :param columns:     Task columns
+    :param today:       Day ordinal of today
+    :param weeks:       Number of weeks
+    :return:            Array of week start ordinals, array of completed task counts
+    """
+    # Ordinal 1 (Jan 1, year 1) is a Monday
+    first_week = (today - 1) // 7 * 7 + 1 - 7 * (weeks - 1)
+    completed = columns["completed"][columns["complete"] & (columns["completed"] >= first_week)]
+    counts = np.bincount((completed - first_week) // 7, minlength=weeks)[:weeks]
+    return first_week + 7 * np.arange(weeks), counts
+
+
+def mean_time_to_complete(columns):
+    """
+    Mean days from created to completed, by priority.
+    Only completed tasks with both dates known are counted.
+
+    :param columns:     Task columns
+    :return:            Dictionary of priority (0 for none) -> (mean days, task count)
+    """
+    known = columns["complete"] & (columns["created"] > 0) & (columns["completed"] > 0)
+    priority = columns["priority"][known].astype(np.int64)
+    durations = (columns["completed"] - columns["created"])[known]
+    counts = np.bincount(priority, minlength=4)
+    totals = np.bincount(priority, weights=durations, minlength=4)
+    return {int(level): (totals[level] / counts[level], int(counts[level]))
+            for level in np.flatnonzero(counts)}
+
+
+def overdue_aging(columns, today):
+    """
+    Count incomplete, overdue tasks by how many days overdue they are (see AGING_BUCKETS).
+
+    :param columns:     Task columns
+    :param today:       Day ordinal of today
+    :return:            List of ((low, high), task count), high None for no limit
+    """
+    overdue = ~columns["complete"] & (columns["due"] > 0) & (columns["due"] < today)
+    ages = today - columns["due"][overdue]
+    edges = [low for low, _ in AGING_BUCKETS]
+    counts = np.bincount(np.searchsorted(edges, ages, side='right') - 1, minlength=len(AGING_BUCKETS))
+    return list(zip(AGING_BUCKETS, (int(count) for count in counts)))
@@ -0,0 +1,237 @@
+# Description:  Batch envelope for the microservice protocol.
+#               Several operations share one copy of the task data and travel in a single
+#               multipart ZMQ message; their responses come back together in one reply.
+#
+#               Request frames:   [ BATCH_TAG | operations (JSON) | task data (JSON) ]
+#               Reply frames:     [ BATCH_TAG | responses (JSON list, same order) ]
+#
+#               Services that understand the envelope use handle_batch with their own
+#               handlers. For services that only speak single requests, run this file to
+#               start the batch gateway, which unpacks each envelope and passes every
+#               operation on to its service as a single request.
+
+
+import json, zmq
+
+
+BATCH_TAG = b'TTBATCH1'
+BATCH_PORT = 5561
+FORWARD_TIMEOUT = 2000      # Milliseconds the gateway waits for a service to answer
+SERVICE_PORTS = {
+    "completion_rate": 5555,
+    "overdue": 5556,
+    "search": 5558,
+    "sort": 5559,
+    "filter": 5560,
+}
+
+
+def build_service_request(operation, params, task_data):
+    """
+    Build the single (non-batch) request a microservice expects for an operation.
+
+    :param operation:   Name of operation (key of SERVICE_PORTS)
+    :param params:      Dictionary of operation parameters
+    :param task_data:   Task data as created by create_json_data (export keys)
+    :return:            Request dictionary
+    """
+    if operation == "overdue":
+        # Notification Service expects event keys
+        event_keys = {"id": "event_id", "task_name": "event_name"}
+        event_data = [{event_keys.get(key, key): value for key, value in task.items()} for task in task_data]
+        return {"notification_type": "overdue", "event_data": event_data}
+    if operation == "completion_rate":
+        return {"metric_type": "get_completion_rate", "event_type": "task", "event_data": task_data}
+    if operation == "search":
+        return {"search_type": "basic_search", "search_field": params["field"],
+                "search_term": params["term"], "data": task_data}
+    if operation == "sort":
+        return {"sort_type": params["type"], "sort_field": params["field"],
+                "sort_order": params["order"], "data": task_data}
+    if operation == "filter":
+        return {"filter_type": "basic_filter", "data": task_data,
+                "filters": params["filters"], "logical_op": params["logical_op"]}
+    raise ValueError(f"Unknown operation: {operation}")
+
+
+def encode_batch(operations, task_data):
+    """
+    Encode operations and their shared task data as batch request frames.
+
+    :param operations:  List of {"op": name, "params": dict}
+    :param task_data:   Task data shared by all operations
+    :return:            List of frames (bytes)
+    """
+    return [BATCH_TAG, json.dumps(operations).encode('utf-8'), json.dumps(task_data).encode('utf-8')]
+
+
+def decode_batch(frames):
+    """
+    Decode batch request frames.
+    Raises ValueError if frames are not a batch envelope.
+
+    :param frames:      List of frames (bytes)
+    :return:            List of operations, shared task data
+    """
+    if len(frames) != 3 or frames[0] != BATCH_TAG:
+        raise ValueError("Not a batch envelope.")
+    return json.loads(frames[1]), json.loads(frames[2])
+
+
+def handle_batch(frames, handlers):
+    """
+    Answer a batch envelope: run every operation through its handler, in order.
+    An operation without a handler (or whose handler fails) gets an error response.
+
+    :param frames:      Batch request frames
+    :param handlers:    Dictionary of operation name -> function(single request) -> response
+    :return:            Reply frames
+    """
+    operations, task_data = decode_batch(frames)
+    responses = []
+    for operation in operations:
+        handler = handlers.get(operation["op"])
+        if handler is None:
+            responses.append({"status": "error", "message": f"Unsupported operation: {operation['op']}"})
+            continue
+        try:
+            responses.append(handler(build_service_request(operation["op"], operation["params"], task_data)))
+        except Exception as e:
+            responses.append({"status": "error", "message": str(e)})
+    return [BATCH_TAG, json.dumps(responses).encode('utf-8')]
+
+
+class RequestBatch:
+    """
+    Gathers operations on the same task data and sends them in one batch envelope.
+    """
+    def __init__(self, task_data):
+        self.task_data = task_data
+        self.operations = []
+
+    def __len__(self):
+        return len(self.operations)
+
+    def add(self, operation, params=None):
+        """
+        Add operation to batch.
+
+        :param operation:   Name of operation (key of SERVICE_PORTS)
+        :param params:      Dictionary of operation parameters
+        :return:            Index of operation's response in send() result
+        """
+        self.operations.append({"op": operation, "params": params or {}})
+        return len(self.operations) - 1
+
+    def send(self, port=BATCH_PORT, connect_timeout=200, reply_timeout=None):
+        """
+        Send all operations in one round trip.
+        Raises ConnectionError if nothing is listening on port within connect_timeout,
+        or no reply comes within reply_timeout. Raises ValueError if the reply is not a batch.
+
+        :param port:                Port of batch gateway (or batch-aware service)
+        :param connect_timeout:     Milliseconds to wait for connection to gateway
+        :param reply_timeout:       Milliseconds to wait for reply (default: long enough for the
+                                    gateway to wait FORWARD_TIMEOUT for every operation)
+        :return:                    List of (response dictionary, response size in bytes), in order added
+        """
+        if reply_timeout is None:
+            reply_timeout = FORWARD_TIMEOUT * (len(self.operations) + 1)
+        socket = zmq.Context.instance().socket(zmq.REQ)
+        # Only report writable once actually connected, so a missing gateway is noticed
+        socket.setsockopt(zmq.IMMEDIATE, 1)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.setsockopt(zmq.RCVTIMEO, reply_timeout)
+        socket.connect(f"tcp://localhost:{port}")
+        try:
+            if not socket.poll(connect_timeout, zmq.POLLOUT):
+                raise ConnectionError(f"No batch gateway on port {port}.")
+            socket.send_multipart(encode_batch(self.operations, self.task_data))
+            frames = socket.recv_multipart()
+        except zmq.Again:
+            raise ConnectionError(f"Batch gateway on port {port} did not respond.")
+        finally:
+            socket.close()
+        if len(frames) != 2 or frames[0] != BATCH_TAG:
+            raise ValueError("Invalid batch reply.")
+        responses = json.loads(frames[1])
+        return [(response, len(json.dumps(response))) for response in responses]
+
+
+def forward_handlers(context, timeout=FORWARD_TIMEOUT):
+    """
+    Handlers that pass each operation on to its own service as a single request,
+    over one connection per service kept open for the life of the gateway.
+    A service that does not answer within timeout fails only its own operation
+    (ConnectionError), and its connection is replaced, since a REQ socket that
+    timed out can't be reused.
+
+    :param context:     ZMQ context
+    :param timeout:     Milliseconds to wait for each service
+    :return:            Dictionary of operation name -> handler
+    """
+    def connect(port):
+        socket = context.socket(zmq.REQ)
+        socket.setsockopt(zmq.RCVTIMEO, timeout)
+        socket.setsockopt(zmq.SNDTIMEO, timeout)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(f"tcp://localhost:{port}")
+        return socket
+
+    def make_handler(port):
+        sockets = [connect(port)]
+
+        def forward(request):
+            try:
+                sockets[0].send_json(request)
+                return sockets[0].recv_json()
+            except zmq.Again:
+                sockets[0].close()
+                sockets[0] = connect(port)
+                raise ConnectionError(f"Service on port {port} did not respond.")
+        return forward
+
+    return {operation: make_handler(port) for operation, port in SERVICE_PORTS.items()}
+
+
+def error_reply(frames, message):
+    """
+    Build reply frames with the same error for every operation of a batch envelope
+    (a single error if its operations can't be read).
+
+    :param frames:      Batch request frames
+    :param message:     Error message
+    :return:            Reply frames
+    """
+    try:
+        count = len(json.loads(frames[1])) if len(frames) == 3 else 1
+    except (TypeError, ValueError):
+        count = 1
+    responses = [{"status": "error", "message": message}] * max(count, 1)
+    return [BATCH_TAG, json.dumps(responses).encode('utf-8')]
+
+
+def serve_batch_gateway(port=BATCH_PORT):
+    """
+    Run batch gateway: answer batch envelopes by forwarding operations to their services.
+
+    :param port:    Port to listen on
+    """
+    context = zmq.Context.instance()
+    socket = context.socket(zmq.REP)
+    socket.bind(f"tcp://*:{port}")
+    handlers = forward_handlers(context)
+    print(f"Batch gateway listening on port {port}...")
+
+    while True:
+        frames = socket.recv_multipart()
+        try:
+            reply = handle_batch(frames, handlers)
+        # Always reply, or the REP socket can't take the next request
+        except Exception as e:
+            reply = error_reply(frames, str(e) or type(e).__name__)
+        socket.send_multipart(reply)
+
+
+if __name__ == "__main__":
+    serve_batch_gateway()
@@ -0,0 +1,245 @@
+# Description:  Split layout: task descriptions kept out of memory. A list saved with split
+#               layout keeps its descriptions in a side file (<list>.bodies) instead of its
+#               own file and snapshot, so loading the list only loads the small fields.
+#               A task's description is read from the side file the first time it is used,
+#               through an offset index, and kept in a bounded LRU cache. Descriptions of
+#               added or edited tasks stay in memory until the list is next saved.
+#
+#               Layout:  [ header | description heap | TaskIDs (sorted) | offsets | lengths ]
+
+
+import os, struct
+from array import array
+from bisect import bisect_left
+from TidyTaskCache import QueryCache
+
+
+BODIES_MAGIC = b'TTBODY01'
+HEADER = struct.Struct('<8sQQ')     # magic, count, index offset
+CACHE_ENTRIES = 4096
+CACHE_BYTES = 1024 * 1024
+
+_body_stores = {}
+
+
+def bodies_path(filename):
+    """
+    Get filepath of the description file that belongs to a saved list.
+
+    :param filename:    Filepath of saved list
+    :return:            Filepath of description file (str)
+    """
+    return os.path.splitext(filename)[0] + '.bodies'
+
+
+def is_split(filename):
+    """
+    Check if saved list keeps its descriptions in a description file.
+    """
+    return os.path.exists(bodies_path(filename))
+
+
+class DeferredDescription:
+    """
+    Stands in for the description of every task of a split list that is not loaded yet.
+    One per BodyStore, shared by all its tasks. Saved as a blank description:
+    the description itself is in the description file.
+    """
+    __slots__ = ('store',)
+
+    def __init__(self, store):
+        self.store = store
+
+    def load(self, task_id):
+        return self.store.get(task_id)
+
+    def __reduce__(self):
+        return str, ()
+
+
+class BodyStore:
+    """
+    Reads descriptions of one split list from its description file, on demand.
+    Only the offset index (20 bytes per description) is kept in memory, plus the LRU cache.
+    """
+    def __init__(self, filename, cache_entries=CACHE_ENTRIES, cache_bytes=CACHE_BYTES):
+        self.filename = filename
+        self.path = bodies_path(filename)
+        self.placeholder = DeferredDescription(self)
+        self.cache = QueryCache(cache_entries, cache_bytes)
+        self._file = None
+        self._ids = array('q')
+        self._offsets = array('Q')
+        self._lengths = array('I')
+        self._stat = None       # (mtime, size) of description file when opened
+
+    def _open(self):
+        """
+        Open description file and read its offset index, if not open (or changed since).
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            self.close()
+            return False
+        stat = (stat.st_mtime_ns, stat.st_size)
+        if self._file is not None and stat == self._stat:
+            return True
+        self.close()
+        self._file = open(self.path, 'rb')
+        magic, count, index_offset = HEADER.unpack(self._file.read(HEADER.size))
+        if magic != BODIES_MAGIC:
+            self.close()
+            raise ValueError("Not a Tidy Task description file.")
+        self._file.seek(index_offset)
+        self._ids.frombytes(self._file.read(8 * count))
+        self._offsets.frombytes(self._file.read(8 * count))
+        self._lengths.frombytes(self._file.read(4 * count))
+        self._stat = stat
+        return True
+
+    def close(self):
+        """
+        Close description file and drop index and cache. Reopened on next read.
+        """
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._ids, self._offsets, self._lengths = array('q'), array('Q'), array('I')
+        self._stat = None
+        self.cache.invalidate()
+
+    def _read_raw(self, task_id):
+        """
+        Read encoded description of TaskID from the open file (b'' if it has none).
+        """
+        row = bisect_left(self._ids, task_id)
+        if row == len(self._ids) or self._ids[row] != task_id:
+            return b''
+        self._file.seek(self._offsets[row])
+        return self._file.read(self._lengths[row])
+
+    def get(self, task_id):
+        """
+        Get description of task, from the cache or else the description file.
+
+        :param task_id:     TaskID
+        :return:            Description (str, blank if none)
+        """
+        hit, description = self.cache.lookup(task_id)
+        if hit:
+            return description
+        data = self._read_raw(task_id) if self._open() else b''
+        description = data.decode('utf-8')
+        self.cache.store(task_id, description, len(data))
+        return description
+
+    def attach(self, tasks):
+        """
+        Make tasks read their descriptions from this store.
+
+        :param tasks:   Iterable of Task objects
+        """
+        for task in tasks:
+            task.description = self.placeholder
+
+    def write(self, tasks):
+        """
+        Write descriptions of tasks to a new description file, then attach tasks to it.
+        Descriptions not loaded are copied across from the old file without decoding them.
+        Written to a temp file first, so readers never see a half-written file.
+
+        :param tasks:   Iterable of Task objects, in list order
+        """
+        tasks = list(tasks)
+        has_file = self._open()
+        ids, offsets, lengths = array('q'), array('Q'), array('I')
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as outputfile:
+            outputfile.write(bytes(HEADER.size))
+            for task in tasks:
+                deferred = task.deferred_description
+                if deferred is not None and deferred.store is self and has_file:
+                    data = self._read_raw(task.id)
+                else:
+                    data = str(task.description or "").encode('utf-8')
+                if data:
+                    ids.append(int(task.id))
+                    offsets.append(outputfile.tell())
+                    lengths.append(len(data))
+                    outputfile.write(data)
+
+            index_offset = outputfile.tell()
+            order = sorted(range(len(ids)), key=ids.__getitem__)
+            outputfile.write(array('q', (ids[row] for row in order)).tobytes())
+            outputfile.write(array('Q', (offsets[row] for row in order)).tobytes())
+            outputfile.write(array('I', (lengths[row] for row in order)).tobytes())
+            outputfile.seek(0)
+            outputfile.write(HEADER.pack(BODIES_MAGIC, len(ids), index_offset))
+
+        self.close()
+        os.replace(temp_path, self.path)
+        self.attach(tasks)
+
+    def stats(self):
+        """
+        Get size of description file and index, and cache statistics.
+
+        :return:    Dictionary of stat name/value pairs
+        """
+        self._open()
+        stats = self.cache.stats()
+        stats.update({
+            "descriptions": len(self._ids),
+            "file_bytes": self._stat[1] if self._stat else 0,
+            "index_bytes": 20 * len(self._ids),
+            "cache_limit": self.cache.max_bytes,
+        })
+        return stats
+
+
+def load_descriptions(tasks):
+    """
+    Read descriptions of tasks into memory, so they no longer depend on a description file.
+
+    :param tasks:   Iterable of Task objects
+    """
+    for task in tasks:
+        if task.deferred_description is not None:
+            task.description = task.description
+
+
+def get_body_store(filename, create=False):
+    """
+    Get description store of saved list, if it has split layout.
+
+    :param filename:    Filepath of saved list
+    :param create:      True to get a store even if the list has no description file yet
+    :return:            BodyStore, or None if descriptions are kept in the list itself
+    """
+    if not create and not is_split(filename):
+        drop_body_store(filename)
+        return None
+    store = _body_stores.get(filename)
+    if store is None:
+        store = _body_stores[filename] = BodyStore(filename)
+    return store
+
+
+def drop_body_store(filename):
+    """
+    Close description file of saved list and drop its cache (e.g. when the list is closed).
+    Tasks still holding its placeholder reopen it when read.
+
+    :param filename:    Filepath of saved list
+    """
+    store = _body_stores.pop(filename, None)
+    if store is not None:
+        store.close()
+
+
+def open_body_stores():
+    """
+    Get description stores opened so far, by filepath of saved list.
+    """
+    return dict(_body_stores)
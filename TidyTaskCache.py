@@ -0,0 +1,121 @@
+# Description:  Result cache for microservice queries (search, filter, overdue, progress).
+#               Entries are keyed by (operation, normalized parameters, store revision),
+#               so any save of the list makes older entries unreachable.
+#               Evicts least recently used entries past an entry count or byte budget.
+
+
+import json, os
+from collections import OrderedDict
+
+
+_revisions = {}
+
+
+def store_revision(filename):
+    """
+    Get current revision of saved list: (saves made by this process, file mtime).
+    The mtime catches saves made by other processes.
+
+    :param filename:    Filepath of saved list
+    :return:            Revision (tuple)
+    """
+    try:
+        mtime = os.stat(filename).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return _revisions.get(filename, 0), mtime
+
+
+def bump_revision(filename):
+    """
+    Mark saved list as changed and drop cached results for older revisions.
+
+    :param filename:    Filepath of saved list
+    """
+    _revisions[filename] = _revisions.get(filename, 0) + 1
+    query_cache.invalidate()
+
+
+def normalize_params(params):
+    """
+    Convert query parameters to a hashable, order-independent key.
+
+    :param params:  Dictionary of query parameters
+    :return:        Normalized parameters (str)
+    """
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class QueryCache:
+    """
+    LRU cache of query results, bounded by entry count and total byte size.
+    """
+    def __init__(self, max_entries=64, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key):
+        """
+        Look up cached result, marking it most recently used.
+
+        :param key:     Cache key
+        :return:        (True, result) on hit, (False, None) on miss
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, self._entries[key][0]
+        self.misses += 1
+        return False, None
+
+    def store(self, key, result, size):
+        """
+        Cache result, evicting least recently used entries if over budget.
+        Results larger than the whole byte budget are not cached.
+
+        :param key:     Cache key
+        :param result:  Query result
+        :param size:    Size of result in bytes
+        """
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (result, size)
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self):
+        """
+        Drop all cached results.
+        """
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        """
+        Get cache statistics.
+
+        :return:    Dictionary of stat name/value pairs
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "evictions": self.evictions,
+        }
+
+
+query_cache = QueryCache()
@@ -0,0 +1,441 @@
+# Description:  Shared task daemon. One process owns the in-memory task list and serves
+#               add/edit/complete/view/search/filter to many clients over a ZMQ ROUTER socket.
+#               Requests are handled concurrently by a pool of worker threads, and writes
+#               are group-committed: every write waiting within one commit window is saved
+#               with a single write of the list, then all of them are answered.
+#
+#               Start with:  python TidyTask.py --daemon
+#               Connect with: python TidyTask.py --connect
+
+
+import threading, time, zmq
+from TidyTaskDuplicates import find_duplicates, get_duplicate_index
+from TidyTaskModules import (add_new_tasks, convert_dict_to_task, create_json_data, import_list,
+                             rebuild_task_dict, record_task_changes, validate_date_input, validate_priority_input)
+from TidyTaskRecurrence import (UNITS, RecurrenceRule, due_date_window, is_recurring, matching_occurrences,
+                                occurrence_key, split_task_key)
+from TidyTaskSnapshot import SnapshotTaskList
+from TidyTaskViews import get_field_value, task_matches_filters
+
+
+DAEMON_ENDPOINT = "tcp://127.0.0.1:5570"
+WORKER_ENDPOINT = "inproc://tidytask-workers-{}"     # Per daemon, so several can run in one process
+WRITE_OPS = ('add', 'edit', 'complete', 'reorder')
+EDITABLE_FIELDS = ('task_name', 'description', 'due_date', 'priority', 'recurrence')
+CLIENT_TIMEOUT = 10000      # Milliseconds a client waits for the daemon
+
+
+def encode_date(value):
+    """
+    Convert due date to string for JSON ("" if blank).
+    """
+    return value.strftime("%Y-%m-%d") if value else ""
+
+
+def encode_recurrence(rule):
+    """
+    Convert recurrence rule to string for JSON ("" if none).
+    """
+    return rule.spec() if rule else ""
+
+
+def decode_recurrence(spec):
+    """
+    Convert recurrence rule received as JSON back to RecurrenceRule (None if none).
+    Raise ValueError if invalid.
+    """
+    if not spec:
+        return None
+    try:
+        rule = RecurrenceRule.from_spec(spec)
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError(f"Invalid repeat rule: {spec}")
+    if rule.unit not in UNITS or rule.interval < 1:
+        raise ValueError(f"Invalid repeat rule: {spec}")
+    return rule
+
+
+def decode_field(attribute, value):
+    """
+    Validate a task field value received as JSON and convert it to a task attribute value.
+    Raise ValueError if invalid.
+
+    :param attribute:   Attribute name (one of EDITABLE_FIELDS)
+    :param value:       JSON value
+    :return:            Attribute value
+    """
+    if attribute not in EDITABLE_FIELDS:
+        raise ValueError(f"Field can't be edited: {attribute}")
+    if attribute == 'recurrence':
+        return decode_recurrence(value)
+    if attribute in ('due_date', 'priority') and value in ("", None):
+        return ""
+    if attribute == 'due_date':
+        return validate_date_input(str(value))
+    if attribute == 'priority':
+        return validate_priority_input(value)
+    if not isinstance(value, str) or (attribute == 'task_name' and not value.strip()):
+        raise ValueError(f"Invalid {attribute.replace('_', ' ')}.")
+    return value
+
+
+def decode_updates(updates):
+    """
+    Convert edited field values received as JSON back to task attribute values.
+    Every field is validated first, so an invalid edit changes nothing.
+    Raise ValueError if any field is invalid.
+
+    :param updates:     Dictionary of attribute names and JSON values
+    :return:            Dictionary of attribute names and values
+    """
+    if not isinstance(updates, dict):
+        raise ValueError("Edit must be a dictionary of fields.")
+    return {attribute: decode_field(attribute, value) for attribute, value in updates.items()}
+
+
+def encode_rows(rows):
+    """
+    Convert rows of new tasks to JSON-compatible lists (see decode_rows).
+
+    :param rows:    List of (task_name, description, due_date, priority[, recurrence])
+    :return:        List of [task_name, description, due_date, priority, recurrence]
+    """
+    return [[name, description, encode_date(due_date), priority, encode_recurrence(recurrence)]
+            for name, description, due_date, priority, recurrence in (tuple(row) + (None,) * (5 - len(row))
+                                                                      for row in rows)]
+
+
+def decode_rows(rows):
+    """
+    Convert rows of new tasks received as JSON back to task data, validating every field.
+    Raise ValueError if any row is invalid.
+
+    :param rows:    List of [task_name, description, due_date, priority, recurrence]
+    :return:        List of (task_name, description, due_date, priority, recurrence)
+    """
+    if not isinstance(rows, list) or not all(isinstance(row, list) and len(row) == 5 for row in rows):
+        raise ValueError("Rows must be lists of 5 fields.")
+    return [tuple(decode_field(attribute, value) for attribute, value in zip(EDITABLE_FIELDS, row)) for row in rows]
+
+
+class TaskDaemon:
+    """
+    Owns one in-memory task list and serves it to clients.
+    """
+    def __init__(self, filename='userlist.pkl', endpoint=DAEMON_ENDPOINT, workers=4, commit_window=0.02):
+        self.filename = filename
+        self.endpoint = endpoint
+        self.workers = workers
+        self.commit_window = commit_window
+        loaded = import_list(filename)
+        self.task_list = loaded.materialize() if isinstance(loaded, SnapshotTaskList) else loaded
+
+        # Guards task_list and the commit counters below
+        self._lock = threading.Condition()
+        self._writes = 0            # Writes applied in memory
+        self._committed = 0         # Writes saved to file
+        self._pending_ids = set()   # TaskIDs changed since last commit
+        self._failed = {}           # Write number -> error, for writes whose commit failed
+        self.commits = 0
+
+    # --- Group commit
+
+    def _apply_write(self, apply):
+        """
+        Apply a write to the in-memory list, then wait until a group commit has saved it.
+        Raises RuntimeError if the commit failed.
+
+        :param apply:   Function that changes task_list and returns (result, changed TaskIDs)
+        :return:        Result of apply
+        """
+        with self._lock:
+            result, changed_ids = apply()
+            self._pending_ids.update(changed_ids)
+            self._writes += 1
+            write_num = self._writes
+            self._lock.notify_all()
+            self._lock.wait_for(lambda: self._committed >= write_num)
+            error = self._failed.pop(write_num, None)
+        if error is not None:
+            raise RuntimeError(f"Could not save the list ({error}). The change is kept and saved with the next write.")
+        return result
+
+    def _commit_loop(self):
+        """
+        Save pending writes in groups: wait for a write, let more arrive for one
+        commit window, then save them all with a single write and wake their senders.
+        If the save fails, its senders are told so, and its tasks are saved with the next commit.
+        """
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._writes > self._committed)
+            time.sleep(self.commit_window)
+            with self._lock:
+                target = self._writes
+                changed_ids, self._pending_ids = self._pending_ids, set()
+                try:
+                    record_task_changes(self.task_list, changed_ids, self.filename)
+                    self.commits += 1
+                except Exception as e:
+                    self._pending_ids |= changed_ids
+                    for write_num in range(self._committed + 1, target + 1):
+                        self._failed[write_num] = str(e) or type(e).__name__
+                self._committed = target
+                self._lock.notify_all()
+
+    # --- Operations
+
+    def handle(self, request):
+        """
+        Carry out one client request.
+
+        :param request:     Request dictionary with "op" and its parameters
+        :return:            Response dictionary
+        """
+        try:
+            op = request.get("op")
+            if op in WRITE_OPS:
+                result = self._apply_write(lambda: getattr(self, f"_op_{op}")(request))
+            elif op in ('list', 'view', 'search', 'filter', 'duplicates'):
+                with self._lock:
+                    result = getattr(self, f"_op_{op}")(request)
+            else:
+                return {"status": "error", "message": f"Unknown operation: {op}"}
+        except KeyError as e:
+            return {"status": "error", "message": f"Request is missing {e}."}
+        except (ValueError, RuntimeError) as e:
+            return {"status": "error", "message": str(e)}
+        except Exception as e:
+            return {"status": "error", "message": f"Could not carry out request: {e or type(e).__name__}"}
+        return dict(status="success", **result)
+
+    def _get_task(self, task_id):
+        """
+        Get task from the list. Raise ValueError if there is no such task.
+        """
+        if task_id not in self.task_list:
+            raise ValueError(f"Task not found: {task_id}")
+        return self.task_list[task_id]
+
+    def _op_add(self, request):
+        rows = decode_rows(request["rows"])
+        new_task_ids = add_new_tasks(self.task_list, rows)
+        tasks = {task_id: self.task_list[task_id] for task_id in new_task_ids}
+        return {"tasks": create_json_data(tasks, purpose='store')}, new_task_ids
+
+    def _op_edit(self, request):
+        task_id = int(request["id"])
+        task = self._get_task(task_id)
+        # Validated in full before the shared list is touched
+        updates = decode_updates(request["updates"])
+        for attribute, value in updates.items():
+            task.set_attribute(attribute, value)
+        return {"task": task.convert_to_dict(purpose='store')}, [task_id]
+
+    def _op_complete(self, request):
+        task_id, occurrence = split_task_key(request["id"])
+        task = self._get_task(task_id)
+        task.set_complete(occurrence)
+        return {"task": task.convert_to_dict(purpose='store')}, [task_id]
+
+    def _op_reorder(self, request):
+        order = [int(task_id) for task_id in request["ids"] if int(task_id) in self.task_list]
+        # Tasks added by other clients since the sort keep their place at the end
+        placed = set(order)
+        order += [task_id for task_id in self.task_list if task_id not in placed]
+        reordered = {task_id: self.task_list[task_id] for task_id in order}
+        self.task_list.clear()
+        self.task_list.update(reordered)
+        return {}, []
+
+    def _op_duplicates(self, request):
+        # The daemon's own saves keep its duplicate index up to date
+        rows = decode_rows(request["rows"])
+        return {"matches": find_duplicates(get_duplicate_index(self.filename, self.task_list), rows)}
+
+    def _op_list(self, request):
+        return {"tasks": create_json_data(self.task_list, purpose='store')}
+
+    def _op_view(self, request):
+        incomplete = {task_id: task for task_id, task in self.task_list.items() if task.status == 'incomplete'}
+        return {"tasks": create_json_data(incomplete, purpose='store')}
+
+    def _op_search(self, request):
+        term = str(request["term"]).strip().lower()
+        results = {task_id: task for task_id, task in self.task_list.items()
+                   if term in get_field_value(task, request["field"]).lower()}
+        return {"results": create_json_data(results, purpose='store')}
+
+    def _op_filter(self, request):
+        filters, logical_op = request["filters"], request["logical_op"]
+        # Results limited to a due date window: recurring tasks match by their occurrences in it
+        window = due_date_window(filters, logical_op)
+        recurring = {task_id: task for task_id, task in self.task_list.items() if is_recurring(task)} if window else {}
+        results = {task_id: task for task_id, task in self.task_list.items()
+                   if task_id not in recurring and task_matches_filters(task, filters, logical_op)}
+        occurrences = matching_occurrences(recurring, filters, logical_op, window) if recurring else {}
+        return {"results": create_json_data(results, purpose='store'),
+                "occurrence_results": create_json_data(occurrences, purpose='store')}
+
+    # --- Serving
+
+    def _worker(self, context):
+        socket = context.socket(zmq.REP)
+        socket.connect(WORKER_ENDPOINT.format(id(self)))
+        while True:
+            try:
+                request = socket.recv_json()
+            except ValueError:
+                socket.send_json({"status": "error", "message": "Request is not valid JSON."})
+                continue
+            socket.send_json(self.handle(request))
+
+    def serve(self):
+        """
+        Serve clients until interrupted: ROUTER frontend, worker threads behind an inproc DEALER.
+        """
+        context = zmq.Context.instance()
+        frontend = context.socket(zmq.ROUTER)
+        frontend.bind(self.endpoint)
+        backend = context.socket(zmq.DEALER)
+        backend.bind(WORKER_ENDPOINT.format(id(self)))
+
+        threading.Thread(target=self._commit_loop, daemon=True).start()
+        for _ in range(self.workers):
+            threading.Thread(target=self._worker, args=(context,), daemon=True).start()
+
+        print(f"Tidy Task daemon serving '{self.filename}' on {self.endpoint} "
+              f"({len(self.task_list)} tasks, {self.workers} workers)...")
+        try:
+            zmq.proxy(frontend, backend)
+        except KeyboardInterrupt:
+            print("\nTidy Task daemon stopped.")
+
+
+class DaemonClient:
+    """
+    Thin client for a TaskDaemon. Tasks are sent and received as convert_to_dict('store') dictionaries.
+    """
+    def __init__(self, endpoint=DAEMON_ENDPOINT, timeout=CLIENT_TIMEOUT):
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.socket = None
+        self._connect()
+
+    def _connect(self):
+        """
+        (Re)connect to daemon with a fresh socket. A REQ socket that timed out can't be reused.
+        """
+        if self.socket is not None:
+            self.socket.close()
+        self.socket = zmq.Context.instance().socket(zmq.REQ)
+        self.socket.setsockopt(zmq.RCVTIMEO, self.timeout)
+        self.socket.setsockopt(zmq.SNDTIMEO, self.timeout)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(self.endpoint)
+
+    def call(self, op, **params):
+        """
+        Send request to daemon and wait for its response.
+        Raises RuntimeError if daemon reports an error or does not answer within the timeout.
+
+        :param op:      Name of operation
+        :param params:  Parameters of operation
+        :return:        Response dictionary
+        """
+        try:
+            self.socket.send_json(dict(op=op, **params))
+            response = self.socket.recv_json()
+        except zmq.Again:
+            self._connect()
+            raise RuntimeError(f"Task daemon at {self.endpoint} did not respond.")
+        if response["status"] != "success":
+            raise RuntimeError(response.get("message", "Daemon error."))
+        return response
+
+    def fetch_list(self):
+        """
+        Get the whole list (all tasks, in saved order).
+        """
+        return rebuild_task_dict(self.call('list')["tasks"], purpose='store')
+
+    def view(self):
+        """
+        Get incomplete tasks.
+        """
+        return rebuild_task_dict(self.call('view')["tasks"], purpose='store')
+
+    def add_tasks(self, rows):
+        """
+        Add tasks; daemon allocates their TaskIDs.
+
+        :param rows:    List of (task_name, description, due_date, priority[, recurrence])
+        :return:        List of new Task objects
+        """
+        return [convert_dict_to_task(task, purpose='store') for task in self.call('add', rows=encode_rows(rows))["tasks"]]
+
+    def check_duplicates(self, rows):
+        """
+        Find duplicates of new tasks with the daemon's duplicate index (see find_duplicates).
+        Near duplicates are found if the daemon was started with --near-duplicates.
+
+        :param rows:    List of (task_name, description, due_date, priority[, recurrence])
+        :return:        List with, for each row, ('exact' or 'near', TaskID or None) or None
+        """
+        matches = self.call('duplicates', rows=encode_rows(rows))["matches"]
+        return [tuple(match) if match else None for match in matches]
+
+    def edit_task(self, task_id, updates):
+        """
+        Apply edited field values to task.
+
+        :param task_id:     ID of task to edit
+        :param updates:     Dictionary of attribute names and new values
+        :return:    Edited Task object
+        """
+        encoders = {'due_date': encode_date, 'recurrence': encode_recurrence}
+        updates = {attribute: encoders.get(attribute, lambda value: value)(value)
+                   for attribute, value in updates.items()}
+        return convert_dict_to_task(self.call('edit', id=task_id, updates=updates)["task"], purpose='store')
+
+    def complete_task(self, task_id, occurrence=None):
+        """
+        Mark task (or one occurrence of a recurring task) complete.
+
+        :param task_id:     ID of task to complete
+        :param occurrence:  Date of occurrence of recurring task (None for its next open occurrence)
+        :return:    Completed Task object
+        """
+        key = occurrence_key(task_id, occurrence) if occurrence else task_id
+        return convert_dict_to_task(self.call('complete', id=key)["task"], purpose='store')
+
+    def reorder(self, task_ids):
+        """
+        Save a new order of the list (e.g. after sorting).
+        """
+        self.call('reorder', ids=list(task_ids))
+
+    def search(self, search_field, search_term):
+        """
+        Search tasks in the daemon's list (case-insensitive, within one field).
+
+        :param search_field:    Field to search within
+        :param search_term:     Term to search for
+        :return:    Dictionary of tasks containing search term in field
+        """
+        return rebuild_task_dict(self.call('search', field=search_field, term=search_term)["results"], purpose='store')
+
+    def filter(self, filter_list, logical_op):
+        """
+        Filter tasks in the daemon's list.
+
+        :param filter_list:     List of filters
+        :param logical_op:      'AND' or 'OR'
+        :return:    Dictionary of tasks matching filters (occurrences of recurring tasks keyed by occurrence key)
+        """
+        response = self.call('filter', filters=filter_list, logical_op=logical_op)
+        results = rebuild_task_dict(response["results"], purpose='store')
+        for task in response["occurrence_results"]:
+            occurrence = convert_dict_to_task(task, purpose='store')
+            results[occurrence_key(occurrence.id, occurrence.due_date)] = occurrence
+        return results
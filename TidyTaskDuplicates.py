@@ -0,0 +1,286 @@
+# Description:  Duplicate detection for new tasks. Each saved list keeps an index of its
+#               incomplete tasks by content hash (normalized task name + due date), so a
+#               new task is checked for an exact duplicate with one dictionary lookup.
+#               Optionally (--near-duplicates), a MinHash/LSH index also finds near
+#               duplicates ('Call mom re: dinner' vs 'call mom about dinner') due the same
+#               day: only tasks sharing an LSH bucket with the new one are compared.
+#               Signatures for a whole list are computed with NumPy when it is installed.
+#               Like the next-up heap, the index is updated in place by add/edit/complete.
+
+
+import hashlib, random, re, zlib
+from TidyTaskCache import store_revision
+from TidyTaskShards import ShardedTaskList
+from TidyTaskSnapshot import open_snapshot
+
+
+NUM_PERM = 32               # MinHash signature length
+BANDS = 8                   # LSH bands of NUM_PERM // BANDS rows each
+NEAR_THRESHOLD = 0.6        # Estimated Jaccard similarity of titles to count as near duplicate
+MERSENNE_PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3
+
+_random = random.Random(361)
+PERMUTATIONS = [(_random.randrange(1, MERSENNE_PRIME), _random.randrange(MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+_duplicate_indexes = {}
+_near_duplicates = False
+
+
+def use_near_duplicates(enabled):
+    """
+    Turn near-duplicate (MinHash/LSH) detection on or off. Exact duplicates are always detected.
+
+    :param enabled:     True to also detect near duplicates
+    """
+    global _near_duplicates
+    _near_duplicates = enabled
+    _duplicate_indexes.clear()
+
+
+def normalize_title(task_name):
+    """
+    Normalize task name for comparison: lowercase, punctuation removed, whitespace collapsed.
+    """
+    return " ".join(re.sub(r'[^\w\s]', ' ', str(task_name).lower()).split())
+
+
+def content_key(task_name, due_date):
+    """
+    Get content hash of task: normalized task name + due date.
+
+    :param task_name:   Task name
+    :param due_date:    Due date (date or blank)
+    :return:            Hash (int)
+    """
+    content = f"{normalize_title(task_name)}|{due_date.isoformat() if due_date else ''}"
+    return int.from_bytes(hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def shingle_hashes(task_name):
+    """
+    Get hashes of the character shingles of normalized task name.
+    """
+    title = normalize_title(task_name)
+    shingles = {title[i:i + SHINGLE_SIZE] for i in range(max(len(title) - SHINGLE_SIZE + 1, 1))}
+    return [zlib.crc32(shingle.encode('utf-8')) for shingle in shingles]
+
+
+def minhash(task_name):
+    """
+    Get MinHash signature of task name's character shingles.
+
+    :param task_name:   Task name
+    :return:            Tuple of NUM_PERM ints
+    """
+    hashes = shingle_hashes(task_name)
+    return tuple(min((a * value + b) % MERSENNE_PRIME for value in hashes) for a, b in PERMUTATIONS)
+
+
+def minhash_many(task_names):
+    """
+    Get MinHash signatures of many task names, one permutation at a time over all their
+    shingles at once if NumPy is installed. Same results as minhash.
+
+    :param task_names:  List of task names
+    :return:            List of signatures
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return [minhash(task_name) for task_name in task_names]
+    if not task_names:
+        return []
+
+    hash_lists = [shingle_hashes(task_name) for task_name in task_names]
+    hashes = np.fromiter((value for values in hash_lists for value in values), np.uint64)
+    starts = np.cumsum([0] + [len(values) for values in hash_lists[:-1]])
+    signatures = np.empty((len(task_names), NUM_PERM), np.uint64)
+    for perm, (a, b) in enumerate(PERMUTATIONS):
+        signatures[:, perm] = np.minimum.reduceat((hashes * np.uint64(a) + np.uint64(b)) % np.uint64(MERSENNE_PRIME),
+                                                  starts)
+    return [tuple(signature) for signature in signatures.tolist()]
+
+
+def band_keys(signature, due_date):
+    """
+    Get LSH bucket keys of signature. Tasks only share buckets with tasks due the same day.
+    """
+    rows = NUM_PERM // BANDS
+    due = due_date.toordinal() if due_date else 0
+    return [(band, due, signature[band * rows:(band + 1) * rows]) for band in range(BANDS)]
+
+
+def similarity(signature, other):
+    """
+    Estimate Jaccard similarity of two titles from their signatures.
+    """
+    return sum(1 for a, b in zip(signature, other) if a == b) / NUM_PERM
+
+
+class DuplicateIndex:
+    """
+    Content-hash index (and optional LSH index) of incomplete tasks of one saved list.
+    """
+    def __init__(self, near=False, revision=None):
+        self.near = near
+        self._ids = {}              # content hash -> TaskIDs
+        self._task_keys = {}        # TaskID -> content hash
+        self._signatures = {}       # TaskID -> (MinHash signature, due date), near only
+        self._buckets = {}          # LSH bucket key -> TaskIDs, near only
+        # Revision of saved list the index is up to date with
+        self.revision = revision
+
+    @classmethod
+    def from_rows(cls, rows, near=False, revision=None):
+        """
+        Build index from (TaskID, task name, due date) of incomplete tasks.
+        """
+        index = cls(near, revision)
+        rows = list(rows)
+        signatures = minhash_many([task_name for _, task_name, _ in rows]) if near else [None] * len(rows)
+        for (task_id, task_name, due_date), signature in zip(rows, signatures):
+            index.add(task_id, task_name, due_date, signature)
+        return index
+
+    @classmethod
+    def from_task_list(cls, task_list, near=False, revision=None):
+        """
+        Build index from Task objects. A sharded list loads every shard but the archive.
+        """
+        task_ids = task_list.incomplete_ids() if isinstance(task_list, ShardedTaskList) else task_list
+        return cls.from_rows(((task_id, task.task_name, task.due_date) for task_id, task in
+                              ((task_id, task_list[task_id]) for task_id in task_ids)
+                              if task.status == 'incomplete'), near, revision)
+
+    def __len__(self):
+        return len(self._task_keys)
+
+    def add(self, task_id, task_name, due_date, signature=None):
+        key = content_key(task_name, due_date)
+        self._ids.setdefault(key, []).append(task_id)
+        self._task_keys[task_id] = key
+        if self.near:
+            signature = signature or minhash(task_name)
+            self._signatures[task_id] = (signature, due_date)
+            for bucket in band_keys(signature, due_date):
+                self._buckets.setdefault(bucket, []).append(task_id)
+
+    def remove(self, task_id):
+        key = self._task_keys.pop(task_id, None)
+        if key is None:
+            return
+        self._ids[key].remove(task_id)
+        if not self._ids[key]:
+            del self._ids[key]
+        if self.near:
+            for bucket in band_keys(*self._signatures.pop(task_id)):
+                self._buckets[bucket].remove(task_id)
+                if not self._buckets[bucket]:
+                    del self._buckets[bucket]
+
+    def update(self, task_list, task_ids):
+        """
+        Re-index added/changed tasks. Completed tasks leave the index.
+
+        :param task_list:   Dictionary of user tasks
+        :param task_ids:    TaskIDs of added/changed tasks
+        """
+        for task_id in task_ids:
+            self.remove(task_id)
+            task = task_list.get(task_id)
+            if task is not None and task.status == 'incomplete':
+                self.add(task_id, task.task_name, task.due_date)
+
+    def find(self, task_name, due_date):
+        """
+        Find an existing task that the given one duplicates.
+
+        :param task_name:   Task name
+        :param due_date:    Due date (date or blank)
+        :return:            ('exact' or 'near', TaskID), or None
+        """
+        task_ids = self._ids.get(content_key(task_name, due_date))
+        if task_ids:
+            return 'exact', task_ids[0]
+        if not self.near:
+            return None
+        signature = minhash(task_name)
+        candidates = {task_id for bucket in band_keys(signature, due_date) for task_id in self._buckets.get(bucket, ())}
+        scores = {task_id: similarity(signature, self._signatures[task_id][0]) for task_id in candidates}
+        best = max(scores, key=scores.get, default=None)
+        if best is not None and scores[best] >= NEAR_THRESHOLD:
+            return 'near', best
+        return None
+
+
+def get_duplicate_index(filename, task_list):
+    """
+    Get duplicate index of saved list, (re)building it if the list changed without it being updated
+    (first use, or saved by another process). Built from the snapshot where possible.
+
+    :param filename:    Filepath of saved list
+    :param task_list:   Dictionary of user tasks (used if there is no usable snapshot)
+    :return:            DuplicateIndex
+    """
+    revision = store_revision(filename)
+    index = _duplicate_indexes.get(filename)
+    if index is None or index.revision != revision:
+        snapshot = open_snapshot(filename)
+        if snapshot is None:
+            index = DuplicateIndex.from_task_list(task_list, _near_duplicates, revision)
+        else:
+            with snapshot:
+                index = DuplicateIndex.from_rows(((row[0], row[1], row[3]) for row in snapshot.rows('incomplete')),
+                                                 _near_duplicates, revision)
+        _duplicate_indexes[filename] = index
+    return index
+
+
+def drop_duplicate_index(filename):
+    """
+    Forget duplicate index of saved list (e.g. when the list is closed). Rebuilt on next use.
+
+    :param filename:    Filepath of saved list
+    """
+    _duplicate_indexes.pop(filename, None)
+
+
+def update_duplicate_index(filename, task_list, task_ids, old_revision):
+    """
+    Bring duplicate index of saved list up to date after a save, if it was up to date before it.
+    Otherwise drop it, to be rebuilt on next use.
+
+    :param filename:        Filepath of saved list
+    :param task_list:       Dictionary of user tasks
+    :param task_ids:        TaskIDs of added/changed tasks
+    :param old_revision:    Revision of saved list before the save
+    """
+    index = _duplicate_indexes.get(filename)
+    if index is None:
+        return
+    if index.revision != old_revision:
+        del _duplicate_indexes[filename]
+        return
+    index.update(task_list, task_ids)
+    index.revision = store_revision(filename)
+
+
+def find_duplicates(index, rows):
+    """
+    Find duplicates of new tasks, among existing tasks and earlier rows of the same batch.
+
+    :param index:   DuplicateIndex of list the tasks are added to
+    :param rows:    List of (task_name, description, due_date, priority[, recurrence])
+    :return:        List with, for each row, ('exact' or 'near', TaskID or None if an earlier row) or None
+    """
+    batch = DuplicateIndex(index.near)
+    matches = []
+    for row_num, (task_name, _, due_date, *_) in enumerate(rows):
+        match = index.find(task_name, due_date) or batch.find(task_name, due_date)
+        if match and match[1] < 0:
+            match = (match[0], None)
+        matches.append(match)
+        # Rows are indexed by negative row number, so they never clash with TaskIDs
+        batch.add(-1 - row_num, task_name, due_date)
+    return matches
@@ -0,0 +1,229 @@
+# Description:  File formats for the saved task list.
+#               A format is a serializer (pickle protocol 5, marshal of plain tuples, JSON)
+#               plus an optional compression (zlib, lzma). The format is recorded in a
+#               small header at the start of the file, so loading detects it automatically.
+#               Files without a header are lists saved by older versions (plain pickle).
+#
+#               Layout:  [ header (magic | serializer | compression) | payload ]
+
+
+import json, lzma, marshal, os, pickle, struct, time, zlib
+
+
+FORMAT_MAGIC = b'TTLIST01'
+HEADER = struct.Struct('<8s8s8s')       # magic, serializer name, compression name
+DEFAULT_FORMAT = ('pickle5', 'none')
+
+_serializers = {}
+_compressors = {}
+
+
+def register_serializer(name, encode, decode):
+    """
+    Add serializer to registry.
+
+    :param name:    Name of serializer (at most 8 ASCII characters)
+    :param encode:  Function(task_list) -> bytes
+    :param decode:  Function(bytes, make_task) -> task_list, where make_task(row) -> Task
+    """
+    if len(name.encode('ascii')) > 8:
+        raise ValueError(f"Serializer name too long: {name}")
+    _serializers[name] = (encode, decode)
+
+
+def register_compressor(name, compress, decompress):
+    """
+    Add compression to registry.
+
+    :param name:        Name of compression (at most 8 ASCII characters)
+    :param compress:    Function(bytes) -> bytes
+    :param decompress:  Function(bytes) -> bytes
+    """
+    if len(name.encode('ascii')) > 8:
+        raise ValueError(f"Compression name too long: {name}")
+    _compressors[name] = (compress, decompress)
+
+
+def task_to_row(task):
+    """
+    Convert Task object to a tuple of plain values
+    (due date as ordinal, timestamps as epoch seconds, recurrence as RecurrenceRule.spec,
+    exceptions as (ordinal, status) pairs, None if blank).
+    A description kept in a description file (split layout, see TidyTaskBodies) is saved blank.
+
+    :param task:    Task object
+    :return:        (id, task_name, description, due ordinal, priority, status, created, completed, revision,
+                    recurrence, exceptions)
+    """
+    due_date = task.due_date.toordinal() if task.due_date else None
+    created = task.created_at.timestamp() if task.created_at else None
+    completed = task.completed_at.timestamp() if task.completed_at else None
+    recurrence = task.recurrence.spec() if task.recurrence else None
+    exceptions = ([(day.toordinal(), status) for day, status in task.exceptions.items()]
+                  if task.exceptions is not None else None)
+    description = "" if task.deferred_description is not None else task.description
+    return (task.id, task.task_name, description, due_date, task.priority, task.status,
+            created, completed, task.revision, recurrence, exceptions)
+
+
+def rows_to_list(rows, make_task):
+    """
+    Rebuild dictionary of Task objects from rows made by task_to_row.
+
+    :param rows:        Iterable of rows
+    :param make_task:   Function(row) -> Task object
+    :return:            Dictionary of Task objects with ID keys
+    """
+    task_list = {}
+    for row in rows:
+        task = make_task(tuple(row))
+        task_list[task.id] = task
+    return task_list
+
+
+register_serializer('pickle5',
+                    lambda task_list: pickle.dumps(task_list, protocol=5),
+                    lambda data, make_task: pickle.loads(data))
+register_serializer('marshal',
+                    lambda task_list: marshal.dumps([task_to_row(task) for task in task_list.values()]),
+                    lambda data, make_task: rows_to_list(marshal.loads(data), make_task))
+register_serializer('json',
+                    lambda task_list: json.dumps([task_to_row(task) for task in task_list.values()]).encode('utf-8'),
+                    lambda data, make_task: rows_to_list(json.loads(data), make_task))
+
+register_compressor('none', lambda data: data, lambda data: data)
+register_compressor('zlib', zlib.compress, zlib.decompress)
+register_compressor('lzma', lzma.compress, lzma.decompress)
+
+
+def format_name(list_format):
+    """
+    Get display name of format, e.g. 'pickle5' or 'marshal+zlib'.
+    """
+    serializer, compression = list_format
+    return serializer if compression == 'none' else f"{serializer}+{compression}"
+
+
+def parse_format_name(name):
+    """
+    Get format from display name.
+    Raises ValueError if serializer or compression is not registered.
+
+    :param name:    Display name of format
+    :return:        (serializer, compression)
+    """
+    serializer, _, compression = name.partition('+')
+    list_format = (serializer, compression or 'none')
+    if serializer not in _serializers or list_format[1] not in _compressors:
+        raise ValueError(f"Unknown list format: {name}")
+    return list_format
+
+
+def available_formats():
+    """
+    Get every combination of registered serializer and compression.
+    """
+    return [(serializer, compression) for serializer in _serializers for compression in _compressors]
+
+
+def dump_list(task_list, list_format=DEFAULT_FORMAT):
+    """
+    Encode task list in format, with header.
+
+    :param task_list:   Dictionary of user tasks
+    :param list_format: (serializer, compression)
+    :return:            File contents (bytes)
+    """
+    serializer, compression = list_format
+    encode = _serializers[serializer][0]
+    compress = _compressors[compression][0]
+    header = HEADER.pack(FORMAT_MAGIC, serializer.encode('ascii'), compression.encode('ascii'))
+    return header + compress(encode(task_list))
+
+
+def load_list_data(data, make_task):
+    """
+    Decode task list from file contents, detecting format from header.
+    Raises EOFError if data is blank, ValueError if it can't be decoded (unknown format, or corrupt).
+
+    :param data:        File contents (bytes)
+    :param make_task:   Function(row) -> Task object
+    :return:            Dictionary of user tasks
+    """
+    if not data:
+        raise EOFError("Saved list is blank.")
+    try:
+        list_format = parse_header(data)
+        if list_format is None:
+            # Saved by an older version
+            return pickle.loads(data)
+        serializer, compression = list_format
+        decode = _serializers[serializer][1]
+        decompress = _compressors[compression][1]
+        return decode(decompress(data[HEADER.size:]), make_task)
+    # Each serializer and compressor fails in its own way on bad data
+    except Exception as e:
+        raise ValueError(f"Saved list can't be read: {e or type(e).__name__}") from e
+
+
+def parse_header(data):
+    """
+    Get format recorded in header of file contents.
+    Raises ValueError if header names an unregistered serializer or compression.
+
+    :param data:    File contents, or at least their first HEADER.size bytes
+    :return:        (serializer, compression), or None if no header
+    """
+    if len(data) < HEADER.size or not data.startswith(FORMAT_MAGIC):
+        return None
+    _, serializer, compression = HEADER.unpack_from(data)
+    return parse_format_name(f"{serializer.rstrip(bytes(1)).decode('ascii')}+"
+                             f"{compression.rstrip(bytes(1)).decode('ascii')}")
+
+
+def read_list_format(filename):
+    """
+    Get format of saved list from its header, without reading the rest of the file.
+
+    :param filename:    Filepath of saved list
+    :return:            (serializer, compression), or None if no saved list or no header
+    """
+    try:
+        with open(filename, 'rb') as readfile:
+            return parse_header(readfile.read(HEADER.size))
+    except (OSError, ValueError):
+        return None
+
+
+def benchmark_formats(task_list, make_task, directory='.', repeat=3):
+    """
+    Time saving and loading task list in every available format, through a temp file.
+    Best of repeat runs is kept for each.
+
+    :param task_list:   Dictionary of user tasks
+    :param make_task:   Function(row) -> Task object
+    :param directory:   Directory to write temp file in (same disk as saved list)
+    :param repeat:      Number of runs per format
+    :return:            List of {"format", "save", "load", "size"}, fastest (save + load) first
+    """
+    temp_path = os.path.join(directory, '.tidytask-bench.tmp')
+    results = []
+    try:
+        for list_format in available_formats():
+            save_times, load_times = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                with open(temp_path, 'wb') as outputfile:
+                    outputfile.write(dump_list(task_list, list_format))
+                save_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                with open(temp_path, 'rb') as readfile:
+                    load_list_data(readfile.read(), make_task)
+                load_times.append(time.perf_counter() - start)
+            results.append({"format": list_format, "save": min(save_times),
+                            "load": min(load_times), "size": os.path.getsize(temp_path)})
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return sorted(results, key=lambda result: result["save"] + result["load"])
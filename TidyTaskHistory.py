@@ -0,0 +1,195 @@
+# Description:  Undo/redo history. Each change (add, edit, complete, sort) is recorded from
+#               the mutation path as before/after images of only the tasks it touched, so
+#               recording, undoing, and redoing cost O(changed tasks), never a copy of the list.
+#               Images are shallow copies: names, descriptions, dates and rules are shared with
+#               the live tasks (they are only ever replaced, never changed in place).
+#               Descriptions still in a description file (split layout) are read into the image,
+#               since the file is rewritten with the new description on save.
+#               A sort also keeps the old and new order of TaskIDs.
+#               Like the next-up heap, a list's history is kept in memory per saved list and
+#               dropped if the list is saved without a change record, or by another process.
+
+
+import copy
+from collections import deque
+from TidyTaskBodies import load_descriptions
+from TidyTaskCache import store_revision
+
+
+HISTORY_LIMIT = 50          # Changes that can be undone, per list
+
+_histories = {}
+
+
+def task_images(task_list, task_ids):
+    """
+    Get copies of tasks as they are now, to restore later.
+
+    :param task_list:   Dictionary of user tasks
+    :param task_ids:    TaskIDs
+    :return:            Dictionary of TaskID -> copy of Task, or None if not in list
+    """
+    images = {task_id: copy.copy(task_list[task_id]) if task_id in task_list else None for task_id in task_ids}
+    load_descriptions(image for image in images.values() if image is not None)
+    return images
+
+
+class Change:
+    """
+    One undoable change to a list. Made by begin_change before the tasks change,
+    finished (after images taken) when the change is recorded.
+    """
+    def __init__(self, label, before, order_before=None):
+        self.label = label
+        self.before = before                # TaskID -> Task before change (None if added)
+        self.after = None                   # TaskID -> Task after change (None if removed)
+        self.order_before = order_before    # Tuple of TaskIDs before a reorder, else None
+        self.order_after = None
+        self.recorded = False
+
+    @property
+    def task_ids(self):
+        return list(self.before)
+
+    def finish(self, task_list):
+        """
+        Take after images of the changed tasks (and the new order, for a reorder).
+        """
+        self.after = task_images(task_list, self.before)
+        if self.order_before is not None:
+            self.order_after = tuple(task_list)
+        self.recorded = True
+
+
+def begin_change(label, task_list, task_ids, reorder=False):
+    """
+    Start recording a change: take before images of the tasks about to change.
+    Pass the result to record_task_changes once the tasks have changed.
+
+    :param label:       Description of change, e.g. "edit task 4"
+    :param task_list:   Dictionary of user tasks
+    :param task_ids:    TaskIDs about to be added/changed
+    :param reorder:     True if the change reorders the list
+    :return:            Change
+    """
+    return Change(label, task_images(task_list, task_ids), tuple(task_list) if reorder else None)
+
+
+def apply_images(task_list, images, order=None):
+    """
+    Put tasks back as they were in images, then restore order (if given).
+    Only content is put back: a restored task gets a revision above both its live and
+    image revisions, so sync treats the undo/redo as a newer change, not an old version.
+
+    :param task_list:   Dictionary of user tasks
+    :param images:      Dictionary of TaskID -> Task (None to remove task)
+    :param order:       Tuple of TaskIDs, or None to keep order
+    """
+    for task_id, image in images.items():
+        if image is None:
+            task_list.pop(task_id, None)
+        else:
+            live = task_list.get(task_id)
+            # Copied again, so later edits of the live task never change the image
+            restored = copy.copy(image)
+            restored.revision = max(image.revision, live.revision if live is not None else 0) + 1
+            task_list[task_id] = restored
+    if order is not None:
+        ordered = {task_id: task_list[task_id] for task_id in order if task_id in task_list}
+        task_list.clear()
+        task_list.update(ordered)
+
+
+class UndoHistory:
+    """
+    Undo and redo stacks of one saved list's changes, most recent last.
+    """
+    def __init__(self, limit=HISTORY_LIMIT, revision=None):
+        self._undo = deque(maxlen=limit)
+        self._redo = []
+        # Revision of saved list the history is up to date with
+        self.revision = revision
+
+    def record(self, change, task_list):
+        """
+        Add finished change to history. A new change can't be redone past, so it clears redo.
+        """
+        change.finish(task_list)
+        self._undo.append(change)
+        self._redo.clear()
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self, task_list):
+        """
+        Put the tasks of the last change back as they were before it (not saved).
+
+        :param task_list:   Dictionary of user tasks
+        :return:            Change undone, or None if there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        change = self._undo.pop()
+        apply_images(task_list, change.before, change.order_before)
+        self._redo.append(change)
+        return change
+
+    def redo(self, task_list):
+        """
+        Make the last undone change again (not saved).
+
+        :param task_list:   Dictionary of user tasks
+        :return:            Change redone, or None if there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        change = self._redo.pop()
+        apply_images(task_list, change.after, change.order_after)
+        self._undo.append(change)
+        return change
+
+
+def get_history(filename):
+    """
+    Get undo history of saved list, starting an empty one if the list changed without it
+    (first use, or saved by another process).
+
+    :param filename:    Filepath of saved list
+    :return:            UndoHistory
+    """
+    revision = store_revision(filename)
+    history = _histories.get(filename)
+    if history is None or history.revision != revision:
+        history = _histories[filename] = UndoHistory(revision=revision)
+    return history
+
+
+def drop_history(filename):
+    """
+    Forget undo history of saved list (e.g. when the list is closed).
+
+    :param filename:    Filepath of saved list
+    """
+    _histories.pop(filename, None)
+
+
+def update_history(filename, task_list, change, old_revision):
+    """
+    Record change in history of saved list after a save. History that was not up to date
+    before the save, or a save without a change record, starts the history over.
+
+    :param filename:        Filepath of saved list
+    :param task_list:       Dictionary of user tasks
+    :param change:          Change from begin_change (or one just undone/redone), or None
+    :param old_revision:    Revision of saved list before the save
+    """
+    history = _histories.get(filename)
+    if change is None or history is None or history.revision != old_revision:
+        history = _histories[filename] = UndoHistory()
+    if change is not None and not change.recorded:
+        history.record(change, task_list)
+    history.revision = store_revision(filename)
@@ -9,21 +9,89 @@
 #               (3) Search Service (big pool), (4) Sort Service (big pool), (5) Filter Service (big pool)
 
 
-import pickle, time, textwrap, zmq
-from datetime import datetime
+import json, os, shutil, sys, time, textwrap, tracemalloc, zmq
+from datetime import date, datetime, timedelta
+from TidyTaskBatch import SERVICE_PORTS, RequestBatch, build_service_request
+from TidyTaskBodies import (DeferredDescription, bodies_path, drop_body_store, get_body_store, is_split,
+                            load_descriptions, open_body_stores)
+from TidyTaskCache import bump_revision, normalize_params, query_cache, store_revision
+from TidyTaskDuplicates import find_duplicates, get_duplicate_index, update_duplicate_index
+from TidyTaskFormats import (DEFAULT_FORMAT, benchmark_formats, dump_list, format_name, load_list_data,
+                             read_list_format)
+from TidyTaskHistory import HISTORY_LIMIT, begin_change, get_history, update_history
+from TidyTaskNextUp import DEFAULT_COUNT, get_next_up, update_next_up
+from TidyTaskRecurrence import (RecurrenceRule, complete_occurrence, due_date_window, expand_occurrences,
+                                is_recurring, matching_occurrences, parse_recurrence, split_task_key)
+from TidyTaskShards import (ARCHIVE, ShardedTaskList, filter_shard_keys, is_sharded, open_sharded_list,
+                            overdue_shard_keys, read_manifest, shards_dir, write_sharded_list)
+from TidyTaskSnapshot import SnapshotTaskList, open_snapshot, snapshot_path, write_snapshot
+from TidyTaskViews import get_saved_views, view_sort_key
+from TidyTaskWorkspaces import WorkspaceManager, list_workspaces, validate_workspace_name, workspace_path
+
+
+TABLE_COL_WIDTHS = [8, 25, 30, 15, 15]
+TABLE_HEADERS = ['TaskID', 'Task', 'Description', 'Due Date', 'Priority']
+DUE_SOON_DAYS = 7
+
+# DaemonClient when running as a thin client of a shared task daemon, else None
+_daemon_client = None
+
+# Current workspace and LRU of open lists
+workspaces = WorkspaceManager(lambda filename: import_list(filename))
 
 
 class Task:
     """
     Represents a Task in the task list, with attributes.
     """
-    def __init__(self, task_id, task_name, description, due_date, priority, status='incomplete'):
+    def __init__(self, task_id, task_name, description, due_date, priority, status='incomplete',
+                 created_at=None, completed_at=None, revision=0, recurrence=None, exceptions=None):
         self.id = task_id
         self.task_name = task_name
-        self.description = description
+        self.description = description     # Stored as _description (see description property)
         self.due_date = due_date
         self.priority = priority
         self.status = status
+        self.created_at = created_at        # datetime, or None if unknown
+        self.completed_at = completed_at    # datetime, or None if incomplete/unknown
+        self.revision = revision            # Times task was changed (for sync)
+        self.recurrence = recurrence        # RecurrenceRule, or None if task does not repeat
+        self.exceptions = exceptions        # Completed occurrences of recurring task: {date: 'complete'}
+
+    def __setstate__(self, state):
+        """
+        Restore pickled Task. Tasks saved before timestamps/revisions/recurrence were recorded get None/0,
+        and their description (then a plain attribute) moves to _description.
+        """
+        if 'description' in state:
+            state['_description'] = state.pop('description')
+        state.setdefault('created_at', None)
+        state.setdefault('completed_at', None)
+        state.setdefault('revision', 0)
+        state.setdefault('recurrence', None)
+        state.setdefault('exceptions', None)
+        self.__dict__.update(state)
+
+    @property
+    def description(self):
+        """
+        Task description. A task of a list with split layout reads it from the list's
+        description file the first time it is needed (see TidyTaskBodies).
+        """
+        if isinstance(self._description, DeferredDescription):
+            return self._description.load(self.id)
+        return self._description
+
+    @description.setter
+    def description(self, value):
+        self._description = value
+
+    @property
+    def deferred_description(self):
+        """
+        Placeholder of description not loaded from a description file, or None if it is in memory.
+        """
+        return self._description if isinstance(self._description, DeferredDescription) else None
 
     def get_attribute(self, attribute_name):
         """
@@ -35,19 +103,50 @@ class Task:
     def set_attribute(self, attribute_name, value):
         """
         Sets value of the given attribute to the given value.
+        A new recurrence starts on the task's due date (today if blank);
+        a new due date of a recurring task restarts its recurrence on that date.
+        """
+        if attribute_name == 'recurrence':
+            self.set_recurrence(value)
+        else:
+            setattr(self, attribute_name, value)
+            if attribute_name == 'due_date' and self.recurrence and value:
+                self.set_recurrence(self.recurrence)
+        self.revision += 1
+
+    def set_recurrence(self, rule):
+        """
+        Make task repeat by rule (None to stop repeating), starting on its due date.
+
+        :param rule:    RecurrenceRule, or None
         """
-        setattr(self, attribute_name, value)
+        if rule is None:
+            self.recurrence = self.exceptions = None
+            return
+        if not self.due_date:
+            self.due_date = date.today()
+        self.recurrence = rule.anchored(self.due_date)
+        self.exceptions = {}
 
-    def set_complete(self):
+    def set_complete(self, occurrence=None):
         """
         Mark task as complete.
+        For a recurring task, only the occurrence is marked complete and the task moves on to its next one.
+
+        :param occurrence:  Date of occurrence of recurring task (None for its next open occurrence)
         """
-        self.status = 'complete'
+        if self.recurrence:
+            complete_occurrence(self, occurrence)
+        else:
+            self.status = 'complete'
+            self.completed_at = datetime.now()
+        self.revision += 1
 
     def convert_to_dict(self, purpose='export'):
         """
         Convert Task object to purpose-specific dictionary
         for JSON export or microservice compatibility.
+        Timestamps, revision, and recurrence are only included for 'store' (full copy of task, e.g. for the task daemon).
 
         :param purpose:     Intended purpose for converted dict
         :return:            Dictionary of Task attribute key/value pairs
@@ -56,7 +155,7 @@ class Task:
         task_id_key = "event_id" if purpose == "notification" else "id"
         task_name_key = "event_name" if purpose == "notification" else "task_name"
 
-        return {
+        task_dict = {
             task_id_key: self.id,
             task_name_key: self.task_name,
             "description": self.description,
@@ -64,6 +163,13 @@ class Task:
             "priority": int(self.priority) if self.priority != "" else "",
             "status": self.status
         }
+        if purpose == 'store':
+            task_dict["created_at"] = self.created_at.isoformat() if self.created_at else ""
+            task_dict["completed_at"] = self.completed_at.isoformat() if self.completed_at else ""
+            task_dict["revision"] = self.revision
+            task_dict["recurrence"] = self.recurrence.spec() if self.recurrence else ""
+            task_dict["exceptions"] = {day.isoformat(): status for day, status in (self.exceptions or {}).items()}
+        return task_dict
 
     def __str__(self):
         return (f"[ Task name: {self.task_name} | "
@@ -88,17 +194,38 @@ def print_welcome():
     print("_" * 58, "\n")
 
 
+def use_daemon(client):
+    """
+    Send all changes, views, searches, and filters to a shared task daemon
+    instead of reading and writing the saved list directly.
+
+    :param client:  DaemonClient (or None to stop using the daemon)
+    """
+    global _daemon_client
+    _daemon_client = client
+
+
 def import_list(filename):
     """
     Returns existing saved list, or blank list if none found.
-    Requires pickle module.
+    A saved list that can't be read (corrupt, or an unknown format) is moved aside
+    to <list>.unreadable, so it is never overwritten, and a blank list is returned.
+    If the list has an up-to-date snapshot, the list is backed by the snapshot
+    and only fully loaded once a Task object is needed.
+    A sharded list is opened from its manifest; shards load as their tasks are needed.
 
     :param filename:    filepath of saved list
-    :return:            user list (dict) or {}
+    :return:            user list (dict, SnapshotTaskList or ShardedTaskList) or {}
     """
+    if is_sharded(filename):
+        return open_sharded_list(filename, task_from_row)
+
+    snapshot = open_snapshot(filename)
+    if snapshot:
+        return SnapshotTaskList(snapshot, lambda: load_list(filename))
+
     try:
-        with open(filename, 'rb') as readfile:
-            return pickle.load(readfile)
+        user_list = load_list(filename)
     # If no saved list found, create blank list
     except FileNotFoundError:
         with open(filename, 'wb') as outputfile:
@@ -108,6 +235,123 @@ def import_list(filename):
     # If file found but blank, create blank list
     except EOFError:
         return {}
+    # If file can't be read, keep it for recovery and create blank list
+    except ValueError as e:
+        unreadable_path = filename + '.unreadable'
+        os.replace(filename, unreadable_path)
+        print(f"(!) Saved list '{filename}' could not be read ({e}).\n"
+              f"    It was moved to '{unreadable_path}' and a new list has been created.\n")
+        return {}
+
+    # Saved list has no usable snapshot yet (e.g. saved by an older version)
+    write_snapshot(user_list, filename)
+    return user_list
+
+
+def load_list(filename):
+    """
+    Load full saved list from file, in whichever format its header records.
+    A list with split layout is loaded without its descriptions; each is read when first needed.
+    Raises FileNotFoundError if no saved list, EOFError if saved list is blank,
+    ValueError if it can't be read.
+
+    :param filename:    filepath of saved list
+    :return:            user list (dict)
+    """
+    if is_sharded(filename):
+        sharded_list = open_sharded_list(filename, task_from_row)
+        return {task_id: sharded_list[task_id] for task_id in sharded_list}
+    with open(filename, 'rb') as readfile:
+        user_list = load_list_data(readfile.read(), task_from_row)
+    bodies = get_body_store(filename)
+    if bodies is not None:
+        bodies.attach(user_list.values())
+    return user_list
+
+
+def get_list_format(filename):
+    """
+    Get format saved list (or its shards, if sharded) is stored in.
+
+    :param filename:    filepath of saved list
+    :return:            (serializer, compression), or None if unknown
+    """
+    if is_sharded(filename):
+        return read_manifest(filename)[0]
+    return read_list_format(filename)
+
+
+def task_from_row(row):
+    """
+    Create Task object from a row of plain values
+    (due date as ordinal, timestamps as epoch seconds, recurrence as RecurrenceRule.spec,
+    exceptions as (ordinal, status) pairs, None if blank).
+    Rows saved by older versions lack the trailing values.
+
+    :param row:     (id, task_name, description, due ordinal, priority, status, created, completed, revision,
+                    recurrence, exceptions)
+    :return:        Task object
+    """
+    (task_id, task_name, description, due_ordinal, priority, status,
+     created, completed, revision, recurrence, exceptions) = row + (None,) * (11 - len(row))
+    return Task(task_id, task_name, description,
+                date.fromordinal(due_ordinal) if due_ordinal else "",
+                priority, status,
+                datetime.fromtimestamp(created) if created is not None else None,
+                datetime.fromtimestamp(completed) if completed is not None else None,
+                revision or 0,
+                RecurrenceRule.from_spec(recurrence) if recurrence else None,
+                {date.fromordinal(day): day_status for day, day_status in exceptions}
+                if exceptions is not None else None)
+
+
+def load_tasks_by_id(filename, task_ids):
+    """
+    Load tasks of saved list with given TaskIDs, decoding only their rows of the snapshot.
+    Falls back to the full saved list if there is no usable snapshot.
+
+    :param filename:    filepath of saved list
+    :param task_ids:    TaskIDs of tasks to load
+    :return:            List of Task objects
+    """
+    if is_sharded(filename):
+        # Only shards holding these tasks are loaded
+        sharded_list = open_sharded_list(filename, task_from_row)
+        return [sharded_list[task_id] for task_id in task_ids if task_id in sharded_list]
+    snapshot = open_snapshot(filename)
+    if snapshot is None:
+        user_list = load_list(filename)
+        return [user_list[task_id] for task_id in task_ids if task_id in user_list]
+    with snapshot:
+        rows = (snapshot.get(task_id) for task_id in task_ids)
+        tasks = [Task(*row) for row in rows if row is not None]
+    bodies = get_body_store(filename)
+    if bodies is not None:
+        bodies.attach(tasks)
+    return tasks
+
+
+def load_incomplete_tasks(filename):
+    """
+    Load incomplete tasks of saved list, decoding only their rows of the snapshot
+    (or, if sharded, loading every shard but the archive).
+    Falls back to the full saved list if there is no usable snapshot.
+
+    :param filename:    filepath of saved list
+    :return:            Dictionary of user tasks
+    """
+    if is_sharded(filename):
+        sharded_list = open_sharded_list(filename, task_from_row)
+        return sharded_list.load_shards(sharded_list.shard_keys() - {ARCHIVE})
+    snapshot = open_snapshot(filename)
+    if snapshot is None:
+        return load_list(filename)
+    with snapshot:
+        user_list = {row[0]: Task(*row) for row in snapshot.rows('incomplete')}
+    bodies = get_body_store(filename)
+    if bodies is not None:
+        bodies.attach(user_list.values())
+    return user_list
 
 
 def main_menu():
@@ -119,10 +363,11 @@ def main_menu():
     start_prompt = ("Enter any of these commands to continue...\n\n"
                     "View: 'V' to VIEW and manage all tasks on your to do list\n"
                     "Add:  'A' to ADD a new task\n"
+                    f"List: 'L' to switch LISTS (current: {workspaces.current})\n"
                     "Help: 'H' to get HELP with the app\n"
                     "Quit: 'Q' to QUIT the app\n\n"
                     ">> ")
-    valid_responses = ['V', 'A', 'H', 'Q']
+    valid_responses = ['V', 'A', 'L', 'H', 'Q']
     return get_input(start_prompt, valid_responses)
 
 
@@ -134,16 +379,27 @@ def main_menu_route(user_choice, user_list):
     :param user_list:       Dictionary of user tasks
     :return:                False if Q to quit, True otherwise
     """
-    if user_choice == 'A':
-        add_task(user_list)
-        task_menu(user_list)
-    elif user_choice == 'V':
-        task_menu(user_list)
+    try:
+        if user_choice == 'A':
+            add_task(user_list)
+            task_menu(user_list)
+        elif user_choice == 'V':
+            task_menu(user_list)
+    # Task daemon did not respond, or refused a request (e.g. task not found)
+    except RuntimeError as e:
+        if not _daemon_client:
+            raise
+        print(f"\n(!) {e}")
+        input("\nPress ENTER to return to the main menu...")
+        clear_screen()
+    if user_choice == 'L':
+        workspaces_menu()
     elif user_choice == 'H':
         get_help()
     elif user_choice == 'Q':
         clear_screen()
         print("You have exited Tidy Task. Good luck with your tasks!")
+        print_instrumentation()
         return False
     return True
 
@@ -176,6 +432,10 @@ def get_task_id_keys(user_list):
     :param user_list:   Dictionary of user tasks
     :return:            Valid task ID
     """
+    # Snapshot-backed list can answer from its status column, sharded list from its manifest
+    if isinstance(user_list, (SnapshotTaskList, ShardedTaskList)):
+        return user_list.incomplete_ids()
+
     incomplete_task_keys = []
     for key, task in user_list.items():
         if task.status == 'incomplete':
@@ -207,7 +467,7 @@ def pause_before_return(messages=None):
 def view_task_list(sublist=None, title=' '):
     """
     View incomplete tasks in saved task list or temporary sublist.
-    Requires pickle module.
+    Saved task list is read from its snapshot where possible.
 
     :param sublist:     List of tasks other than saved list
     :param title:       Title of task list
@@ -216,24 +476,20 @@ def view_task_list(sublist=None, title=' '):
     no_incomplete = True
     try:
         # If no task_list input, load saved list
-        if sublist is None:
-            with open('userlist.pkl', 'rb') as readfile:
-                user_list = pickle.load(readfile)
+        if sublist is None and _daemon_client:
+            user_list = _daemon_client.view()
+        elif sublist is None:
+            user_list = load_incomplete_tasks(workspaces.current_file)
         else:
             user_list = sublist
 
-        col_widths = [8, 25, 30, 15, 15]
-        table_headers = ['TaskID', 'Task', 'Description', 'Due Date', 'Priority']
-        print_table_row(table_headers, col_widths, title)
+        col_widths = table_col_widths(user_list)
+        print_table_row(TABLE_HEADERS, col_widths, title)
 
         # Print (incomplete) tasks in formatted table
         for task in user_list:
             if user_list[task].status == 'incomplete':
-                formatted_date = user_list[task].due_date.strftime('%b %d, %Y') if user_list[task].due_date else "" # Format: 'Nov 13, 2025'
-                priority_map = {'1': 'High', '2': 'Medium', '3': 'Low'}
-                aliased_priority = priority_map.get(str(user_list[task].priority), "")
-                row_data = [task, user_list[task].task_name, user_list[task].description, formatted_date, aliased_priority]
-                print_table_row(row_data, col_widths)
+                print_table_row(get_task_row_data(task, user_list[task]), col_widths)
                 no_incomplete = False
 
     # Return False if no incomplete tasks or empty list
@@ -246,6 +502,47 @@ def view_task_list(sublist=None, title=' '):
         return False
 
 
+def table_col_widths(task_ids):
+    """
+    Get col widths of task table, with the TaskID col widened to fit the longest TaskID
+    (occurrence keys of recurring tasks, e.g. '12@2025-11-03', are longer than TaskIDs).
+
+    :param task_ids:    TaskIDs (or occurrence keys) shown in table
+    :return:            List of col widths
+    """
+    id_width = max((len(str(task_id)) for task_id in task_ids), default=0)
+    return [max(TABLE_COL_WIDTHS[0], id_width)] + TABLE_COL_WIDTHS[1:]
+
+
+def get_task_row_data(task_id, task):
+    """
+    Get display values of task for a row of the task table.
+
+    :param task_id:     TaskID
+    :param task:        Task object
+    :return:            List of column values
+    """
+    formatted_date = task.due_date.strftime('%b %d, %Y') if task.due_date else "" # Format: 'Nov 13, 2025'
+    priority_map = {'1': 'High', '2': 'Medium', '3': 'Low'}
+    aliased_priority = priority_map.get(str(task.priority), "")
+    return [task_id, task.task_name, task.description, formatted_date, aliased_priority]
+
+
+def format_table_row(row_data, col_widths, truncate=False):
+    """
+    Format row of table data to specified col widths.
+
+    :param row_data:    Data for row
+    :param col_widths:  Width of cols in table view
+    :param truncate:    If True, cut values longer than their col width
+    :return:            Formatted row (str)
+    """
+    precision = [f".{width}" if truncate else "" for width in col_widths]
+    format_col_widths = [f"{{:<{width}{cut}}}" for width, cut in zip(col_widths, precision)]
+    format_str = " ".join(format_col_widths)
+    return format_str.format(*(str(value) for value in row_data))
+
+
 def print_table_row(row_data, col_widths, header=""):
     """
     Print table header or row of table data, formatted to specified col widths.
@@ -257,9 +554,7 @@ def print_table_row(row_data, col_widths, header=""):
     if header:
         print(f"\n{header.upper()}\n")
 
-    format_col_widths = [f"{{:<{width}}}" for width in col_widths]
-    format_str = " ".join(format_col_widths)
-    print(format_str.format(*row_data))
+    print(format_table_row(row_data, col_widths))
 
     if header:
         print("-" * sum(col_widths))
@@ -297,10 +592,14 @@ def get_task_menu_choice():
         "\nEnter 'SE' to SEARCH tasks."
         "\nEnter 'ST' to SORT tasks."
         "\nEnter 'F' to FILTER tasks."
+        "\nEnter 'SV' to open a SAVED VIEW."
+        "\nEnter 'N' to see what's NEXT UP."
+        "\nEnter 'D' to see what's DUE soon."
         "\nEnter 'P' to view PROGRESS stats."
+        "\nEnter 'U' to UNDO your last change, or 'R' to REDO it."
         "\nEnter 'M' to return to the MAIN MENU.\n\n>> "
     )
-    valid_next_steps = ['A', 'C', 'E', 'O', 'SE', 'ST', 'F', 'P', 'M']
+    valid_next_steps = ['A', 'C', 'E', 'O', 'SE', 'ST', 'F', 'SV', 'N', 'D', 'P', 'U', 'R', 'M']
     return get_input(next_step_prompt, valid_next_steps)
 
 
@@ -331,11 +630,24 @@ def route_choice(user_choice, user_list):
     elif user_choice == 'F':
         filter_tasks(user_list)
         pause_before_return()
-    elif user_choice == 'P':
-        print('\n\t', get_completion_rate(user_list))
+    elif user_choice == 'SV':
+        saved_views_menu(user_list)
+    elif user_choice == 'N':
+        show_next_up(user_list)
+        pause_before_return()
+    elif user_choice == 'D':
+        show_due_soon(user_list)
         pause_before_return()
+    elif user_choice == 'P':
+        pause_before_return(get_progress_report(user_list))
     elif user_choice == 'C':
         complete_task_warn(user_list)
+    elif user_choice in ('U', 'R'):
+        message = undo_change(user_list, redo=user_choice == 'R')
+        clear_screen()
+        print(f"\n\t{message}\n\n")
+        time.sleep(1)
+        clear_screen()
     return True
 
 
@@ -369,16 +681,16 @@ def add_task(task_list):
     """
     Add task via manual process (one prompt per 'screen'),
     with progress bar displayed on each 'screen'.
-    Current fields: title (req), description, due date, priority.
+    Current fields: title (req), description, due date, priority, repeat.
 
     :param task_list:       Dictionary of user tasks.
     """
     new_task_data = {}
     step_num = 0
-    step_list = ['Task Title', 'Description', 'Due Date', 'Priority', 'Task Added']
-    attributes = ['task_name', 'description', 'due_date', 'priority']
+    step_list = ['Task Title', 'Description', 'Due Date', 'Priority', 'Repeat', 'Task Added']
+    attributes = ['task_name', 'description', 'due_date', 'priority', 'recurrence']
 
-    print("\tFollow the prompts to add a title, description, due date, and priority for your task.\n\n"
+    print("\tFollow the prompts to add a title, description, due date, priority, and repeat for your task.\n\n"
           "\t\t( Tip! ) Only TITLE is required. Other fields may be left blank.\n"
           "\t\t( Tip! ) Editing: Tasks can be EDITED later!\n"
           "\t\t( Tip! ) Quick Add: Enter 'Q' on this screen to QUICK-ADD a task.\n"
@@ -390,11 +702,12 @@ def add_task(task_list):
         "description": "",
         "due_date": " (YYYY-MM-DD)",
         "priority": " (1 for High, 2 for Medium, 3 for Low)",
+        "recurrence": " (daily, weekly, monthly, or every N days/weeks/months)",
     }
 
     for attribute in attributes:
         step_num = print_progress_bar(step_list, step_num)
-        label = attribute.replace("_", " ")
+        label = "repeat" if attribute == "recurrence" else attribute.replace("_", " ")
         hint = hint_map[attribute]
         prompt_string = f"\n\tEnter a {label}{hint}: "
         allow_blank = False if attribute == "task_name" else True
@@ -412,12 +725,18 @@ def add_task(task_list):
 
         new_task_data[attribute] = value
 
+    row = tuple(new_task_data[attribute] for attribute in attributes[:4])
+    if not confirm_duplicate(task_list, row):
+        clear_screen()
+        return
+
     save_new_task(
         task_list,
         new_task_data.get("task_name"),
         new_task_data.get("description"),
         new_task_data.get("due_date"),
-        new_task_data.get("priority")
+        new_task_data.get("priority"),
+        new_task_data.get("recurrence") or None
     )
 
     print_progress_bar(step_list, step_num)
@@ -428,7 +747,8 @@ def add_task(task_list):
 
 def add_task_quick(task_list):
     """
-    Quick-add a task via single string in specified format.
+    Quick-add a task via single string in specified format,
+    or many tasks at once from a pasted block or a file (one task per line).
 
     :param task_list:       Dictionary of user tasks.
 
@@ -438,7 +758,10 @@ def add_task_quick(task_list):
           "                 Task title/Task description/Due date/Priority\n\n"
           "              Recommended for advanced users only.\n\n"
           "              ( Tip! ) Only TITLE is required. Other fields may be left blank.\n"
+          "              ( Tip! ) Repeating task: add '/' and how often, e.g. .../2025-11-03/2/weekly\n"
           "              ( Tip! ) Tasks can be EDITED later!\n"
+          "              ( Tip! ) Many tasks: Enter 'P' to PASTE many lines at once,\n"
+          "                       or '@' and a filepath (e.g. @tasks.txt) to add every line of a file.\n"
           "              ( Tip! ) Go back: Want to follow prompts instead?\n"
           "                       Enter 'B' to GO BACK.\n\n")
     quick_add_prompt = (
@@ -459,10 +782,23 @@ def add_task_quick(task_list):
             print("\n\t(!) Input required.\n")
             continue
 
+        # Many tasks, pasted or from file
+        if quick_input.upper() == 'P' or quick_input.startswith('@'):
+            try:
+                lines = read_quick_add_file(quick_input[1:].strip()) if quick_input.startswith('@') else read_pasted_lines()
+            except OSError as e:
+                print(f"\n\t(!) Could not read file: {e.strerror}.\n")
+                continue
+            add_task_quick_batch(task_list, lines)
+            return
+
         valid_quick_input = validate_quick_add_input(quick_input, '/')
         if valid_quick_input:
-            task_name, description, due_date, priority = valid_quick_input
-            save_new_task(task_list, task_name, description, due_date, priority)
+            task_name, description, due_date, priority, recurrence = valid_quick_input
+            if not confirm_duplicate(task_list, valid_quick_input):
+                clear_screen()
+                return
+            save_new_task(task_list, task_name, description, due_date, priority, recurrence)
             clear_screen()
             print("\n\t✓ Task added successfully!\n\n")
             time.sleep(1)
@@ -470,6 +806,77 @@ def add_task_quick(task_list):
             return
 
 
+def read_pasted_lines():
+    """
+    Read pasted lines of quick-add input, until a blank line.
+
+    :return:    List of lines
+    """
+    print("\n\tPaste one task per line, then press ENTER on a blank line to add them:\n")
+    lines = []
+    while True:
+        line = input("\t")
+        if not line.strip():
+            return lines
+        lines.append(line)
+
+
+def read_quick_add_file(filepath):
+    """
+    Read lines of quick-add input from file.
+    Raises OSError if file cannot be read.
+
+    :param filepath:    Filepath of text file, one task per line
+    :return:            List of lines
+    """
+    with open(filepath, 'r', encoding='utf-8') as readfile:
+        return readfile.read().splitlines()
+
+
+def add_task_quick_batch(task_list, lines):
+    """
+    Quick-add many tasks, reporting invalid lines and duplicates, and save them with a single write.
+    Exact duplicates are skipped.
+
+    :param task_list:       Dictionary of user tasks.
+    :param lines:           Lines of quick-add input
+    """
+    rows, errors = parse_quick_add_batch(lines, '/')
+    rows, duplicate_msgs = sort_out_duplicates(task_list, rows)
+    new_task_ids = save_new_tasks(task_list, rows)
+
+    clear_screen()
+    task_or_tasks = "tasks" if len(new_task_ids) != 1 else "task"
+    messages = [f"\t✓ {len(new_task_ids)} {task_or_tasks} added successfully!"]
+    if errors:
+        messages.append(f"\n\t(!) {len(errors)} line(s) could not be added:")
+        messages.extend(f"\t    Line {line_num}: {error}" for line_num, error in errors)
+    if duplicate_msgs:
+        messages.append("\n\t(!) Possible duplicates:")
+        messages.extend(f"\t    {msg}" for msg in duplicate_msgs)
+    pause_before_return(messages)
+
+
+def parse_quick_add_batch(lines, delimiter):
+    """
+    Parse and validate many lines of quick-add input. Blank lines are skipped.
+
+    :param lines:           Lines of quick-add input
+    :param delimiter:       Delimiter used in quick add string (str)
+    :return:                List of valid (task_name, description, due_date, priority, recurrence),
+                            list of (line number, error message) for invalid lines
+    """
+    rows, errors = [], []
+    for line_num, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(parse_quick_add_input(line.strip(), delimiter))
+        except ValueError as e:
+            errors.append((line_num, str(e)))
+    return rows, errors
+
+
 def get_validated_task_input(prompt, field, allow_blank=True, allow_back=True):
     """
     Get validated user input from user for task field input.
@@ -501,6 +908,12 @@ def get_validated_task_input(prompt, field, allow_blank=True, allow_back=True):
             except ValueError as e:
                 print(f"\n\t(!) {e}\n")
                 continue
+        elif field == "recurrence":
+            try:
+                return parse_recurrence(user_input)
+            except ValueError as e:
+                print(f"\n\t(!) {e}\n")
+                continue
         return user_input
 
 
@@ -542,42 +955,111 @@ def validate_quick_add_input(quick_input, delimiter):
 
     :param quick_input:     User input string
     :param delimiter:       Delimiter used in quick add string (str)
-    :return:                task_name, description, due_date, priority if valid, else None
+    :return:                task_name, description, due_date, priority, recurrence if valid, else None
     """
     try:
-        # Parse string
-        task_name, description, due_date, priority = quick_input.split(delimiter)
+        return parse_quick_add_input(quick_input, delimiter)
+    except ValueError as e:
+        print(f"\n\t(!) {e}\n")
+        return None
 
-        if not task_name.strip():
-            print("\n\t(!) Task title is required. Please try again.\n")
-            return None
 
-        if due_date.strip():
-            try:
-                due_date = validate_date_input(due_date.strip())
-            except ValueError as e:
-                print(f"\n\t(!) {e}\n")
-                return None
-        else:
-            due_date = ""
+def parse_quick_add_input(quick_input, delimiter):
+    """
+    Parse quick-add input string. A fifth field, how often the task repeats, is optional.
+    Raise ValueError with message for user if invalid.
 
-        if priority.strip():
-            try:
-                priority = validate_priority_input(priority.strip())
-            except ValueError as e:
-                print(f"\n\t(!) {e}\n")
-                return None
-        else:
-            priority = ""
+    :param quick_input:     User input string
+    :param delimiter:       Delimiter used in quick add string (str)
+    :return:                task_name, description, due_date, priority, recurrence (or raise ValueError)
+    """
+    fields = quick_input.split(delimiter)
+    if len(fields) not in (4, 5):
+        raise ValueError("Invalid input format. Please try again.")
+    task_name, description, due_date, priority, recurrence = fields + [""] * (5 - len(fields))
 
-        return task_name.strip(), description.strip(), due_date, priority
+    if not task_name.strip():
+        raise ValueError("Task title is required. Please try again.")
 
-    except Exception:
-        print("\n\t(!) Invalid input format. Please try again.\n")
-        return None
+    due_date = validate_date_input(due_date.strip()) if due_date.strip() else ""
+    priority = validate_priority_input(priority.strip()) if priority.strip() else ""
+    recurrence = parse_recurrence(recurrence) if recurrence.strip() else None
+
+    return task_name.strip(), description.strip(), due_date, priority, recurrence
+
+
+def check_duplicates(task_list, rows, filename=None):
+    """
+    Find duplicates of new tasks among incomplete tasks on list (and earlier rows of the same batch),
+    using the list's duplicate index: one lookup per row, not a pass over the list.
+
+    :param task_list:       Dictionary of user tasks.
+    :param rows:            List of (task_name, description, due_date, priority[, recurrence])
+    :param filename:        Filepath of saved list (default: current workspace's)
+    :return:                List with, for each row, ('exact' or 'near', TaskID or None if an earlier row) or None
+    """
+    # Checked by the task daemon, which keeps the index of its list
+    if _daemon_client:
+        return _daemon_client.check_duplicates(rows)
+    filename = filename or workspaces.current_file
+    return find_duplicates(get_duplicate_index(filename, task_list), rows)
 
 
-def save_new_task(task_list, task_name, description, due_date, priority):
+def describe_duplicate(task_list, task_name, match):
+    """
+    Get message about a duplicate found by check_duplicates.
+
+    :param task_list:       Dictionary of user tasks.
+    :param task_name:       Name of new task
+    :param match:           ('exact' or 'near', TaskID or None)
+    :return:                Message (str)
+    """
+    kind, task_id = match
+    same = "is already on your list as" if kind == 'exact' else "looks like"
+    if task_id is None:
+        return f"'{task_name}' {same} a task earlier in this batch."
+    existing = task_list[task_id]
+    due = f", due {existing.due_date.strftime('%b %d, %Y')}" if existing.due_date else ""
+    return f"'{task_name}' {same} TaskID {task_id} ('{existing.task_name}'{due})."
+
+
+def confirm_duplicate(task_list, row):
+    """
+    Check new task for a duplicate and, if it has one, ask user whether to add it anyway.
+
+    :param task_list:       Dictionary of user tasks.
+    :param row:             (task_name, description, due_date, priority[, recurrence])
+    :return:                True to add task, False to go back
+    """
+    match = check_duplicates(task_list, [row])[0]
+    if match is None:
+        return True
+    print(f"\n\t(!) {describe_duplicate(task_list, row[0], match)}")
+    return get_input("\tEnter 'A' to ADD it anyway or 'B' to go BACK: ", ['A', 'B']) == 'A'
+
+
+def sort_out_duplicates(task_list, rows):
+    """
+    Check batch of new tasks for duplicates. Exact duplicates are left out; near duplicates are kept.
+
+    :param task_list:       Dictionary of user tasks.
+    :param rows:            List of (task_name, description, due_date, priority[, recurrence])
+    :return:                Rows to add, list of messages about duplicates
+    """
+    keep, messages = [], []
+    for row, match in zip(rows, check_duplicates(task_list, rows)):
+        if match is None:
+            keep.append(row)
+            continue
+        if match[0] == 'exact':
+            messages.append(describe_duplicate(task_list, row[0], match) + " Skipped.")
+        else:
+            keep.append(row)
+            messages.append(describe_duplicate(task_list, row[0], match) + " Added.")
+    return keep, messages
+
+
+def save_new_task(task_list, task_name, description, due_date, priority, recurrence=None):
     """
     Create new Task object with input task data and save task to user's list.
 
@@ -586,54 +1068,211 @@ def save_new_task(task_list, task_name, description, due_date, priority):
     :param description:     Input task description
     :param due_date:        Input task due date
     :param priority:        Input task priority
+    :param recurrence:      Input RecurrenceRule, or None if task does not repeat
     :return:                none
     """
-    # Generate task ID
-    if task_list != {}:
-        new_task_id = max(task_list.keys()) + 1
-    else:
-        new_task_id = 1
+    save_new_tasks(task_list, [(task_name, description, due_date, priority, recurrence)])
+
+
+def save_new_tasks(task_list, rows):
+    """
+    Create new Task objects for many rows of task data, with IDs allocated in one go,
+    and save them all to user's list with a single write.
+
+    :param task_list:       Dictionary of user tasks.
+    :param rows:            List of (task_name, description, due_date, priority[, recurrence])
+    :return:                List of new TaskIDs
+    """
+    if not rows:
+        return []
+
+    # Daemon allocates IDs, so tasks added by other clients never collide
+    if _daemon_client:
+        new_tasks = _daemon_client.add_tasks(rows)
+        for task in new_tasks:
+            task_list[task.id] = task
+        return [task.id for task in new_tasks]
+
+    first_task_id = max(task_list.keys()) + 1 if task_list else 1
+    change = begin_change(f"add {len(rows)} task(s)" if len(rows) > 1 else f"add task {first_task_id}",
+                          task_list, range(first_task_id, first_task_id + len(rows)))
+    new_task_ids = add_new_tasks(task_list, rows)
+    record_task_changes(task_list, new_task_ids, change=change)
+    return new_task_ids
+
+
+def add_new_tasks(task_list, rows):
+    """
+    Create new Task objects for rows of task data and add them to list, without saving.
+
+    :param task_list:       Dictionary of user tasks.
+    :param rows:            List of (task_name, description, due_date, priority[, recurrence])
+    :return:                List of new TaskIDs
+    """
+    # Generate task IDs
+    first_task_id = max(task_list.keys()) + 1 if task_list else 1
+    new_task_ids = list(range(first_task_id, first_task_id + len(rows)))
+    created_at = datetime.now()
+
+    for new_task_id, row in zip(new_task_ids, rows):
+        task_name, description, due_date, priority, recurrence = tuple(row) + (None,) * (5 - len(row))
+        task = Task(new_task_id, task_name, description, due_date, priority, created_at=created_at)
+        if recurrence:
+            task.set_recurrence(recurrence)
+        task_list[new_task_id] = task
+    return new_task_ids
+
+
+def record_task_changes(task_list, task_ids, filename=None, change=None):
+    """
+    Save task list after tasks were added or changed,
+    bring saved views, the next-up ranking, and the duplicate index up to date for those tasks,
+    and add the change to the list's undo history.
 
-    # Save task and updated dictionary
-    new_task = Task(new_task_id, task_name, description, due_date, priority)
-    task_list[new_task_id] = new_task
-    save_list(task_list, 'userlist.pkl')
+    :param task_list:       Dictionary of user tasks.
+    :param task_ids:        TaskIDs of added/changed tasks
+    :param filename:        Filepath of saved list (default: current workspace's)
+    :param change:          Change from begin_change, to make undoable (None clears the undo history)
+    """
+    filename = filename or workspaces.current_file
+    saved_views = get_saved_views(filename)
+    # Checked before saving: list changed elsewhere since views were last updated
+    views_stale = saved_views.is_stale()
+    old_revision = store_revision(filename)
+
+    save_list(task_list, filename, changed_ids=task_ids)
+    update_next_up(filename, task_list, task_ids, old_revision)
+    update_duplicate_index(filename, task_list, task_ids, old_revision)
+    update_history(filename, task_list, change, old_revision)
+
+    if views_stale:
+        saved_views.rebuild(task_list)
+    else:
+        saved_views.update(task_list, task_ids)
 
 
-def save_list(list_object, filename):
+def save_list(list_object, filename, list_format=None, changed_ids=None):
     """
-    Saves input task list to file at specified filepath.
-    Requires pickle module.
+    Saves input task list to file at specified filepath,
+    then regenerates the list's snapshot and invalidates cached query results.
+    Keeps the file's current format unless another is given.
+    A sharded list rewrites only shards holding changed tasks (and has no snapshot).
+    A list with split layout writes its descriptions to its description file instead.
 
     :param list_object:     Dictionary of user tasks.
     :param filename:        Filepath for output
+    :param list_format:     (serializer, compression), see TidyTaskFormats
+    :param changed_ids:     TaskIDs of added/changed tasks, if known
 
     :return:                none
     """
+    if isinstance(list_object, SnapshotTaskList):
+        list_object = list_object.materialize()
+
+    if isinstance(list_object, ShardedTaskList) and list_object.filename == filename:
+        list_object.save(changed_ids, list_format)
+    elif is_sharded(filename):
+        write_sharded_list(list_object, filename, list_format or get_list_format(filename))
+    else:
+        list_format = list_format or read_list_format(filename) or DEFAULT_FORMAT
+        bodies = get_body_store(filename)
+        if bodies is not None:
+            bodies.write(list_object.values())
+        with open(filename, 'wb') as outputfile:
+            outputfile.write(dump_list(list_object, list_format))
+        write_snapshot(list_object, filename)
+    bump_revision(filename)
+
+
+def set_list_storage(filename, sharded):
+    """
+    Convert saved list between a single file and shards by due month.
+
+    :param filename:    Filepath of saved list
+    :param sharded:     True to store in shards, False for a single file
+    """
+    try:
+        user_list = load_list(filename)
+    except (EOFError, FileNotFoundError):
+        user_list = {}
+    list_format = get_list_format(filename) or DEFAULT_FORMAT
+
+    if sharded:
+        if is_split(filename):
+            # Shards keep descriptions with their tasks
+            load_descriptions(user_list.values())
+        write_sharded_list(user_list, filename, list_format)
+        if is_split(filename):
+            drop_body_store(filename)
+            os.remove(bodies_path(filename))
+        # Not kept up to date for sharded lists
+        if os.path.exists(snapshot_path(filename)):
+            os.remove(snapshot_path(filename))
+    else:
+        with open(filename, 'wb') as outputfile:
+            outputfile.write(dump_list(user_list, list_format))
+        write_snapshot(user_list, filename)
+        if os.path.isdir(shards_dir(filename)):
+            shutil.rmtree(shards_dir(filename))
+    bump_revision(filename)
+
+
+def set_list_bodies(filename, split):
+    """
+    Convert saved list between keeping descriptions in the list itself and in a description file
+    (split layout), which lets the list load without them. A sharded list can't be split.
+
+    :param filename:    Filepath of saved list
+    :param split:       True to keep descriptions in a description file, False in the list
+    :return:            False if the list is sharded, True otherwise
+    """
+    if is_sharded(filename):
+        return False
+    try:
+        user_list = load_list(filename)
+    except (EOFError, FileNotFoundError):
+        user_list = {}
+    list_format = get_list_format(filename) or DEFAULT_FORMAT
+
+    if split:
+        get_body_store(filename, create=True).write(user_list.values())
+    else:
+        load_descriptions(user_list.values())
     with open(filename, 'wb') as outputfile:
-        pickle.dump(list_object, outputfile)
+        outputfile.write(dump_list(user_list, list_format))
+    write_snapshot(user_list, filename)
+    if not split and is_split(filename):
+        drop_body_store(filename)
+        os.remove(bodies_path(filename))
+    bump_revision(filename)
+    return True
 
 
 def edit_task(task_id, task_list):
     """
     Edit task via manual process (one prompt per 'screen'),
     with progress bar displayed on each 'screen'.
-    Fields: title (req), description, due date, priority.
+    Fields: title (req), description, due date, priority, repeat.
 
     :param task_id:         ID of task to edit
     :param task_list:       Dictionary of user tasks.
     """
     step_num = 0
-    step_list = ['Edit Task Title', 'Edit Description', 'Edit Due Date', 'Edit Priority', 'Edit Completed']
-    attributes = ['task_name', 'description', 'due_date', 'priority']
+    step_list = ['Edit Task Title', 'Edit Description', 'Edit Due Date', 'Edit Priority', 'Edit Repeat',
+                 'Edit Completed']
+    attributes = ['task_name', 'description', 'due_date', 'priority', 'recurrence']
+    updates = {}
 
     for attribute in attributes:
         step_num = print_progress_bar(step_list, step_num)
-        label = attribute.replace("_", " ")
+        label = "repeat" if attribute == 'recurrence' else attribute.replace("_", " ")
         current_value = task_list[task_id].get_attribute(attribute)
+        if attribute == 'recurrence':
+            current_value = current_value or "none"
         hint = (
             " (YYYY-MM-DD)" if attribute == 'due_date'
             else " (1 for High, 2 for Medium, 3 for Low)" if attribute == 'priority'
+            else " (daily, weekly, monthly, every N days/weeks/months, or none)" if attribute == 'recurrence'
             else ""
         )
         prompt_string = (
@@ -643,10 +1282,11 @@ def edit_task(task_id, task_list):
         )
 
         updated_value = get_validated_task_input(prompt_string, attribute, allow_blank=True, allow_back=False)
-        if updated_value:
-            task_list[task_id].set_attribute(attribute, updated_value)
+        # None is a valid new value ('none': stop repeating)
+        if updated_value != "":
+            updates[attribute] = updated_value
 
-    save_list(task_list, 'userlist.pkl')
+    update_task(task_list, task_id, updates)
 
     print_progress_bar(step_list, step_num)
     print("\n\t✓ Task edited successfully!\n\n")
@@ -654,6 +1294,24 @@ def edit_task(task_id, task_list):
     clear_screen()
 
 
+def update_task(task_list, task_id, updates):
+    """
+    Apply edited field values to task and save list.
+
+    :param task_list:       Dictionary of user tasks.
+    :param task_id:         ID of task to edit
+    :param updates:         Dictionary of attribute names and new values
+    """
+    if _daemon_client:
+        task_list[task_id] = _daemon_client.edit_task(task_id, updates)
+        return
+
+    change = begin_change(f"edit task {task_id}", task_list, [task_id])
+    for attribute, value in updates.items():
+        task_list[task_id].set_attribute(attribute, value)
+    record_task_changes(task_list, [task_id], change=change)
+
+
 def complete_task_warn(user_list):
     """
     Warning and confirmation before marking task as completed.
@@ -662,9 +1320,15 @@ def complete_task_warn(user_list):
     :param user_list:       Dictionary of user tasks
     """
     task_id = int(get_input("\nTo mark a task as COMPLETE, enter its TaskID: ", get_task_id_keys(user_list)))
-    confirmation = input("\n(!) Are you sure you want to mark this task as completed?\n"
-                         "(!) THIS ACTION CANNOT BE REVERSED.\n"
-                         "\nEnter 'C' to COMPLETE the task or 'B' to go BACK to your list: ").upper()
+    task = user_list[task_id]
+    if task.recurrence:
+        warning = (f"\n(!) This task repeats {task.recurrence}.\n"
+                   f"(!) Are you sure you want to mark the one due {task.due_date.strftime('%b %d, %Y')} as completed?\n"
+                   "(!) You can UNDO this from the task menu with 'U'.\n")
+    else:
+        warning = ("\n(!) Are you sure you want to mark this task as completed?\n"
+                   "(!) You can UNDO this from the task menu with 'U'.\n")
+    confirmation = input(warning + "\nEnter 'C' to COMPLETE the task or 'B' to go BACK to your list: ").upper()
     # If user confirms, complete task
     if confirmation == 'C':
         complete_task(task_id, user_list)
@@ -677,8 +1341,7 @@ def complete_task(task_id, user_list):
     :param task_id:     ID of task to complete
     :param user_list:   Dictionary of user tasks
     """
-    user_list[task_id].set_complete()
-    save_list(user_list, 'userlist.pkl')
+    mark_task_complete(task_id, user_list)
 
     clear_screen()
     print("\n\t✓ Task successfully marked completed!\n\n")
@@ -686,6 +1349,46 @@ def complete_task(task_id, user_list):
     clear_screen()
 
 
+def mark_task_complete(task_id, user_list):
+    """
+    Mark task complete and save list, without any confirmation screen.
+    For a recurring task, only one occurrence is completed (see Task.set_complete).
+
+    :param task_id:     ID of task to complete, or occurrence key of one occurrence of a recurring task
+    :param user_list:   Dictionary of user tasks
+    """
+    task_id, occurrence = split_task_key(task_id)
+    if _daemon_client:
+        user_list[task_id] = _daemon_client.complete_task(task_id, occurrence)
+        return
+
+    change = begin_change(f"complete task {task_id}", user_list, [task_id])
+    user_list[task_id].set_complete(occurrence)
+    record_task_changes(user_list, [task_id], change=change)
+
+
+def undo_change(user_list, redo=False):
+    """
+    Undo the last change to the current list (or redo the last undone change) and save list.
+    Only the tasks the change touched are restored.
+
+    :param user_list:   Dictionary of user tasks
+    :param redo:        True to redo instead of undo
+    :return:            Message (str)
+    """
+    action = "redo" if redo else "undo"
+    if _daemon_client:
+        return f"(!) Cannot {action} while using the shared task daemon."
+
+    filename = workspaces.current_file
+    history = get_history(filename)
+    change = history.redo(user_list) if redo else history.undo(user_list)
+    if change is None:
+        return f"Nothing to {action}."
+    record_task_changes(user_list, change.task_ids, filename, change)
+    return f"✓ {'Redid' if redo else 'Undid'}: {change.label}"
+
+
 def create_json_data(user_list, purpose='export'):
     """
     Compile task list data into purpose-specific JSON format for microservice use.
@@ -734,7 +1437,13 @@ def convert_dict_to_task(item, purpose='export'):
         item["description"] if item["description"] else "",
         datetime.strptime(item["due_date"], "%Y-%m-%d").date() if item["due_date"] else "",
         int(item["priority"]) if item["priority"] else "",
-        item["status"]
+        item["status"],
+        datetime.fromisoformat(item["created_at"]) if item.get("created_at") else None,
+        datetime.fromisoformat(item["completed_at"]) if item.get("completed_at") else None,
+        int(item.get("revision", 0)),
+        RecurrenceRule.from_spec(item["recurrence"]) if item.get("recurrence") else None,
+        {date.fromisoformat(day): status for day, status in item["exceptions"].items()}
+        if item.get("recurrence") else None
     )
 
 
@@ -751,31 +1460,185 @@ def zmq_connect(port):
     return socket
 
 
+def request_microservice(port, request):
+    """
+    Send JSON request to microservice and wait for its JSON response.
+
+    :param port:        Port number of microservice
+    :param request:     Request dictionary
+    :return:            Response dictionary, size of response in bytes
+    """
+    socket = zmq_connect(port)
+    socket.send_json(request)
+    message = socket.recv()
+    return json.loads(message), len(message)
+
+
+def show_next_up(user_list):
+    """
+    Display the top-ranked incomplete tasks.
+
+    :param user_list:   Dictionary of user tasks
+    """
+    next_up = get_next_up_tasks(user_list)
+
+    clear_screen()
+    if next_up:
+        view_task_list(next_up, f"NEXT UP: top {len(next_up)}")
+    else:
+        print("\nNEXT UP: Nothing left to do!")
+
+
+def get_next_up_tasks(user_list, count=DEFAULT_COUNT, filename=None):
+    """
+    Get the top-ranked incomplete tasks (highest priority, then earliest due date),
+    without sorting the whole list.
+
+    :param user_list:   Dictionary of user tasks
+    :param count:       Number of tasks
+    :param filename:    Filepath of saved list (default: current workspace's)
+    :return:            Dictionary of tasks, best first
+    """
+    filename = filename or workspaces.current_file
+    task_ids = get_next_up(filename, user_list).top(count)
+    if isinstance(user_list, SnapshotTaskList):
+        # Only the top tasks are read from the snapshot
+        return {task.id: task for task in load_tasks_by_id(filename, task_ids)}
+    return {task_id: user_list[task_id] for task_id in task_ids}
+
+
+def run_queries(user_list, queries, filename=None, occurrences_until=None):
+    """
+    Run microservice queries against the current revision of saved list.
+    Cached results are reused. A single uncached query goes straight to its service;
+    several go out together in one batch envelope, sharing one copy of the task data.
+
+    :param user_list:           Dictionary of user tasks
+    :param queries:             List of (operation, params) with operation a key of SERVICE_PORTS
+    :param filename:            Filepath of saved list being queried (default: current workspace's)
+    :param occurrences_until:   If given, recurring tasks are sent as their open occurrences up to this date
+                                (generated only if a query is not cached)
+    :return:                    List of query results, in order of queries
+    """
+    filename = filename or workspaces.current_file
+    revision = store_revision(filename)
+    keys = [(filename, operation, normalize_params(params), revision, occurrences_until) for operation, params in queries]
+    results = [query_cache.lookup(key) for key in keys]
+    pending = [index for index, (hit, _) in enumerate(results) if not hit]
+    if not pending:
+        return [result for _, result in results]
+
+    if occurrences_until:
+        user_list = expand_occurrences(user_list, end=occurrences_until)
+    task_data = create_json_data(user_list)
+    responses = None
+    if len(pending) > 1:
+        batch = RequestBatch(task_data)
+        for index in pending:
+            batch.add(*queries[index])
+        try:
+            responses = batch.send()
+        # No batch gateway running (or it failed), so ask each service separately
+        except (ConnectionError, ValueError):
+            pass
+        if responses is not None and len(responses) != len(pending):
+            responses = None
+    if responses is None:
+        responses = []
+        for index in pending:
+            operation, params = queries[index]
+            request = build_service_request(operation, params, task_data)
+            responses.append(request_microservice(SERVICE_PORTS[operation], request))
+
+    for index, (response, size) in zip(pending, responses):
+        result = QUERY_RESULT_PARSERS[queries[index][0]](response)
+        # Errors (e.g. a service that is down) are not cached, so they are retried next time
+        if response.get("status") == "success":
+            query_cache.store(keys[index], result, size)
+        results[index] = (True, result)
+    return [result for _, result in results]
+
+
+def parse_overdue_response(response):
+    """
+    Get overdue task messages from Notification Service response.
+
+    :param response:    Response dictionary
+    :return:    List of overdue task messages or error
+    """
+    if response["status"] == "success":
+        return [notification["message"] for notification in response["notifications"]]
+    return ["Error returning overdue tasks."]
+
+
+def parse_completion_rate_response(response):
+    """
+    Get completion rate message from Analytics Service response.
+
+    :param response:    Response dictionary
+    :return:    Completion rate message or error
+    """
+    if response["status"] == "success":
+        return f"{response['result']*100:.0f}% of tasks completed"
+    return "Error analyzing completion rate."
+
+
+def parse_search_response(response):
+    """
+    Get matching tasks from Search Service response.
+
+    :param response:    Response dictionary
+    :return:    Dictionary of matching tasks, or None if search failed
+    """
+    if response["status"] == "success":
+        return rebuild_task_dict(response["results"])
+    return None
+
+
+def parse_filter_response(response):
+    """
+    Get matching tasks from Filter Service response.
+
+    :param response:    Response dictionary
+    :return:    Dictionary of matching tasks
+    """
+    if response["status"] == "success":
+        return rebuild_task_dict(response["results"])
+    return {}
+
+
+QUERY_RESULT_PARSERS = {
+    "overdue": parse_overdue_response,
+    "completion_rate": parse_completion_rate_response,
+    "search": parse_search_response,
+    "filter": parse_filter_response,
+}
+
+
+def overdue_query():
+    """
+    Get overdue query for run_queries.
+    Overdue depends on today's date as well as the list.
+
+    :return:    (operation, params)
+    """
+    return "overdue", {"today": date.today().isoformat()}
+
+
 def get_overdue_tasks(user_list):
     """
     Get list of overdue tasks on task list.
     Utilizes Notification Microservice, connecting via ZMQ on port 5556.
 
+    Each missed occurrence of a recurring task counts as an overdue task.
+
     :param user_list:       Dictionary of user tasks
     :return:                List of overdue task messages or error
     """
-    # Send request via port 5556
-    socket = zmq_connect(5556)
-    task_data = create_json_data(user_list, 'notification')
-    request = {
-        "notification_type": "overdue",
-        "event_data": task_data
-    }
-    socket.send_json(request)
-
-    # Receive response, return overdue tasks
-    response = socket.recv_json()
-    overdue_tasks = []
-    if response["status"] == "success":
-        for notification in response["notifications"]:
-            overdue_tasks.append(notification["message"])
-        return overdue_tasks
-    return ["Error returning overdue tasks."]
+    # Sharded list: only shards of past and current due months (and recurring tasks) can hold overdue tasks
+    if isinstance(user_list, ShardedTaskList):
+        user_list = user_list.load_shards(overdue_shard_keys(user_list.shard_keys(), date.today()))
+    return run_queries(user_list, [overdue_query()], occurrences_until=date.today() - timedelta(days=1))[0]
 
 
 def get_completion_rate(user_list):
@@ -786,20 +1649,72 @@ def get_completion_rate(user_list):
     :param user_list:       Dictionary of user tasks
     :return:                Result message
     """
-    # Send request via port 5555
-    socket = zmq_connect(5555)
-    task_data = create_json_data(user_list, 'get_completion_rate')
-    request = {
-        "metric_type": "get_completion_rate",
-        "event_type": "task",
-        "event_data": task_data
-    }
-    socket.send_json(request)
+    return run_queries(user_list, [("completion_rate", {})])[0]
 
-    response = socket.recv_json()
-    if response["status"] == "success":
-        return f"{response["result"]*100:.0f}% of tasks completed"
-    return "Error analyzing completion rate."
+
+def get_progress_report(user_list):
+    """
+    Get completion rate and overdue tasks together, in a single batched round trip.
+    Utilizes Analytics and Notification Microservices via the batch gateway (port 5561),
+    or each service separately if the gateway is not running.
+
+    :param user_list:       Dictionary of user tasks
+    :return:                List of messages
+    """
+    # Missed occurrences of recurring tasks count as overdue tasks, but each recurring task
+    # counts once toward the completion rate, so the two queries need different task data
+    if any(is_recurring(task) for task in user_list.values()):
+        completion_rate = get_completion_rate(user_list)
+        overdue_msgs = get_overdue_tasks(user_list)
+    else:
+        completion_rate, overdue_msgs = run_queries(user_list, [("completion_rate", {}), overdue_query()])
+    task_or_tasks = "tasks" if len(overdue_msgs) != 1 else "task"
+    messages = [f"\t {completion_rate}", f"\n\t {len(overdue_msgs)} overdue {task_or_tasks}:"]
+    messages += [f"\t    {msg}" for msg in overdue_msgs]
+    return messages + get_productivity_report(user_list)
+
+
+def get_productivity_report(user_list, filename=None):
+    """
+    Get burndown, weekly throughput, time-to-complete, and overdue aging, computed locally.
+    Requires numpy (report is skipped without it).
+
+    :param user_list:       Dictionary of user tasks
+    :param filename:        Filepath of saved list (default: current workspace's)
+    :return:                List of messages
+    """
+    filename = filename or workspaces.current_file
+    try:
+        from TidyTaskAnalytics import (burndown, load_columns, mean_time_to_complete, overdue_aging,
+                                       weekly_throughput)
+    except ImportError:
+        return ["\n\t Install NumPy to see productivity stats."]
+
+    columns = load_columns(filename, user_list)
+    today = date.today().toordinal()
+    messages = ["\n\t Open tasks, last 7 days:"]
+    days, open_counts = burndown(columns, today, days=7)
+    messages += [f"\t    {date.fromordinal(int(day)).strftime('%a %b %d')}: {count}"
+                 for day, count in zip(days, open_counts)]
+
+    messages.append("\n\t Completed per week:")
+    weeks, completed_counts = weekly_throughput(columns, today, weeks=4)
+    messages += [f"\t    Week of {date.fromordinal(int(week)).strftime('%b %d')}: {count}"
+                 for week, count in zip(weeks, completed_counts)]
+
+    messages.append("\n\t Average days to complete:")
+    priority_map = {1: 'High', 2: 'Medium', 3: 'Low', 0: 'None'}
+    average_days = mean_time_to_complete(columns)
+    messages += [f"\t    {priority_map.get(level, level)}: {mean:.1f} days ({count} tasks)"
+                 for level, (mean, count) in sorted(average_days.items(), key=lambda item: item[0] or 4)]
+    if not average_days:
+        messages.append("\t    No completed tasks with recorded dates yet.")
+
+    messages.append("\n\t Overdue by:")
+    for (low, high), count in overdue_aging(columns, today):
+        days_label = f"{low}-{high} days" if high else f"{low}+ days"
+        messages.append(f"\t    {days_label}: {count}")
+    return messages
 
 
 def search_tasks(user_list):
@@ -808,36 +1723,51 @@ def search_tasks(user_list):
 
     :param user_list:   Dictionary of user tasks
     """
-    socket = zmq_connect(5558)
-
     search_field = get_field_name('search')
-    search_term = input("Enter search term: ")
-    if search_field == 'priority' and str(search_term).lower() in ('high', 'medium', 'low'):
-        priority_map = {"high": "1", "medium": "2", "low": "3"}
-        search_term = priority_map[str(search_term).lower()]
-
-    request = {
-        "search_type": "basic_search",
-        "search_field": search_field,
-        "search_term": search_term,
-        "data": create_json_data(user_list)
-    }
+    search_term = alias_priority(search_field, input("Enter search term: "))
 
     print("\nSearching...")
-    socket.send_json(request)
+    result_list = run_search(user_list, search_field, search_term)
 
-    response = socket.recv_json()
-    if response["status"] == "success": #
+    if result_list is not None:
         clear_screen()
-        count = sum(1 for task in response["results"] if task["status"] == "incomplete")
+        count = sum(1 for task in result_list.values() if task.status == "incomplete")
         match_or_matches = "matches" if count != 1 else "match"
-        result_list = rebuild_task_dict(response["results"])
         view_task_list(result_list, f"SEARCH RESULTS: {count} {match_or_matches} found")
     else:
         clear_screen()
         print("\nSEARCH RESULTS: No matches found.")
 
 
+def run_search(user_list, search_field, search_term):
+    """
+    Get tasks that contain search term in given field.
+    Utilizes Search Microservice, connecting via ZMQ on port 5558.
+
+    :param user_list:       Dictionary of user tasks
+    :param search_field:    Field to search within
+    :param search_term:     Term to search for
+    :return:                Dictionary of matching tasks, or None if search failed
+    """
+    if _daemon_client:
+        return _daemon_client.search(search_field, search_term)
+    return run_queries(user_list, [("search", {"field": search_field, "term": search_term})])[0]
+
+
+def alias_priority(field_name, value):
+    """
+    Convert 'high', 'medium', or 'low' to priority number, if field is priority.
+
+    :param field_name:  Field the value is for
+    :param value:       User-entered value
+    :return:            Priority number (str) or value unchanged
+    """
+    if field_name == 'priority' and str(value).lower() in ('high', 'medium', 'low'):
+        priority_map = {"high": "1", "medium": "2", "low": "3"}
+        return priority_map[str(value).lower()]
+    return value
+
+
 def get_field_name(purpose):
     """
     Maps user-entered int to existing key,
@@ -866,9 +1796,21 @@ def sort_tasks(user_list):
 
     :param user_list:   Dictionary of user tasks
     """
-    socket = zmq_connect(5559)
-
     sort_field = get_field_name('sort')
+    sort_order = get_input("Ascending ('asc') or Descending ('desc'): ", ["ASC", "DESC"]).lower()
+    run_sort(user_list, sort_field, sort_order)
+    clear_screen()
+
+
+def run_sort(user_list, sort_field, sort_order):
+    """
+    Sort list of tasks by given field and save the new order.
+    Utilizes Sort Microservice, connecting via ZMQ on port 5559.
+
+    :param user_list:   Dictionary of user tasks
+    :param sort_field:  Field to sort by
+    :param sort_order:  'asc' or 'desc'
+    """
     sort_type_map = {
         'id': 'sort_int',
         'task_name': 'sort_string',
@@ -877,25 +1819,24 @@ def sort_tasks(user_list):
         'priority': 'sort_string',
     }
     sort_type = sort_type_map[sort_field]
-    sort_order = get_input("Ascending ('asc') or Descending ('desc'): ", ["ASC", "DESC"]).lower()
     priority_reverse_map = {"asc": "desc", "desc": "asc"}
     sort_order = priority_reverse_map[sort_order] if sort_field == "priority" else sort_order
 
-    request = {
-        "sort_type": sort_type,
-        "sort_field": sort_field,
-        "sort_order": sort_order,
-        "data": create_json_data(user_list)
-    }
-    socket.send_json(request)
-    response = socket.recv_json()
+    params = {"type": sort_type, "field": sort_field, "order": sort_order}
+    request = build_service_request("sort", params, create_json_data(user_list))
+    response, _ = request_microservice(SERVICE_PORTS["sort"], request)
 
-    # Overwrite existing list
-    sorted_list = rebuild_task_dict(response["results"])
+    # Reorder existing Task objects (the service only returns exported fields)
+    sorted_ids = [int(task["id"]) for task in response["results"]]
+    sorted_list = {task_id: user_list[task_id] for task_id in sorted_ids}
+    change = begin_change(f"sort by {sort_field.replace('_', ' ')}", user_list, [], reorder=True)
     user_list.clear()
     user_list.update(sorted_list)
-    save_list(user_list, 'userlist.pkl')
-    clear_screen()
+    if _daemon_client:
+        _daemon_client.reorder(sorted_list)
+        return
+    # Order changed, but no task did
+    record_task_changes(user_list, [], change=change)
 
 
 def filter_tasks(user_list):
@@ -905,35 +1846,100 @@ def filter_tasks(user_list):
 
     :param user_list:   Dictionary of user tasks
     """
-    socket = zmq_connect(5560)
-
     filter_list = get_filter_list()
-    logical_op = get_input(
-        "\nDo you want to match ALL filters ('all' or 'and') or ANY filters ('any' or 'or)? ",
-    ["ALL", "AND", "ANY", "OR"]
-    )
-    logical_op = "AND" if logical_op in ['ALL', 'AND'] else "OR"
-    request = {
-        "filter_type": "basic_filter",
-        "data": create_json_data(user_list),
-        "filters": filter_list,
-        "logical_op": logical_op
-    }
+    logical_op = get_logical_op()
 
     print("\nFiltering...")
-    socket.send_json(request)
-    response = socket.recv_json()
-    count = sum(1 for task in response["results"] if task["status"] == "incomplete")
-    if response["status"] == "success" and count != 0:
+    result_list = run_filter(user_list, filter_list, logical_op)
+    count = sum(1 for task in result_list.values() if task.status == "incomplete")
+    if count != 0:
         clear_screen()
         task_or_tasks = "tasks" if count != 1 else "task"
-        result_list = rebuild_task_dict(response["results"])
         view_task_list(result_list, f"FILTERED TASKS: {count} {task_or_tasks}")
     else:
         clear_screen()
         print("\nFilter RESULTS: No matches found.")
 
 
+def run_filter(user_list, filter_list, logical_op):
+    """
+    Get tasks that fall within filter criteria.
+    Utilizes Filter Microservice, connecting via ZMQ on port 5560.
+
+    :param user_list:       Dictionary of user tasks
+    :param filter_list:     List of filters
+    :param logical_op:      'AND' or 'OR'
+    :return:                Dictionary of matching tasks (occurrences of recurring tasks keyed by occurrence key)
+    """
+    if _daemon_client:
+        return _daemon_client.filter(filter_list, logical_op)
+    # Sharded list: due date 'between' filters limit which shards can hold results
+    if isinstance(user_list, ShardedTaskList):
+        shard_keys = filter_shard_keys(user_list.shard_keys(), filter_list, logical_op)
+        if shard_keys is not None:
+            user_list = user_list.load_shards(shard_keys)
+
+    # Results limited to a due date window: recurring tasks match by their occurrences in it
+    window = due_date_window(filter_list, logical_op)
+    recurring = {task_id: task for task_id, task in user_list.items() if is_recurring(task)} if window else {}
+    if recurring:
+        user_list = {task_id: task for task_id, task in user_list.items() if task_id not in recurring}
+    results = run_queries(user_list, [("filter", {"filters": filter_list, "logical_op": logical_op})])[0]
+    if recurring:
+        # Copied, as results is the cached query result
+        results = dict(results)
+        results.update(matching_occurrences(recurring, filter_list, logical_op, window))
+    return results
+
+
+def get_due_soon_tasks(user_list, days=DUE_SOON_DAYS):
+    """
+    Get incomplete tasks due from today through the next days, including every occurrence
+    of recurring tasks in that window.
+
+    :param user_list:   Dictionary of user tasks
+    :param days:        Number of days after today
+    :return:            Dictionary of tasks, in due date order
+    """
+    today = date.today()
+    due_filter = {"field_name": "due_date", "operator": "between",
+                  "value": [today.isoformat(), (today + timedelta(days=days)).isoformat()]}
+    results = run_filter(user_list, [due_filter], "AND")
+    due_soon = [(key, task) for key, task in results.items() if task.status == 'incomplete']
+    return dict(sorted(due_soon, key=lambda item: item[1].due_date))
+
+
+def show_due_soon(user_list):
+    """
+    Display tasks due within a number of days entered by user.
+
+    :param user_list:   Dictionary of user tasks
+    """
+    days_input = input(f"\nShow tasks due within how many days? (press ENTER for {DUE_SOON_DAYS}): ").strip()
+    days = int(days_input) if days_input.isdigit() else DUE_SOON_DAYS
+    due_soon = get_due_soon_tasks(user_list, days)
+
+    clear_screen()
+    if due_soon:
+        task_or_tasks = "tasks" if len(due_soon) != 1 else "task"
+        view_task_list(due_soon, f"DUE IN THE NEXT {days} DAYS: {len(due_soon)} {task_or_tasks}")
+    else:
+        print(f"\nDUE IN THE NEXT {days} DAYS: Nothing due!")
+
+
+def get_logical_op():
+    """
+    Get logical operator for combining filters from user.
+
+    :return:    'AND' or 'OR'
+    """
+    logical_op = get_input(
+        "\nDo you want to match ALL filters ('all' or 'and') or ANY filters ('any' or 'or)? ",
+    ["ALL", "AND", "ANY", "OR"]
+    )
+    return "AND" if logical_op in ['ALL', 'AND'] else "OR"
+
+
 def get_filter_list():
     """
     Get list of filters from user for filter_tasks.
@@ -961,10 +1967,7 @@ def get_filter_list():
             value2 = input("Enter the second value: ")
             value = [value1, value2]
         else:
-            value = input("\nEnter value to filter by: ")
-            if field_name == 'priority' and str(value).lower() in ('high', 'medium', 'low'):
-                priority_map = {"high": "1", "medium": "2", "low": "3"}
-                value = priority_map[str(value).lower()]
+            value = alias_priority(field_name, input("\nEnter value to filter by: "))
 
         filters.append({
             "field_name": field_name,
@@ -979,6 +1982,266 @@ def get_filter_list():
     return filters
 
 
+def print_instrumentation():
+    """
+    Print instrumentation stats (query cache hits/misses),
+    if enabled with the TIDYTASK_STATS environment variable.
+    """
+    if not os.environ.get('TIDYTASK_STATS'):
+        return
+    stats = query_cache.stats()
+    print("\n> STATS")
+    print(f"    Query cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']*100:.0f}% hit rate)")
+    print(f"                 {stats['entries']} entries, {stats['bytes']} bytes, {stats['evictions']} evictions")
+    for filename, bodies in open_body_stores().items():
+        stats = bodies.cache.stats()
+        print(f"    Description cache ({filename}): {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['entries']} entries, {stats['bytes']} bytes")
+
+
+def format_size(num_bytes):
+    """
+    Format size in bytes for display, e.g. '1.5 MB'.
+    """
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / 1024 / 1024:.1f} MB"
+
+
+def process_memory():
+    """
+    Get resident memory (RSS) of this process now and at its peak, where the OS reports them.
+
+    :return:    (current bytes or None, peak bytes or None)
+    """
+    current = peak = None
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        peak *= 1 if sys.platform == 'darwin' else 1024
+    except ImportError:
+        pass
+    return current, peak
+
+
+def print_memory_report(filename):
+    """
+    Print how much memory the saved list takes once loaded, where its descriptions are kept,
+    and the memory used by this process.
+
+    :param filename:    Filepath of saved list
+    """
+    tracemalloc.start()
+    try:
+        user_list = load_list(filename)
+        list_bytes = tracemalloc.get_traced_memory()[0]
+    except (EOFError, FileNotFoundError):
+        print("Your to do list is empty!")
+        return
+    finally:
+        tracemalloc.stop()
+
+    resident = [task.description for task in user_list.values()
+                if task.deferred_description is None and task.description]
+    resident_bytes = sum(len(description.encode('utf-8')) for description in resident)
+    bodies = get_body_store(filename)
+
+    print(f"> MEMORY: {filename}\n")
+    print(f"    Tasks:             {len(user_list)}")
+    print(f"    Loaded list:       {format_size(list_bytes)}")
+    if bodies is None:
+        print(f"    Descriptions:      {len(resident)} in memory ({format_size(resident_bytes)})")
+    else:
+        stats = bodies.stats()
+        print(f"    Descriptions:      {stats['descriptions']} in {bodies.path} "
+              f"({format_size(stats['file_bytes'])}), read when needed")
+        print(f"                       index {format_size(stats['index_bytes'])} in memory, "
+              f"cache up to {format_size(stats['cache_limit'])}")
+    current, peak = process_memory()
+    if current or peak:
+        print(f"    Process:           {format_size(current) if current else '?'} now, "
+              f"{format_size(peak) if peak else '?'} peak")
+    if bodies is None and is_sharded(filename):
+        print("\nSharded lists keep descriptions with their tasks.")
+    elif bodies is None:
+        print("\nRun 'python TidyTask.py split' to keep descriptions in a separate file "
+              "and load them only when needed.")
+
+
+def bench_formats(filename):
+    """
+    Time saving and loading the saved list in every file format, print the results,
+    and offer to switch the list to the fastest format.
+
+    :param filename:    Filepath of saved list
+    """
+    try:
+        user_list = load_list(filename)
+    except (EOFError, FileNotFoundError):
+        print("Your to do list is empty! Add some tasks before benchmarking.")
+        return
+    current_format = get_list_format(filename)
+
+    print(f"\nBenchmarking {len(user_list)} tasks...")
+    results = benchmark_formats(user_list, task_from_row, os.path.dirname(os.path.abspath(filename)))
+
+    col_widths = [16, 12, 12, 12]
+    print_table_row(['Format', 'Save (ms)', 'Load (ms)', 'Size (KB)'], col_widths, "List formats")
+    for result in results:
+        current = " *" if result["format"] == current_format else ""
+        print_table_row([format_name(result["format"]) + current, f"{result['save']*1000:.2f}",
+                         f"{result['load']*1000:.2f}", f"{result['size']/1024:.1f}"], col_widths)
+    print("\n* current format")
+
+    fastest = results[0]["format"]
+    if fastest == current_format:
+        print(f"\nYour list already uses the fastest format ({format_name(fastest)}).")
+        return
+    print(f"\nRecommended: {format_name(fastest)}")
+    switch = get_input(f"Switch your list to {format_name(fastest)}? (Y/N): ", ['Y', 'N'])
+    if switch == 'Y':
+        save_list(user_list, filename, fastest)
+        print(f"Your list is now saved as {format_name(fastest)}.")
+
+
+def workspaces_menu():
+    """
+    List workspaces (named task lists) and switch to one, or create a new one, based on user input.
+    """
+    clear_screen()
+    print("> LISTS\n")
+    names = list_workspaces()
+    open_files = workspaces.open_files()
+    for num, name in enumerate(names, start=1):
+        current = " (current)" if name == workspaces.current else ""
+        loaded = " *" if workspace_path(name) in open_files else ""
+        print(f"    {num}. {name}{current}{loaded}")
+    print("\n    * open (switching is instant)")
+
+    user_choice = get_input(
+        "\nEnter a list number to SWITCH to it, 'N' to create a NEW list, or 'B' to go BACK: ",
+        list(range(1, len(names) + 1)) + ['N', 'B']
+    )
+    if user_choice == 'N':
+        while True:
+            try:
+                name = validate_workspace_name(input("Name of new list: "))
+                break
+            except ValueError as e:
+                print(e)
+        workspaces.switch(name)
+    elif isinstance(user_choice, int):
+        workspaces.switch(names[user_choice - 1])
+    clear_screen()
+    if user_choice != 'B':
+        print(f"Now using list: {workspaces.current}\n")
+
+
+def saved_views_menu(user_list):
+    """
+    List saved views and open, create, or delete one, based on user input.
+
+    :param user_list:   Dictionary of user tasks
+    """
+    saved_views = get_saved_views(workspaces.current_file)
+    clear_screen()
+    print("> SAVED VIEWS\n")
+
+    names = saved_views.names()
+    if not names:
+        print("    You have no saved views yet.")
+    for num, name in enumerate(names, start=1):
+        print(f"    {num}. {name}")
+
+    user_choice = get_input(
+        "\nEnter a view number to OPEN it, 'N' to create a NEW view, "
+        "'D' to DELETE a view, or 'B' to go BACK: ",
+        list(range(1, len(names) + 1)) + ['N', 'D', 'B']
+    )
+    if user_choice == 'N':
+        create_saved_view(saved_views, user_list)
+    elif user_choice == 'D' and names:
+        view_num = get_input("\nTo DELETE a view, enter its number: ", list(range(1, len(names) + 1)))
+        saved_views.remove_view(names[view_num - 1])
+        print("\n\t✓ View deleted.\n")
+        time.sleep(1)
+    elif isinstance(user_choice, int):
+        open_saved_view(saved_views, names[user_choice - 1], user_list)
+        pause_before_return()
+        return
+    clear_screen()
+
+
+def create_saved_view(saved_views, user_list):
+    """
+    Create saved view from filters, logical operator, and optional sort order entered by user.
+
+    :param saved_views:     SavedViews of saved list
+    :param user_list:       Dictionary of user tasks
+    """
+    name = get_validated_task_input("\nEnter a name for the view: ", 'view_name', allow_blank=False, allow_back=False)
+    filter_list = get_filter_list()
+    logical_op = get_logical_op()
+
+    sort_field, sort_order = None, 'asc'
+    if get_input("\nDo you want to sort this view? (y/n): ", ["Y", "N"]) == 'Y':
+        sort_field = get_field_name('sort')
+        sort_order = get_input("Ascending ('asc') or Descending ('desc'): ", ["ASC", "DESC"]).lower()
+
+    saved_views.add_view(name, filter_list, logical_op, sort_field, sort_order, user_list)
+    print(f"\n\t✓ View '{name}' saved!\n")
+    time.sleep(1)
+
+
+def open_saved_view(saved_views, name, user_list):
+    """
+    Display tasks in saved view, in the view's sort order.
+
+    :param saved_views:     SavedViews of saved list
+    :param name:            Name of view to open
+    :param user_list:       Dictionary of user tasks
+    """
+    tasks = get_saved_view_tasks(saved_views, name, user_list)
+
+    clear_screen()
+    task_or_tasks = "tasks" if len(tasks) != 1 else "task"
+    view_task_list({task.id: task for task in tasks}, f"VIEW: {name} ({len(tasks)} {task_or_tasks})")
+
+
+def get_saved_view_tasks(saved_views, name, user_list):
+    """
+    Get tasks in saved view, in the view's sort order.
+    Membership is kept up to date on every change, so only the view's tasks are read.
+
+    :param saved_views:     SavedViews of saved list
+    :param name:            Name of view
+    :param user_list:       Dictionary of user tasks
+    :return:                List of Task objects
+    """
+    # List changed elsewhere since views were last updated
+    if saved_views.is_stale():
+        saved_views.rebuild(user_list)
+
+    view = saved_views.views[name]
+    tasks = load_tasks_by_id(saved_views.filename, saved_views.members(name))
+    if not view["sort_field"]:
+        return sorted(tasks, key=view_sort_key('id'))
+
+    # Priority 1 is High, so ascending priority runs from Low to High (as in sort_tasks)
+    reverse = view["sort_order"] == 'desc'
+    reverse = not reverse if view["sort_field"] == 'priority' else reverse
+    return sorted(tasks, key=view_sort_key(view["sort_field"]), reverse=reverse)
+
+
 def get_help():
     """
     Display help menu for app.
@@ -1001,9 +2264,14 @@ def get_help():
         "\t\tTask title/Task description/Due date/Priority\n"
         "\t* You must enter the '/' delimiters correctly or the quick-add will fail.\n"
         "\t* To leave a field blank, just continue onto the next delimiters \n\t\t  (e.g. '//' to skip one field)\n"
+        "\t* To add MANY tasks at once, enter 'P' and paste one task per line (end with a blank line),\n"
+        "\t  or enter '@' and a filepath (e.g. '@tasks.txt') to add every line of a text file.\n"
+        "\t* A task with the same title and due date as one on your list is flagged before it is added.\n"
+        "\t  When adding many tasks at once, exact duplicates are skipped.\n"
+        "\t  Start the app with --near-duplicates to also flag similar titles.\n"
 
         "\nTo mark a task as COMPLETE, enter 'C' from the VIEW tasks screen \nand follow the on-screen prompts.\n"
-        "\t* Completing a task removes it forever. This cannot be undone.\n"
+        "\t* Completing a task removes it from your list. Enter 'U' right after to undo it.\n"
 
         "\nTo EDIT a task, enter 'E' from the VIEW tasks screen \nand follow the on-screen prompts.\n"
         "\t* If you want to leave a field as is, just press ENTER when prompted to edit the field.\n"
@@ -1013,13 +2281,37 @@ def get_help():
         "\nTo SEARCH tasks, enter 'SE' from the VIEW tasks screen \nand follow the on-screen prompts.\n"
         
         "\nTo SORT your task list, enter 'ST' from the VIEW tasks screen \nand follow the on-screen prompts.\n"
-        "\t* This overrides the sort order of your saved list.\n"
+        "\t* This overrides the sort order of your saved list. Enter 'U' right after to undo it.\n"
         
         "\nTo FILTER your task list, enter 'F' from the VIEW tasks screen \nand follow the on-screen prompts.\n"
+
+        "\nTo see what's NEXT UP (your most important tasks: highest priority, then earliest due date), "
+        "\nenter 'N' from the VIEW tasks screen.\n"
+
+        "\nTo see what's DUE soon, enter 'D' from the VIEW tasks screen and enter a number of days.\n"
+
+        "\nTo make a task REPEAT, enter how often (daily, weekly, monthly, or e.g. 'every 2 weeks') "
+        "\nwhen adding or editing it. Quick-add takes it as a fifth field: Title/Description/Date/Priority/weekly\n"
+        "\t* A repeating task shows once, due on its next occurrence.\n"
+        "\t* Completing it completes that occurrence only; it is then due on the next one.\n"
+        "\t* Enter 'none' when editing to stop it repeating.\n"
+
+        "\nTo use SAVED VIEWS, enter 'SV' from the VIEW tasks screen.\n"
+        "\t* Save a set of filters (and a sort order) as a named view with 'N'.\n"
+        "\t* Open a view by its number to see its tasks instantly.\n"
         
-        "\nTo see your PROGRESS STATS (the % of tasks you've completed so far), "
+        "\nTo see your PROGRESS STATS (the % of tasks you've completed so far, your overdue tasks, "
+        "\nopen tasks per day, tasks completed per week, and how long tasks take to complete), "
         "\nenter 'P' from the VIEW tasks screen and follow the on-screen prompts.\n"
 
+        "\nTo UNDO your last change (add, edit, complete, or sort), enter 'U' from the VIEW tasks screen.\n"
+        f"\t* Enter 'U' again to undo earlier changes (up to {HISTORY_LIMIT}), and 'R' to REDO what you undid.\n"
+        "\t* Making a new change clears what can be redone.\n"
+
+        "\nTo switch LISTS, enter 'L' from the main menu.\n"
+        "\t* Keep a separate list per project. Enter 'N' to create a new list.\n"
+        "\t* Recently used lists stay open, so switching back to them is instant.\n"
+
         "\nTo QUIT the app, enter 'Q' from the main menu.\n")
 
     clear_screen()
@@ -0,0 +1,169 @@
+# Description:  "Next up" ranking: the few incomplete tasks that matter most, without sorting
+#               the whole list. A min-heap keyed on (priority, due date, id) is kept per saved
+#               list and updated in place by add/edit/complete. Changed or completed tasks
+#               leave stale entries behind, which are skipped (and dropped) when reached.
+
+
+import heapq
+from TidyTaskCache import store_revision
+from TidyTaskSnapshot import RECORD, STATUS_CODES, open_snapshot
+
+
+DEFAULT_COUNT = 5
+NO_PRIORITY = 4                     # Blank priority ranks after Low (3)
+NO_DUE_DATE = 2 ** 31               # Blank due date ranks after every date
+
+_next_up = {}
+
+
+def next_up_key(task_id, priority, due_ordinal):
+    """
+    Get heap key for a task: higher priority first, then earlier due date, then lower TaskID.
+
+    :param task_id:     TaskID
+    :param priority:    Priority (1-3), or blank
+    :param due_ordinal: Due date ordinal, or 0 if no due date
+    :return:            Key (tuple)
+    """
+    return (int(priority) if priority not in ("", None, 0) else NO_PRIORITY,
+            due_ordinal or NO_DUE_DATE,
+            task_id)
+
+
+def task_key(task):
+    """
+    Get heap key for Task object, or None if it is not incomplete (not ranked).
+    """
+    if task.status != 'incomplete':
+        return None
+    return next_up_key(task.id, task.priority, task.due_date.toordinal() if task.due_date else 0)
+
+
+class NextUpHeap:
+    """
+    Min-heap of incomplete tasks with lazy deletion.
+    _keys holds each ranked task's current key; heap entries that no longer match it are stale.
+    """
+    def __init__(self, keys, revision=None):
+        self._keys = keys
+        self._heap = list(keys.values())
+        heapq.heapify(self._heap)
+        # Revision of saved list the heap is up to date with
+        self.revision = revision
+
+    @classmethod
+    def from_task_list(cls, task_list, revision=None):
+        """
+        Build heap from Task objects in O(n).
+        """
+        keys = {}
+        for task_id, task in task_list.items():
+            key = task_key(task)
+            if key is not None:
+                keys[task_id] = key
+        return cls(keys, revision)
+
+    @classmethod
+    def from_snapshot(cls, reader, revision=None):
+        """
+        Build heap from a snapshot's fixed-width records, without decoding any strings.
+        """
+        incomplete = STATUS_CODES['incomplete']
+        keys = {}
+        for task_id, priority, status, due, *_ in RECORD.iter_unpack(reader.records()):
+            if status == incomplete:
+                keys[task_id] = next_up_key(task_id, priority, due)
+        return cls(keys, revision)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def update(self, task_list, task_ids):
+        """
+        Re-rank added/changed tasks, O(log n) each. Old entries become stale.
+
+        :param task_list:   Dictionary of user tasks
+        :param task_ids:    TaskIDs of added/changed tasks
+        """
+        for task_id in task_ids:
+            task = task_list.get(task_id)
+            key = task_key(task) if task is not None else None
+            if key is None:
+                self._keys.pop(task_id, None)
+            elif self._keys.get(task_id) != key:
+                self._keys[task_id] = key
+                heapq.heappush(self._heap, key)
+
+        # Compact once stale entries outnumber live ones
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._heap = list(self._keys.values())
+            heapq.heapify(self._heap)
+
+    def top(self, count=DEFAULT_COUNT):
+        """
+        Get TaskIDs of the top-ranked tasks in O(k log n): pop the best k live entries,
+        then push them back. Stale entries popped on the way are dropped for good, and so are
+        repeats of a live entry (a task whose key changed and then changed back has two).
+
+        :param count:   Number of tasks (k)
+        :return:        List of TaskIDs, best first
+        """
+        best = []
+        while self._heap and len(best) < count:
+            key = heapq.heappop(self._heap)
+            if self._keys.get(key[2]) == key and (not best or best[-1] != key):
+                best.append(key)
+        for key in best:
+            heapq.heappush(self._heap, key)
+        return [key[2] for key in best]
+
+
+def get_next_up(filename, task_list):
+    """
+    Get next-up heap of saved list, (re)building it if the list changed without it being updated
+    (first use, or saved by another process). Built from the snapshot where possible.
+
+    :param filename:    Filepath of saved list
+    :param task_list:   Dictionary of user tasks (used if there is no usable snapshot)
+    :return:            NextUpHeap
+    """
+    revision = store_revision(filename)
+    next_up = _next_up.get(filename)
+    if next_up is None or next_up.revision != revision:
+        snapshot = open_snapshot(filename)
+        if snapshot is None:
+            next_up = NextUpHeap.from_task_list(task_list, revision)
+        else:
+            with snapshot:
+                next_up = NextUpHeap.from_snapshot(snapshot, revision)
+        _next_up[filename] = next_up
+    return next_up
+
+
+def drop_next_up(filename):
+    """
+    Forget next-up heap of saved list (e.g. when the list is closed). Rebuilt on next use.
+
+    :param filename:    Filepath of saved list
+    """
+    _next_up.pop(filename, None)
+
+
+def update_next_up(filename, task_list, task_ids, old_revision):
+    """
+    Bring next-up heap of saved list up to date after a save, if it was up to date before it.
+    Otherwise drop it, to be rebuilt on next use.
+
+    :param filename:        Filepath of saved list
+    :param task_list:       Dictionary of user tasks
+    :param task_ids:        TaskIDs of added/changed tasks
+    :param old_revision:    Revision of saved list before the save
+    """
+    next_up = _next_up.get(filename)
+    if next_up is None:
+        return
+    if next_up.revision != old_revision:
+        del _next_up[filename]
+        return
+    next_up.update(task_list, task_ids)
+    next_up.revision = store_revision(filename)
@@ -0,0 +1,235 @@
+# Description:  Recurring tasks. A recurring task is stored once, with a rule ('daily',
+#               'every 2 weeks', 'monthly', ...) anchored at its first due date. Its due date
+#               is always its next open occurrence, so the saved list, next-up ranking and
+#               shards treat it like any other task. Other occurrences are never stored:
+#               they are generated lazily, only inside the date window being queried
+#               (overdue, due soon, due date 'between' filters).
+#               Completing an occurrence only stores an exception record for its date.
+
+
+import calendar, copy, re
+from datetime import date, timedelta
+from TidyTaskViews import parse_window_bound, task_matches_filters
+
+
+UNITS = {'day': 1, 'week': 7, 'month': None}
+NO_REPEAT = 'none'
+RULE_PATTERN = re.compile(r'^(?:every\s+(\d+)\s+)?(day|week|month)s?$')
+ALIASES = {'daily': 'day', 'weekly': 'week', 'monthly': 'month'}
+KEY_SEPARATOR = '@'
+
+
+class RecurrenceRule:
+    """
+    Repeats every interval days, weeks, or months from anchor (the first occurrence).
+    Monthly occurrences keep the anchor's day of month, or the month's last day if shorter.
+    """
+    def __init__(self, unit, interval=1, anchor=None):
+        self.unit = unit
+        self.interval = interval
+        self.anchor = anchor        # date of first occurrence, or None until task is given a due date
+
+    def anchored(self, anchor):
+        """
+        Get copy of rule starting on anchor.
+        """
+        return RecurrenceRule(self.unit, self.interval, anchor)
+
+    def _month_occurrence(self, step):
+        month_index = self.anchor.year * 12 + self.anchor.month - 1 + step * self.interval
+        year, month = divmod(month_index, 12)
+        month += 1
+        return date(year, month, min(self.anchor.day, calendar.monthrange(year, month)[1]))
+
+    def occurrences(self, start=None, end=None):
+        """
+        Generate occurrence dates from start to end (inclusive), in order.
+        Jumps straight to the first occurrence on or after start; nothing outside the window is made.
+
+        :param start:   First date of window (None for the anchor)
+        :param end:     Last date of window (None for no end)
+        :return:        Generator of dates
+        """
+        start = max(start, self.anchor) if start else self.anchor
+        if self.unit == 'month':
+            months = (start.year - self.anchor.year) * 12 + start.month - self.anchor.month
+            step = max(months // self.interval, 0)
+            next_date = lambda: self._month_occurrence(step)
+        else:
+            days = UNITS[self.unit] * self.interval
+            step = -(-(start - self.anchor).days // days)
+            next_date = lambda: self.anchor + timedelta(days=step * days)
+
+        while True:
+            day = next_date()
+            if end and day > end:
+                return
+            if day >= start:
+                yield day
+            step += 1
+
+    def spec(self):
+        """
+        Get rule as a string for saving, e.g. 'week:2:2025-11-03'.
+        """
+        return f"{self.unit}:{self.interval}:{self.anchor.isoformat() if self.anchor else ''}"
+
+    @classmethod
+    def from_spec(cls, spec):
+        """
+        Rebuild rule from string made by spec.
+        """
+        unit, interval, anchor = spec.split(':')
+        return cls(unit, int(interval), date.fromisoformat(anchor) if anchor else None)
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self.spec() == other.spec()
+
+    def __str__(self):
+        if self.interval == 1:
+            return {'day': 'daily', 'week': 'weekly', 'month': 'monthly'}[self.unit]
+        return f"every {self.interval} {self.unit}s"
+
+
+def parse_recurrence(text):
+    """
+    Parse recurrence input: 'daily', 'weekly', 'monthly', or 'every N days/weeks/months'.
+    Raise ValueError if invalid.
+
+    :param text:    User input string
+    :return:        RecurrenceRule (not yet anchored), or None for 'none'
+    """
+    text = " ".join(text.strip().lower().split())
+    if text == NO_REPEAT:
+        return None
+    match = RULE_PATTERN.match(ALIASES.get(text, text))
+    if not match or match.group(1) == '0':
+        raise ValueError("Invalid repeat. Please enter daily, weekly, monthly, every N days/weeks/months, or none.")
+    return RecurrenceRule(match.group(2), int(match.group(1) or 1))
+
+
+def is_recurring(task):
+    """
+    Check if task is an incomplete recurring task (one with occurrences to generate).
+    """
+    return task.status == 'incomplete' and task.recurrence is not None
+
+
+def open_occurrences(task, start=None, end=None):
+    """
+    Generate dates of occurrences of recurring task that are not completed, from start to end.
+    Occurrences before the task's due date (its next open occurrence) are all completed.
+
+    :param task:    Recurring Task object
+    :param start:   First date of window (None for no start)
+    :param end:     Last date of window (None for no end)
+    :return:        Generator of dates
+    """
+    start = max(start, task.due_date) if start else task.due_date
+    exceptions = task.exceptions or {}
+    return (day for day in task.recurrence.occurrences(start, end) if day not in exceptions)
+
+
+def complete_occurrence(task, day=None):
+    """
+    Record occurrence of recurring task as completed and move its due date to its next open occurrence.
+    Exception records before the new due date are no longer needed, so they are dropped.
+
+    :param task:    Recurring Task object
+    :param day:     Date of occurrence (None for its next open occurrence)
+    """
+    exceptions = dict(task.exceptions or {})
+    exceptions[day or task.due_date] = 'complete'
+    task.exceptions = exceptions
+    task.due_date = next(open_occurrences(task))
+    task.exceptions = {day: status for day, status in exceptions.items() if day > task.due_date}
+
+
+def occurrence_key(task_id, day):
+    """
+    Get key of one occurrence of a recurring task, e.g. '12@2025-11-03'.
+    """
+    return f"{task_id}{KEY_SEPARATOR}{day.isoformat()}"
+
+
+def split_task_key(key):
+    """
+    Split key of a task or occurrence.
+
+    :param key:     TaskID, or occurrence key from occurrence_key
+    :return:        TaskID, date of occurrence (or None if key is a TaskID)
+    """
+    if isinstance(key, str) and KEY_SEPARATOR in key:
+        task_id, day = key.split(KEY_SEPARATOR)
+        return int(task_id), date.fromisoformat(day)
+    return int(key), None
+
+
+def make_occurrence(task, day):
+    """
+    Get copy of recurring task for one occurrence, due on day.
+    """
+    occurrence = copy.copy(task)
+    occurrence.due_date = day
+    return occurrence
+
+
+def expand_occurrences(task_list, start=None, end=None):
+    """
+    Get task list with each recurring task replaced by its open occurrences from start to end.
+    Other tasks are kept as they are.
+
+    :param task_list:   Dictionary of user tasks
+    :param start:       First date of window (None for each task's due date)
+    :param end:         Last date of window
+    :return:            Dictionary of tasks, occurrences keyed by occurrence_key
+    """
+    expanded = {}
+    for task_id, task in task_list.items():
+        if not is_recurring(task):
+            expanded[task_id] = task
+            continue
+        for day in open_occurrences(task, start, end):
+            expanded[occurrence_key(task_id, day)] = make_occurrence(task, day)
+    return expanded
+
+
+def due_date_window(filter_list, logical_op):
+    """
+    Get date window that due date 'between' filters limit results to.
+    Other filters can match tasks due on any date, so (like filter_shard_keys) an 'OR' with
+    any other filter has no window.
+
+    :param filter_list: List of filters from get_filter_list
+    :param logical_op:  'AND' or 'OR'
+    :return:            (first date, last date), or None if results are not limited to a window
+    """
+    windows = []
+    for task_filter in filter_list:
+        if task_filter["field_name"] == 'due_date' and task_filter["operator"] == 'between':
+            low, high = task_filter["value"]
+            window = (parse_window_bound(low, last=False), parse_window_bound(high, last=True))
+            if None not in window:
+                windows.append(window)
+                continue
+        if logical_op == 'OR':
+            return None
+    if not windows:
+        return None
+    if logical_op == 'AND':
+        return max(low for low, _ in windows), min(high for _, high in windows)
+    return min(low for low, _ in windows), max(high for _, high in windows)
+
+
+def matching_occurrences(task_list, filter_list, logical_op, window):
+    """
+    Get open occurrences of recurring tasks inside window that match filters.
+
+    :param task_list:   Dictionary of recurring tasks
+    :param filter_list: List of filters from get_filter_list
+    :param logical_op:  'AND' or 'OR'
+    :param window:      (first date, last date), from due_date_window
+    :return:            Dictionary of occurrences keyed by occurrence_key
+    """
+    occurrences = expand_occurrences(task_list, *window)
+    return {key: task for key, task in occurrences.items() if task_matches_filters(task, filter_list, logical_op)}
@@ -0,0 +1,317 @@
+# Description:  Sharded storage for the saved task list. Incomplete tasks are stored in one
+#               shard per due month ('2025-11'), plus an 'undated' shard; completed tasks
+#               go to the 'archive' shard, and recurring tasks to the 'recurring' shard (their
+#               occurrences can fall in any month). The saved list's own file becomes a small manifest
+#               with the list order and each task's shard, so a list can be opened without
+#               loading any shard, reads load only the shards they need, and a save rewrites
+#               only the shards whose tasks changed.
+#
+#               Manifest:  [ header | meta (JSON: shard format, shard keys) | TaskIDs | shard codes ]
+#               Shards:    <list name>.shards/<key>.pkl, each a list file (see TidyTaskFormats)
+
+
+import json, os, re, struct
+from array import array
+from collections.abc import MutableMapping
+from TidyTaskFormats import DEFAULT_FORMAT, dump_list, load_list_data
+
+
+MANIFEST_MAGIC = b'TTSHARD1'
+MANIFEST_HEADER = struct.Struct('<8sIQ')    # magic, meta length, task count
+ARCHIVE = 'archive'
+UNDATED = 'undated'
+RECURRING = 'recurring'
+MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}')
+
+
+def shard_key(task):
+    """
+    Get key of the shard a task belongs in.
+
+    :param task:    Task object
+    :return:        'archive', 'recurring', 'undated', or due month as 'YYYY-MM'
+    """
+    if task.status == 'complete':
+        return ARCHIVE
+    if task.recurrence:
+        return RECURRING
+    if not task.due_date:
+        return UNDATED
+    return task.due_date.strftime('%Y-%m')
+
+
+def shards_dir(filename):
+    """
+    Get directory holding the shards of a saved list.
+    """
+    return os.path.splitext(filename)[0] + '.shards'
+
+
+def shard_path(filename, key):
+    """
+    Get filepath of one shard of a saved list.
+    """
+    return os.path.join(shards_dir(filename), key + '.pkl')
+
+
+def is_sharded(filename):
+    """
+    Check if saved list is stored in shards (its file is a manifest).
+    """
+    try:
+        with open(filename, 'rb') as readfile:
+            return readfile.read(len(MANIFEST_MAGIC)) == MANIFEST_MAGIC
+    except OSError:
+        return False
+
+
+def write_file(path, data):
+    """
+    Write file via a temp file, so readers never see it half-written.
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as outputfile:
+        outputfile.write(data)
+    os.replace(temp_path, path)
+
+
+def read_manifest(filename):
+    """
+    Read manifest of sharded list.
+
+    :param filename:    Filepath of saved list
+    :return:            Shard format, dictionary of TaskID -> shard key (in list order)
+    """
+    with open(filename, 'rb') as readfile:
+        data = readfile.read()
+    magic, meta_length, count = MANIFEST_HEADER.unpack_from(data)
+    if magic != MANIFEST_MAGIC:
+        raise ValueError("Not a sharded list manifest.")
+    meta_end = MANIFEST_HEADER.size + meta_length
+    meta = json.loads(data[MANIFEST_HEADER.size:meta_end])
+    task_ids = array('q', data[meta_end:meta_end + 8 * count])
+    codes = array('H', data[meta_end + 8 * count:meta_end + 10 * count])
+    keys = meta["keys"]
+    return tuple(meta["format"]), dict(zip(task_ids, (keys[code] for code in codes)))
+
+
+def write_manifest(filename, list_format, index):
+    """
+    Write manifest of sharded list.
+
+    :param filename:    Filepath of saved list
+    :param list_format: Format of shard files (serializer, compression)
+    :param index:       Dictionary of TaskID -> shard key, in list order
+    """
+    keys = sorted(set(index.values()))
+    codes = {key: code for code, key in enumerate(keys)}
+    meta = json.dumps({"format": list(list_format), "keys": keys}).encode('utf-8')
+    write_file(filename, b''.join([
+        MANIFEST_HEADER.pack(MANIFEST_MAGIC, len(meta), len(index)),
+        meta,
+        array('q', index).tobytes(),
+        array('H', (codes[key] for key in index.values())).tobytes()
+    ]))
+
+
+def open_sharded_list(filename, make_task):
+    """
+    Open sharded list without loading any shard.
+
+    :param filename:    Filepath of saved list
+    :param make_task:   Function(row) -> Task object
+    :return:            ShardedTaskList
+    """
+    list_format, index = read_manifest(filename)
+    return ShardedTaskList(filename, index, list_format, make_task)
+
+
+def write_sharded_list(task_list, filename, list_format=DEFAULT_FORMAT):
+    """
+    Store a whole task list in shards, replacing any shards already there.
+
+    :param task_list:   Dictionary of user tasks
+    :param filename:    Filepath of saved list (becomes the manifest)
+    :param list_format: Format of shard files (serializer, compression)
+    """
+    shards = {}
+    index = {}
+    for task_id, task in task_list.items():
+        key = shard_key(task)
+        shards.setdefault(key, {})[task_id] = task
+        index[task_id] = key
+
+    os.makedirs(shards_dir(filename), exist_ok=True)
+    for key, shard in shards.items():
+        write_file(shard_path(filename, key), dump_list(shard, list_format))
+    for name in os.listdir(shards_dir(filename)):
+        if name.endswith('.pkl') and name[:-len('.pkl')] not in shards:
+            os.remove(os.path.join(shards_dir(filename), name))
+    write_manifest(filename, list_format, index)
+
+
+def month_range_keys(keys, low, high):
+    """
+    Get due-month shard keys that can hold due dates from low to high ('YYYY-MM-DD').
+    """
+    return {key for key in keys if key not in (ARCHIVE, UNDATED, RECURRING) and low[:7] <= key <= high[:7]}
+
+
+def filter_shard_keys(keys, filter_list, logical_op):
+    """
+    Get shard keys that can hold incomplete tasks matching filters, using 'between'
+    filters on due date. Other filters can match tasks in any shard.
+    Recurring tasks can have occurrences in any window, so their shard is always included.
+
+    :param keys:        All shard keys of list
+    :param filter_list: List of filters from get_filter_list
+    :param logical_op:  'AND' or 'OR'
+    :return:            Set of shard keys, or None if every shard is needed
+    """
+    ranges = []
+    for task_filter in filter_list:
+        value = task_filter["value"]
+        if (task_filter["field_name"] == 'due_date' and task_filter["operator"] == 'between'
+                and all(MONTH_PATTERN.match(str(bound).strip()) for bound in value)):
+            ranges.append(month_range_keys(keys, *(str(bound).strip() for bound in value)))
+        elif logical_op == 'OR':
+            return None
+    if not ranges:
+        return None
+    shard_keys = set.intersection(*ranges) if logical_op == 'AND' else set.union(*ranges)
+    return shard_keys | ({RECURRING} & set(keys))
+
+
+def overdue_shard_keys(keys, today):
+    """
+    Get shard keys that can hold incomplete tasks due before today.
+    """
+    return {key for key in keys if key not in (ARCHIVE, UNDATED) and key <= today.strftime('%Y-%m')
+            or key == RECURRING}
+
+
+class ShardedTaskList(MutableMapping):
+    """
+    Task list stored in shards. TaskIDs, order, length and statuses come from the manifest;
+    a shard is loaded the first time one of its tasks is needed.
+    Tasks whose shard changed (completed, or due date edited) move on save.
+    """
+    def __init__(self, filename, index, list_format, make_task):
+        self.filename = filename
+        self.list_format = list_format
+        self._index = index             # TaskID -> key of shard holding it, in list order
+        self._make_task = make_task
+        self._shards = {}               # Loaded shards: key -> {TaskID: Task}
+        self._dirty = set()             # Keys of shards changed since last save
+
+    def _shard(self, key):
+        if key not in self._shards:
+            try:
+                with open(shard_path(self.filename, key), 'rb') as readfile:
+                    self._shards[key] = load_list_data(readfile.read(), self._make_task)
+            except (FileNotFoundError, EOFError):
+                self._shards[key] = {}
+        return self._shards[key]
+
+    def shard_keys(self):
+        """
+        Get keys of all shards that hold tasks.
+        """
+        return set(self._index.values())
+
+    def loaded_shard_keys(self):
+        """
+        Get keys of shards loaded so far.
+        """
+        return set(self._shards)
+
+    def load_shards(self, keys):
+        """
+        Get tasks stored in the given shards, loading only those shards.
+
+        :param keys:    Shard keys
+        :return:        Dictionary of tasks, in list order
+        """
+        keys = set(keys)
+        return {task_id: self._shard(key)[task_id] for task_id, key in self._index.items() if key in keys}
+
+    def incomplete_ids(self):
+        """
+        Get TaskIDs of incomplete tasks from the manifest only.
+        """
+        return [task_id for task_id, key in self._index.items() if key != ARCHIVE]
+
+    def materialize(self):
+        """
+        Load every shard.
+
+        :return:    self
+        """
+        for key in self.shard_keys():
+            self._shard(key)
+        return self
+
+    def __getitem__(self, task_id):
+        return self._shard(self._index[task_id])[task_id]
+
+    def __setitem__(self, task_id, task):
+        if task_id in self._index:
+            old_key = self._index[task_id]
+            self._shard(old_key).pop(task_id, None)
+            self._dirty.add(old_key)
+        key = shard_key(task)
+        self._shard(key)[task_id] = task
+        self._index[task_id] = key
+        self._dirty.add(key)
+
+    def __delitem__(self, task_id):
+        key = self._index.pop(task_id)
+        del self._shard(key)[task_id]
+        self._dirty.add(key)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, task_id):
+        return task_id in self._index
+
+    def clear(self):
+        # Every shard is emptied, so there is no need to load them first
+        self._dirty |= self.shard_keys() | set(self._shards)
+        self._shards = {key: {} for key in self._dirty}
+        self._index = {}
+
+    def save(self, changed_ids=None, list_format=None):
+        """
+        Move changed tasks to their shards, then rewrite only shards that changed, and the manifest.
+
+        :param changed_ids:     TaskIDs of added/changed tasks (None if unknown: every loaded task)
+        :param list_format:     New format of shard files (rewrites every shard)
+        """
+        if list_format and list_format != self.list_format:
+            self.materialize()
+            self._dirty |= set(self._shards)
+            self.list_format = list_format
+
+        if changed_ids is None:
+            changed_ids = [task_id for shard in self._shards.values() for task_id in shard]
+        for task_id in changed_ids:
+            if task_id in self._index:
+                task = self[task_id]
+                if shard_key(task) != self._index[task_id]:
+                    self[task_id] = task
+                else:
+                    self._dirty.add(self._index[task_id])
+
+        os.makedirs(shards_dir(self.filename), exist_ok=True)
+        for key in self._dirty:
+            shard = self._shards.get(key, {})
+            if shard:
+                write_file(shard_path(self.filename, key), dump_list(shard, self.list_format))
+            elif os.path.exists(shard_path(self.filename, key)):
+                os.remove(shard_path(self.filename, key))
+        self._dirty = set()
+        write_manifest(self.filename, self.list_format, self._index)
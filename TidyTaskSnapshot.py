@@ -0,0 +1,336 @@
+# Description:  Read-optimized snapshot of the saved task list.
+#               Fixed-width records hold id/priority/status/due date/timestamps/revision, and
+#               names, descriptions and recurrence (rule and completed occurrences) live in an
+#               offset-indexed string heap. Rows hold every Task field at full precision, so
+#               tasks decoded from them are the same as tasks loaded from the saved list.
+#               The file is opened with mmap so readers only decode the rows they actually touch.
+#
+#               Layout:  [ header | records (list order) | id index (sorted) | string heap ]
+
+
+import json, mmap, os, struct
+from collections.abc import MutableMapping
+from datetime import date, datetime, timedelta
+from TidyTaskRecurrence import RecurrenceRule
+
+
+SNAPSHOT_MAGIC = b'TTSNAP03'
+HEADER = struct.Struct('<8sQQQQ')        # magic, count, records offset, index offset, heap offset
+RECORD = struct.Struct('<qbbiQIQIqqqQI') # id, priority, status, due ordinal, name off/len, desc off/len,
+                                         # created, completed (epoch microseconds, 0 if unknown),
+                                         # revision, recurrence off/len (JSON, empty if none)
+INDEX_ENTRY = struct.Struct('<qQ')       # id, row number
+STATUS_CODES = {'incomplete': 0, 'complete': 1}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+
+def snapshot_path(filename):
+    """
+    Get filepath of the snapshot that belongs to a saved list.
+
+    :param filename:    Filepath of saved list
+    :return:            Filepath of snapshot (str)
+    """
+    return os.path.splitext(filename)[0] + '.snap'
+
+
+def encode_timestamp(value):
+    """
+    Convert datetime to epoch microseconds (0 if unknown), without float rounding.
+    """
+    if not value:
+        return 0
+    return int(value.replace(microsecond=0).timestamp()) * 1000000 + value.microsecond
+
+
+def decode_timestamp(value):
+    """
+    Convert epoch microseconds back to datetime (None if unknown).
+    """
+    if not value:
+        return None
+    seconds, microseconds = divmod(value, 1000000)
+    return datetime.fromtimestamp(seconds) + timedelta(microseconds=microseconds)
+
+
+def encode_recurrence(task):
+    """
+    Encode recurrence rule and completed occurrences of task for the string heap
+    (b"" if task does not repeat).
+    """
+    if task.recurrence is None and task.exceptions is None:
+        return b""
+    return json.dumps([task.recurrence.spec() if task.recurrence else "",
+                       [[day.toordinal(), status] for day, status in (task.exceptions or {}).items()]]).encode('utf-8')
+
+
+def decode_recurrence(data):
+    """
+    Decode recurrence rule and completed occurrences from the string heap.
+
+    :return:    RecurrenceRule (or None), dictionary of date -> status (or None)
+    """
+    if not data:
+        return None, None
+    spec, exceptions = json.loads(data)
+    return (RecurrenceRule.from_spec(spec) if spec else None,
+            {date.fromordinal(day): status for day, status in exceptions})
+
+
+def write_snapshot(task_list, filename):
+    """
+    Regenerate snapshot for saved list from its Task objects.
+    Descriptions kept in a description file (split layout) are left out.
+    Written to a temp file first, so readers never see a half-written snapshot.
+
+    :param task_list:   Dictionary of user tasks
+    :param filename:    Filepath of saved list (not the snapshot)
+    """
+    records = []
+    heap = bytearray()
+
+    for row, task in enumerate(task_list.values()):
+        name = str(task.task_name or "").encode('utf-8')
+        description = b"" if task.deferred_description is not None else str(task.description or "").encode('utf-8')
+        name_offset = len(heap)
+        heap += name
+        desc_offset = len(heap)
+        heap += description
+        recurrence = encode_recurrence(task)
+        recurrence_offset = len(heap)
+        heap += recurrence
+        records.append(RECORD.pack(
+            int(task.id),
+            int(task.priority) if task.priority not in ("", None) else 0,
+            STATUS_CODES.get(task.status, 0),
+            task.due_date.toordinal() if task.due_date else 0,
+            name_offset, len(name),
+            desc_offset, len(description),
+            encode_timestamp(task.created_at),
+            encode_timestamp(task.completed_at),
+            task.revision or 0,
+            recurrence_offset, len(recurrence)
+        ))
+
+    index = sorted((int(task_id), row) for row, task_id in enumerate(task_list))
+    records_offset = HEADER.size
+    index_offset = records_offset + RECORD.size * len(records)
+    heap_offset = index_offset + INDEX_ENTRY.size * len(index)
+
+    temp_path = snapshot_path(filename) + '.tmp'
+    with open(temp_path, 'wb') as outputfile:
+        outputfile.write(HEADER.pack(SNAPSHOT_MAGIC, len(records), records_offset, index_offset, heap_offset))
+        outputfile.write(b''.join(records))
+        outputfile.write(b''.join(INDEX_ENTRY.pack(task_id, row) for task_id, row in index))
+        outputfile.write(heap)
+    try:
+        os.replace(temp_path, snapshot_path(filename))
+    except OSError:
+        # Snapshot still mapped elsewhere (Windows); it is now older than the list, so it is ignored
+        os.remove(temp_path)
+
+
+def open_snapshot(filename):
+    """
+    Open snapshot for saved list, if one exists and is not older than the list.
+
+    :param filename:    Filepath of saved list
+    :return:            SnapshotReader, or None if no usable snapshot
+    """
+    path = snapshot_path(filename)
+    try:
+        if os.stat(path).st_mtime_ns < os.stat(filename).st_mtime_ns:
+            return None
+        return SnapshotReader(path)
+    except (OSError, ValueError):
+        return None
+
+
+class SnapshotReader:
+    """
+    Memory-mapped reader for a snapshot file. Rows are decoded on demand as (id, task_name,
+    description, due_date, priority, status, created_at, completed_at, revision, recurrence,
+    exceptions) tuples, in the order Task takes them.
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as readfile:
+            self._map = mmap.mmap(readfile.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self._records, self._index, self._heap = HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError("Not a Tidy Task snapshot.")
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Release the memory map.
+        """
+        self._map.close()
+
+    def _read_string(self, offset, length):
+        start = self._heap + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def row(self, row_num):
+        """
+        Decode a single row.
+
+        :param row_num:     Row number (list order)
+        :return:            Tuple of task fields
+        """
+        (task_id, priority, status, due, name_off, name_len, desc_off, desc_len,
+         created, completed, revision, recurrence_off, recurrence_len) = RECORD.unpack_from(
+            self._map, self._records + row_num * RECORD.size)
+        recurrence, exceptions = decode_recurrence(self._read_string(recurrence_off, recurrence_len))
+        return (
+            task_id,
+            self._read_string(name_off, name_len),
+            self._read_string(desc_off, desc_len),
+            date.fromordinal(due) if due else "",
+            priority if priority else "",
+            STATUS_NAMES[status],
+            decode_timestamp(created),
+            decode_timestamp(completed),
+            revision,
+            recurrence,
+            exceptions
+        )
+
+    def records(self):
+        """
+        Copy of the fixed-width records (list order), for reading whole columns at once.
+
+        :return:    Bytes of count * RECORD.size
+        """
+        return self._map[self._records:self._records + self.count * RECORD.size]
+
+    def rows(self, status=None):
+        """
+        Decode rows in list order, optionally only those with the given status.
+        Status is checked before strings are decoded.
+
+        :param status:      'incomplete', 'complete' or None for all rows
+        :return:            Generator of task field tuples
+        """
+        for row_num in range(self.count):
+            if status is None or self.status_at(row_num) == status:
+                yield self.row(row_num)
+
+    def id_at(self, row_num):
+        """
+        Get TaskID of row without decoding the rest of it.
+        """
+        return struct.unpack_from('<q', self._map, self._records + row_num * RECORD.size)[0]
+
+    def status_at(self, row_num):
+        """
+        Get status of row without decoding the rest of it.
+        """
+        return STATUS_NAMES[self._map[self._records + row_num * RECORD.size + 9]]
+
+    def ids(self):
+        """
+        Generator of TaskIDs in list order.
+        """
+        for row_num in range(self.count):
+            yield self.id_at(row_num)
+
+    def find_row(self, task_id):
+        """
+        Binary search of id index for row number of TaskID.
+
+        :param task_id:     TaskID to find
+        :return:            Row number, or None if TaskID not in snapshot
+        """
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            mid_id, row_num = INDEX_ENTRY.unpack_from(self._map, self._index + mid * INDEX_ENTRY.size)
+            if mid_id == task_id:
+                return row_num
+            if mid_id < task_id:
+                low = mid + 1
+            else:
+                high = mid
+        return None
+
+    def get(self, task_id):
+        """
+        Decode the row for a TaskID.
+
+        :param task_id:     TaskID to look up
+        :return:            Tuple of task fields, or None if TaskID not in snapshot
+        """
+        row_num = self.find_row(task_id)
+        return self.row(row_num) if row_num is not None else None
+
+
+class SnapshotTaskList(MutableMapping):
+    """
+    Task list backed by a snapshot until it is first read for Task objects or changed.
+    Ids, length and statuses come straight from the snapshot; anything else
+    loads the full saved list once (via loader) and uses it from then on.
+    """
+    def __init__(self, reader, loader):
+        self._reader = reader
+        self._loader = loader
+        self._tasks = None
+
+    def materialize(self):
+        """
+        Load full saved list, if not loaded yet.
+
+        :return:    Dictionary of user tasks
+        """
+        if self._tasks is None:
+            self._tasks = self._loader()
+            # Dropped rather than closed: an id iterator may still be reading from it
+            self._reader = None
+        return self._tasks
+
+    def incomplete_ids(self):
+        """
+        Get TaskIDs of incomplete tasks from the status column only.
+        """
+        if self._tasks is not None:
+            return [task_id for task_id, task in self._tasks.items() if task.status == 'incomplete']
+        return [self._reader.id_at(row_num) for row_num in range(len(self._reader))
+                if self._reader.status_at(row_num) == 'incomplete']
+
+    def __getitem__(self, task_id):
+        return self.materialize()[task_id]
+
+    def __setitem__(self, task_id, task):
+        self.materialize()[task_id] = task
+
+    def __delitem__(self, task_id):
+        del self.materialize()[task_id]
+
+    def __iter__(self):
+        if self._tasks is not None:
+            return iter(self._tasks)
+        return self._reader.ids()
+
+    def __len__(self):
+        if self._tasks is not None:
+            return len(self._tasks)
+        return len(self._reader)
+
+    def __contains__(self, task_id):
+        if self._tasks is not None:
+            return task_id in self._tasks
+        return isinstance(task_id, int) and self._reader.find_row(task_id) is not None
+
+    def clear(self):
+        if self._tasks is None:
+            self._tasks = {}
+            self._reader = None
+        self._tasks.clear()
@@ -0,0 +1,325 @@
+# Description:  Sync two replicas of a saved list (e.g. laptop and server) without copying it.
+#               Tasks are grouped into buckets by TaskID range, and a Merkle tree of content
+#               hashes is built over the buckets. Replicas compare the tree top-down and only
+#               descend into subtrees whose hashes differ, so only the differing buckets' task
+#               hashes, and then the differing tasks, are exchanged.
+#
+#               Changed tasks are merged by revision stamp (Task.revision, bumped on every
+#               change): the higher revision wins, ties go to the higher content hash so both
+#               replicas agree. Tasks added on both replicas under the same TaskID (different
+#               created_at) are both kept; the remote one gets a new TaskID.
+#
+#               Sync with a list file:       python TidyTask.py sync --peer other/userlist.pkl
+#               Serve a list for syncing:    python TidyTask.py sync-serve --endpoint tcp://*:5571
+#               Sync with a served list:     python TidyTask.py sync --peer tcp://server:5571
+
+
+import hashlib, json, os, zmq
+from TidyTaskModules import convert_dict_to_task, import_list, record_task_changes
+from TidyTaskSnapshot import SnapshotTaskList
+
+
+SYNC_ENDPOINT = "tcp://127.0.0.1:5571"
+SYNC_TIMEOUT = 10000    # Milliseconds to wait for a sync peer to answer
+BUCKET_SIZE = 64        # TaskIDs per leaf bucket
+FANOUT = 16             # Children per tree node
+EMPTY_HASH = bytes(8)
+
+
+def digest(data):
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+def task_hash(task):
+    """
+    Content hash of task, over every field including its revision.
+
+    :param task:    Task object
+    :return:        Hash (8 bytes)
+    """
+    fields = (task.id, task.task_name, task.description or "", str(task.due_date or ""),
+              str(task.priority or ""), task.status, str(task.created_at or ""), str(task.completed_at or ""),
+              task.revision, task.recurrence.spec() if task.recurrence else "",
+              sorted(day.isoformat() for day in task.exceptions or {}))
+    return digest(repr(fields).encode('utf-8'))
+
+
+def tree_depth(max_id):
+    """
+    Get number of levels below the root needed to cover TaskIDs up to max_id.
+    """
+    buckets = max_id // BUCKET_SIZE + 1
+    depth, width = 0, 1
+    while width < buckets:
+        depth += 1
+        width *= FANOUT
+    return depth
+
+
+class SyncReplica:
+    """
+    One replica of a saved list, answering sync requests about it.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        loaded = import_list(filename)
+        self.task_list = loaded.materialize() if isinstance(loaded, SnapshotTaskList) else loaded
+        self._task_hashes = {task_id: task_hash(task) for task_id, task in self.task_list.items()}
+        self._leaves = self._build_leaves()
+        self._levels = {}
+
+    def max_id(self):
+        return max(self.task_list, default=0)
+
+    def _build_leaves(self):
+        buckets = {}
+        for task_id in sorted(self._task_hashes):
+            buckets.setdefault(task_id // BUCKET_SIZE, []).append(task_id)
+        return {bucket: digest(b''.join(task_id.to_bytes(8, 'little') + self._task_hashes[task_id]
+                                         for task_id in task_ids))
+                for bucket, task_ids in buckets.items()}
+
+    def levels(self, depth):
+        """
+        Get hashes of every non-empty node, level by level (0 = root, depth = leaf buckets).
+
+        :param depth:   Depth of tree (agreed between replicas)
+        :return:        List of {node index: hash}, one per level
+        """
+        if depth not in self._levels:
+            levels = [self._leaves]
+            for _ in range(depth):
+                children = levels[0]
+                parents = {}
+                for index in children:
+                    parents.setdefault(index // FANOUT, None)
+                levels.insert(0, {parent: digest(b''.join(children.get(parent * FANOUT + offset, EMPTY_HASH)
+                                                          for offset in range(FANOUT)))
+                                  for parent in parents})
+            self._levels[depth] = levels
+        return self._levels[depth]
+
+    def node_hash(self, depth, level, index):
+        return self.levels(depth)[level].get(index, EMPTY_HASH)
+
+    def bucket_hashes(self, bucket):
+        """
+        Get (TaskID, hash) of every task in leaf bucket.
+        """
+        first_id = bucket * BUCKET_SIZE
+        return [(task_id, self._task_hashes[task_id]) for task_id in range(first_id, first_id + BUCKET_SIZE)
+                if task_id in self._task_hashes]
+
+    def apply(self, tasks):
+        """
+        Store tasks received from the other replica (replacing tasks with same TaskID) and save.
+
+        :param tasks:   List of Task objects
+        """
+        for task in tasks:
+            self.task_list[task.id] = task
+            self._task_hashes[task.id] = task_hash(task)
+        if tasks:
+            record_task_changes(self.task_list, [task.id for task in tasks], self.filename)
+            # Tree is rebuilt if asked again
+            self._leaves = self._build_leaves()
+            self._levels = {}
+
+    def handle(self, request):
+        """
+        Answer one sync request (JSON-compatible dictionaries; hashes as hex).
+
+        :param request:     Request dictionary with "op" and its parameters
+        :return:            Response dictionary
+        """
+        op = request["op"]
+        if op == 'info':
+            return {"max_id": self.max_id(), "count": len(self.task_list)}
+        if op == 'nodes':
+            depth, level = request["depth"], request["level"]
+            return {"hashes": [self.node_hash(depth, level, index).hex() for index in request["nodes"]]}
+        if op == 'buckets':
+            return {"buckets": [[[task_id, hash_value.hex()] for task_id, hash_value in self.bucket_hashes(bucket)]
+                                for bucket in request["buckets"]]}
+        if op == 'tasks':
+            return {"tasks": [self.task_list[task_id].convert_to_dict(purpose='store') for task_id in request["ids"]]}
+        if op == 'apply':
+            self.apply([convert_dict_to_task(task, purpose='store') for task in request["tasks"]])
+            return {"applied": len(request["tasks"])}
+        raise ValueError(f"Unknown sync operation: {op}")
+
+
+class LocalTransport:
+    """
+    Sync transport to a list file reachable from this machine (e.g. on a mounted drive).
+    Requests are still encoded as JSON, so bytes counted match the ZMQ transport.
+    Raises FileNotFoundError if there is no saved list at filename (rather than syncing
+    into a new, empty list).
+    """
+    def __init__(self, filename):
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(f"No saved list at '{filename}'.")
+        self.replica = SyncReplica(filename)
+        self.bytes_sent = self.bytes_received = 0
+
+    def request(self, message):
+        data = json.dumps(message).encode('utf-8')
+        self.bytes_sent += len(data)
+        response = json.dumps(self.replica.handle(json.loads(data))).encode('utf-8')
+        self.bytes_received += len(response)
+        return json.loads(response)
+
+
+class ZmqTransport:
+    """
+    Sync transport to a list served by serve_sync on another machine.
+    Raises ConnectionError if the server does not answer within timeout.
+    """
+    def __init__(self, endpoint=SYNC_ENDPOINT, timeout=SYNC_TIMEOUT):
+        self.endpoint = endpoint
+        self.socket = zmq.Context.instance().socket(zmq.REQ)
+        self.socket.setsockopt(zmq.RCVTIMEO, timeout)
+        self.socket.setsockopt(zmq.SNDTIMEO, timeout)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(endpoint)
+        self.bytes_sent = self.bytes_received = 0
+
+    def request(self, message):
+        data = json.dumps(message).encode('utf-8')
+        self.bytes_sent += len(data)
+        try:
+            self.socket.send(data)
+            response = self.socket.recv()
+        except zmq.Again:
+            self.socket.close()
+            raise ConnectionError(f"Sync server at {self.endpoint} did not respond.")
+        self.bytes_received += len(response)
+        response = json.loads(response)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+
+def serve_sync(filename, endpoint=SYNC_ENDPOINT):
+    """
+    Serve saved list to sync peers until interrupted.
+    The list is reloaded for each sync, so changes made between syncs are seen.
+
+    :param filename:    Filepath of saved list
+    :param endpoint:    ZMQ endpoint to bind
+    """
+    socket = zmq.Context.instance().socket(zmq.REP)
+    socket.bind(endpoint)
+    print(f"Serving '{filename}' for sync on {endpoint}...")
+    replica = None
+    try:
+        while True:
+            try:
+                request = socket.recv_json()
+                # Each sync starts with 'info'
+                if replica is None or request["op"] == 'info':
+                    replica = SyncReplica(filename)
+                response = replica.handle(request)
+            # Always reply, or the REP socket can't take the next request
+            except Exception as e:
+                response = {"error": str(e) or type(e).__name__}
+            socket.send_json(response)
+    except KeyboardInterrupt:
+        print("\nSync server stopped.")
+
+
+def sync_lists(filename, transport):
+    """
+    Sync saved list with the replica behind transport. Both end up with the same tasks.
+
+    :param filename:    Filepath of local saved list
+    :param transport:   LocalTransport or ZmqTransport to the other replica
+    :return:            Dictionary of sync stats
+    """
+    local = SyncReplica(filename)
+    remote_info = transport.request({"op": 'info'})
+    max_id = max(local.max_id(), remote_info["max_id"])
+    depth = tree_depth(max_id)
+
+    # Walk down the tree, keeping only nodes whose hashes differ
+    differing = [0]
+    for level in range(depth + 1):
+        if not differing:
+            break
+        remote_hashes = transport.request({"op": 'nodes', "depth": depth, "level": level, "nodes": differing})["hashes"]
+        differing = [index for index, remote_hash in zip(differing, remote_hashes)
+                     if local.node_hash(depth, level, index).hex() != remote_hash]
+        if level < depth:
+            differing = [index * FANOUT + offset for index in differing for offset in range(FANOUT)]
+
+    # Compare task hashes within differing buckets
+    changed_ids = []
+    remote_hashes = {}
+    if differing:
+        remote_buckets = transport.request({"op": 'buckets', "buckets": differing})["buckets"]
+        for bucket, remote_bucket in zip(differing, remote_buckets):
+            bucket_remote = {task_id: bytes.fromhex(hash_value) for task_id, hash_value in remote_bucket}
+            remote_hashes.update(bucket_remote)
+            bucket_local = dict(local.bucket_hashes(bucket))
+            changed_ids += sorted(task_id for task_id in bucket_local.keys() | bucket_remote.keys()
+                                  if bucket_local.get(task_id) != bucket_remote.get(task_id))
+
+    fetch_ids = [task_id for task_id in changed_ids if task_id in remote_hashes]
+    remote_tasks = {}
+    if fetch_ids:
+        remote_tasks = {task["id"]: convert_dict_to_task(task, purpose='store')
+                        for task in transport.request({"op": 'tasks', "ids": fetch_ids})["tasks"]}
+
+    # Merge: decide which version of each changed task both replicas keep
+    to_local, to_remote = [], []
+    next_id = max_id + 1
+    for task_id in changed_ids:
+        local_task = local.task_list.get(task_id)
+        remote_task = remote_tasks.get(task_id)
+        if remote_task is None:
+            to_remote.append(local_task)
+        elif local_task is None:
+            to_local.append(remote_task)
+        elif (local_task.created_at and remote_task.created_at
+              and local_task.created_at != remote_task.created_at):
+            # Different tasks added on each replica: keep both
+            remote_task.id = next_id
+            next_id += 1
+            to_local.append(remote_task)
+            to_remote += [local_task, remote_task]
+        elif ((local_task.revision, task_hash(local_task)) >
+              (remote_task.revision, remote_hashes[task_id])):
+            to_remote.append(local_task)
+        else:
+            to_local.append(remote_task)
+
+    local.apply(to_local)
+    if to_remote:
+        transport.request({"op": 'apply', "tasks": [task.convert_to_dict(purpose='store') for task in to_remote]})
+
+    return {
+        "pulled": len(to_local),
+        "pushed": len(to_remote),
+        "bytes_sent": transport.bytes_sent,
+        "bytes_received": transport.bytes_received,
+    }
+
+
+def sync_with_peer(filename, peer):
+    """
+    Sync saved list with peer and print what was exchanged.
+
+    :param filename:    Filepath of local saved list
+    :param peer:        Filepath of other list, or tcp:// endpoint of a sync server
+    """
+    try:
+        transport = ZmqTransport(peer) if peer.startswith('tcp://') else LocalTransport(peer)
+        print(f"Syncing with {peer}...")
+        stats = sync_lists(filename, transport)
+    except (OSError, RuntimeError) as e:
+        print(f"Sync failed: {e}")
+        return
+    task_or_tasks = lambda count: "task" if count == 1 else "tasks"
+    print(f"Pulled {stats['pulled']} {task_or_tasks(stats['pulled'])}, "
+          f"pushed {stats['pushed']} {task_or_tasks(stats['pushed'])} "
+          f"({(stats['bytes_sent'] + stats['bytes_received']) / 1024:.1f} KB exchanged).")
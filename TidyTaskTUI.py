@@ -0,0 +1,484 @@
+# Description:  Optional full-screen curses interface for Tidy Task (start with --tui).
+#               Offers the same actions as the task menu (route_choice), but only redraws
+#               screen rows that changed, scrolls the task table virtually (only visible
+#               rows are read from the snapshot), and shows confirmations on a status
+#               line instead of pausing.
+
+
+import curses, time
+from TidyTaskModules import (TABLE_HEADERS, alias_priority, check_duplicates,
+                             describe_duplicate, format_table_row, get_due_soon_tasks, get_next_up_tasks, get_overdue_tasks, get_progress_report,
+                             get_saved_view_tasks, get_task_id_keys, get_task_row_data, load_tasks_by_id,
+                             mark_task_complete, parse_quick_add_batch, parse_quick_add_input, read_quick_add_file,
+                             run_filter, run_search, run_sort, save_new_task, save_new_tasks, sort_out_duplicates,
+                             table_col_widths, undo_change, update_task, validate_date_input, validate_priority_input,
+                             workspaces)
+from TidyTaskRecurrence import parse_recurrence, split_task_key
+from TidyTaskShards import ShardedTaskList
+from TidyTaskViews import get_saved_views
+
+
+# Keys for task menu actions (same action codes as route_choice)
+KEY_ACTIONS = {
+    'a': 'A', 'c': 'C', 'e': 'E', 'o': 'O', 's': 'SE',
+    't': 'ST', 'f': 'F', 'v': 'SV', 'n': 'N', 'd': 'D', 'p': 'P', 'u': 'U', 'r': 'R', 'q': 'M'
+}
+KEY_LEGEND = ("a:Add c:Complete e:Edit o:Overdue s:Search t:Sort f:Filter "
+              "v:Views n:Next d:Due p:Progress u:Undo r:Redo b:Back q:Quit")
+FIELD_PROMPT = "[1 TaskID, 2 Task Name, 3 Description, 4 Date, 5 Priority]"
+FIELD_MAP = {'1': "id", '2': "task_name", '3': "description", '4': "due_date", '5': "priority"}
+STATUS_SECONDS = 3
+HEADER_ROWS = 3     # title, column headers, separator
+FOOTER_ROWS = 2     # status line, key legend
+
+
+def run_tui(filename=None):
+    """
+    Start curses interface on saved list.
+
+    :param filename:    Filepath of saved list (default: current workspace's)
+    """
+    filename = filename or workspaces.current_file
+    user_list = workspaces.get(filename)
+    curses.wrapper(lambda stdscr: TaskScreen(stdscr, user_list, filename).run())
+
+
+class TaskScreen:
+    """
+    Full-screen task table with a status line.
+    Shows the saved list, a result set (search, filter, saved view), or lines of text.
+    """
+    def __init__(self, stdscr, user_list, filename=None):
+        self.stdscr = stdscr
+        self.user_list = user_list
+        self.filename = filename or workspaces.current_file
+        self.title = "TASKS"
+        self.task_ids = []
+        self.col_widths = []    # Col widths of task table, fitted to task_ids
+        self.results = None     # Dictionary of result tasks, or None when showing saved list
+        self.text_lines = None  # Lines shown instead of the table, or None
+        self.top = 0
+        self.selected = 0
+        self.status = ""
+        self.status_until = 0
+        self._drawn = {}        # screen row -> (text, attr) currently on screen
+        self._row_cache = {}    # TaskID -> Task for rows currently visible
+        self.show_saved_list()
+
+    # --- What is shown
+
+    def show_saved_list(self):
+        """
+        Show incomplete tasks of saved list. Only ids and statuses are read up front.
+        """
+        self.title = "TASKS"
+        self.results = None
+        self.text_lines = None
+        self.task_ids = get_task_id_keys(self.user_list)
+        self.col_widths = table_col_widths(self.task_ids)
+        self._row_cache = {}
+        self.selected = min(self.selected, max(len(self.task_ids) - 1, 0))
+        self.top = min(self.top, self.selected)
+
+    def show_results(self, title, result_list):
+        """
+        Show incomplete tasks of a result set in the table.
+
+        :param title:       Title of results
+        :param result_list: Dictionary of result tasks
+        """
+        self.title = title
+        self.results = result_list
+        self.text_lines = None
+        self.task_ids = [task_id for task_id, task in result_list.items() if task.status == 'incomplete']
+        self.col_widths = table_col_widths(self.task_ids)
+        self._row_cache = {}
+        self.top = self.selected = 0
+
+    def show_text(self, title, lines):
+        """
+        Show lines of text in place of the table.
+
+        :param title:       Title of text
+        :param lines:       List of lines
+        """
+        self.title = title
+        self.text_lines = list(lines)
+        self.top = 0
+
+    def set_status(self, message):
+        """
+        Show message on status line for a few seconds, without blocking.
+        """
+        self.status = message
+        self.status_until = time.monotonic() + STATUS_SECONDS
+
+    def selected_task_id(self):
+        """
+        Get TaskID of highlighted row, or None if table is empty.
+        """
+        if self.text_lines is not None or not self.task_ids:
+            return None
+        return self.task_ids[self.selected]
+
+    # --- Drawing
+
+    def table_height(self):
+        height, _ = self.stdscr.getmaxyx()
+        return max(height - HEADER_ROWS - FOOTER_ROWS, 1)
+
+    def visible_tasks(self):
+        """
+        Get Task objects for visible rows, reading only rows not already cached.
+
+        :return:    Dictionary of TaskID -> Task for visible rows
+        """
+        visible_ids = self.task_ids[self.top:self.top + self.table_height()]
+        if self.results is not None:
+            return {task_id: self.results[task_id] for task_id in visible_ids}
+
+        missing = [task_id for task_id in visible_ids if task_id not in self._row_cache]
+        if missing:
+            # Sharded list keeps the shards it has loaded, so read through it
+            if isinstance(self.user_list, ShardedTaskList):
+                tasks = [self.user_list[task_id] for task_id in missing if task_id in self.user_list]
+            else:
+                tasks = load_tasks_by_id(self.filename, missing)
+            for task in tasks:
+                self._row_cache[task.id] = task
+        # Keep only visible rows, so memory stays bounded by screen size
+        self._row_cache = {task_id: self._row_cache[task_id] for task_id in visible_ids
+                           if task_id in self._row_cache}
+        return self._row_cache
+
+    def draw_line(self, row, text, attr=curses.A_NORMAL):
+        """
+        Draw a screen row, only if it differs from what is already on screen.
+        """
+        if self._drawn.get(row) == (text, attr):
+            return
+        _, width = self.stdscr.getmaxyx()
+        self.stdscr.move(row, 0)
+        self.stdscr.clrtoeol()
+        self.stdscr.addnstr(row, 0, text, max(width - 1, 0), attr)
+        self._drawn[row] = (text, attr)
+
+    def render(self):
+        """
+        Draw screen, touching only rows whose contents changed.
+        """
+        height, _ = self.stdscr.getmaxyx()
+        table_height = self.table_height()
+
+        self.draw_line(0, f"T I D Y   T A S K   >  {self.title}", curses.A_BOLD)
+        if self.text_lines is not None:
+            self.draw_line(1, "")
+            self.draw_line(2, "")
+            visible = self.text_lines[self.top:self.top + table_height]
+            for offset in range(table_height):
+                self.draw_line(HEADER_ROWS + offset, visible[offset] if offset < len(visible) else "")
+        else:
+            self.draw_line(1, format_table_row(TABLE_HEADERS, self.col_widths, truncate=True))
+            self.draw_line(2, "-" * sum(self.col_widths))
+            tasks = self.visible_tasks()
+            for offset in range(table_height):
+                index = self.top + offset
+                if index >= len(self.task_ids):
+                    text = "Your to do list is empty!" if index == 0 else ""
+                    self.draw_line(HEADER_ROWS + offset, text)
+                    continue
+                task_id = self.task_ids[index]
+                text = format_table_row(get_task_row_data(task_id, tasks[task_id]), self.col_widths, truncate=True)
+                attr = curses.A_REVERSE if index == self.selected else curses.A_NORMAL
+                self.draw_line(HEADER_ROWS + offset, text, attr)
+
+        if self.status and time.monotonic() > self.status_until:
+            self.status = ""
+        self.draw_line(height - 2, self.status, curses.A_BOLD)
+        self.draw_line(height - 1, KEY_LEGEND, curses.A_DIM)
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def redraw_all(self):
+        """
+        Forget what is on screen (e.g. after resize), so every row is drawn again.
+        """
+        self._drawn = {}
+        self.stdscr.clear()
+
+    # --- Input
+
+    def prompt(self, text):
+        """
+        Get a line of input on the status line.
+
+        :param text:    Prompt string
+        :return:        User input (str), blank to cancel
+        """
+        height, width = self.stdscr.getmaxyx()
+        row = height - 2
+        self.draw_line(row, text, curses.A_BOLD)
+        curses.echo()
+        curses.curs_set(1)
+        self.stdscr.timeout(-1)
+        try:
+            user_input = self.stdscr.getstr(row, min(len(text), width - 2), max(width - len(text) - 1, 1))
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+            self.stdscr.timeout(500)
+            self._drawn.pop(row, None)
+        return user_input.decode('utf-8', 'replace').strip()
+
+    def prompt_field(self, purpose):
+        """
+        Get field name for search, sort, or filter on the status line.
+
+        :param purpose:     'search within', 'sort by', or 'filter by'
+        :return:            Field name, or None if invalid or cancelled
+        """
+        return FIELD_MAP.get(self.prompt(f"Column to {purpose} {FIELD_PROMPT}: "))
+
+    def busy(self, message):
+        """
+        Show message while a request to a microservice is in progress.
+        """
+        self.set_status(message)
+        self.render()
+
+    def move_selection(self, delta):
+        """
+        Move highlighted row (or scroll text), keeping it within the visible window.
+        """
+        table_height = self.table_height()
+        if self.text_lines is not None:
+            self.top = max(0, min(self.top + delta, len(self.text_lines) - table_height))
+            return
+        if not self.task_ids:
+            return
+        self.selected = max(0, min(self.selected + delta, len(self.task_ids) - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + table_height:
+            self.top = self.selected - table_height + 1
+
+    def run(self):
+        """
+        Main loop: draw, wait for a key (waking up to clear the status line), act on it.
+        """
+        curses.curs_set(0)
+        self.stdscr.timeout(500)
+        while True:
+            self.render()
+            key = self.stdscr.getch()
+            if key == -1:
+                continue
+            page = self.table_height()
+            navigation = {
+                curses.KEY_UP: -1, ord('k'): -1,
+                curses.KEY_DOWN: 1, ord('j'): 1,
+                curses.KEY_PPAGE: -page, curses.KEY_NPAGE: page,
+                curses.KEY_HOME: -10 ** 9, curses.KEY_END: 10 ** 9,
+            }
+            if key == curses.KEY_RESIZE:
+                self.redraw_all()
+            elif key in navigation:
+                self.move_selection(navigation[key])
+            elif key in (27, ord('b')):
+                self.show_saved_list()
+            elif 0 <= key < 256 and chr(key).lower() in KEY_ACTIONS:
+                if not self.route(KEY_ACTIONS[chr(key).lower()]):
+                    return
+
+    def route(self, user_choice):
+        """
+        Carry out task menu action, mirroring route_choice.
+
+        :param user_choice:     Action code (as in route_choice)
+        :return:                False if user_choice == 'M' (quit), True otherwise
+        """
+        if user_choice == 'M':
+            if self.results is not None or self.text_lines is not None:
+                self.show_saved_list()
+                return True
+            return False
+        elif user_choice == 'A':
+            self.add_task()
+        elif user_choice == 'C':
+            self.complete_task()
+        elif user_choice == 'E':
+            self.edit_task()
+        elif user_choice == 'O':
+            self.busy("Checking overdue tasks...")
+            self.show_text("OVERDUE TASKS", get_overdue_tasks(self.user_list) or ["No overdue tasks."])
+            self.set_status("")
+        elif user_choice == 'SE':
+            self.search_tasks()
+        elif user_choice == 'ST':
+            self.sort_tasks()
+        elif user_choice == 'F':
+            self.filter_tasks()
+        elif user_choice == 'SV':
+            self.open_saved_view()
+        elif user_choice == 'N':
+            self.show_results("NEXT UP", get_next_up_tasks(self.user_list, filename=self.filename))
+        elif user_choice == 'D':
+            self.busy("Checking tasks due soon...")
+            self.show_results("DUE SOON", get_due_soon_tasks(self.user_list))
+            self.set_status(f"{len(self.task_ids)} task(s) due in the next week. 'b' to go back.")
+        elif user_choice == 'P':
+            self.busy("Getting progress stats...")
+            # Report lines are laid out for the terminal: one screen line per line of text, tabs as spaces
+            lines = [line.replace('\t', '    ').rstrip()
+                     for message in get_progress_report(self.user_list) for line in message.split('\n')]
+            self.show_text("PROGRESS", lines)
+            self.set_status("")
+        elif user_choice in ('U', 'R'):
+            message = undo_change(self.user_list, redo=user_choice == 'R')
+            self.show_saved_list()
+            self.set_status(message)
+        return True
+
+    # --- Actions
+
+    def add_task(self):
+        quick_input = self.prompt("Add (Task title/Description/YYYY-MM-DD/Priority 1-3, or @file): ")
+        if not quick_input:
+            return
+        if quick_input.startswith('@'):
+            self.add_task_batch(quick_input[1:].strip())
+            return
+        try:
+            row = parse_quick_add_input(quick_input, '/')
+        except ValueError as e:
+            self.set_status(f"(!) {e}")
+            return
+        match = check_duplicates(self.user_list, [row])[0]
+        if match and self.prompt(f"(!) {describe_duplicate(self.user_list, row[0], match)} "
+                                 "Add anyway? (y/n): ").upper() != 'Y':
+            return
+        task_name, description, due_date, priority, recurrence = row
+        save_new_task(self.user_list, task_name, description, due_date, priority, recurrence)
+        self.show_saved_list()
+        self.set_status("✓ Task added successfully!")
+
+    def add_task_batch(self, filepath):
+        try:
+            rows, errors = parse_quick_add_batch(read_quick_add_file(filepath), '/')
+        except OSError as e:
+            self.set_status(f"(!) Could not read file: {e.strerror}.")
+            return
+        rows, duplicate_msgs = sort_out_duplicates(self.user_list, rows)
+        new_task_ids = save_new_tasks(self.user_list, rows)
+        self.show_saved_list()
+        if errors or duplicate_msgs:
+            self.show_text(f"QUICK ADD: {len(new_task_ids)} added, {len(errors)} line(s) could not be added, "
+                           f"{len(duplicate_msgs)} possible duplicate(s)",
+                           [f"Line {line_num}: {error}" for line_num, error in errors] + duplicate_msgs)
+        self.set_status(f"✓ {len(new_task_ids)} task(s) added successfully!")
+
+    def complete_task(self):
+        task_id = self.selected_task_id()
+        if task_id is None:
+            return
+        if self.prompt(f"Mark TaskID {task_id} COMPLETE? ('u' undoes it) (y/n): ").upper() != 'Y':
+            return
+        mark_task_complete(task_id, self.user_list)
+        self.show_saved_list()
+        self.set_status("✓ Task successfully marked completed!")
+
+    def edit_task(self):
+        task_id = self.selected_task_id()
+        if task_id is None:
+            return
+        # Occurrence of a recurring task: edit the task itself
+        task_id = split_task_key(task_id)[0]
+        task = self.user_list[task_id]
+        validators = {'due_date': validate_date_input, 'priority': validate_priority_input,
+                      'recurrence': parse_recurrence}
+        updates = {}
+        for attribute in ['task_name', 'description', 'due_date', 'priority', 'recurrence']:
+            label = "repeat" if attribute == 'recurrence' else attribute.replace("_", " ")
+            value = self.prompt(f"New {label} (ENTER keeps '{task.get_attribute(attribute) or ''}'): ")
+            if not value:
+                continue
+            try:
+                updates[attribute] = validators[attribute](value) if attribute in validators else value
+            except ValueError as e:
+                self.set_status(f"(!) {e}")
+                return
+        update_task(self.user_list, task_id, updates)
+        self.show_saved_list()
+        self.set_status("✓ Task edited successfully!")
+
+    def search_tasks(self):
+        search_field = self.prompt_field("search within")
+        if search_field is None:
+            return
+        search_term = alias_priority(search_field, self.prompt("Search term: "))
+        self.busy("Searching...")
+        result_list = run_search(self.user_list, search_field, search_term)
+        if not result_list:
+            self.set_status("SEARCH RESULTS: No matches found.")
+            return
+        self.show_results("SEARCH RESULTS", result_list)
+        self.set_status(f"{len(self.task_ids)} match(es) found. 'b' to go back.")
+
+    def sort_tasks(self):
+        sort_field = self.prompt_field("sort by")
+        if sort_field is None:
+            return
+        sort_order = self.prompt("Ascending ('asc') or Descending ('desc'): ").lower()
+        if sort_order not in ('asc', 'desc'):
+            self.set_status("(!) Invalid sort order.")
+            return
+        self.busy("Sorting...")
+        run_sort(self.user_list, sort_field, sort_order)
+        self.show_saved_list()
+        self.set_status("✓ Tasks sorted.")
+
+    def filter_tasks(self):
+        filter_list = []
+        while True:
+            field_name = self.prompt_field("filter by")
+            if field_name is None:
+                break
+            operators = "'is', 'contains', 'between'" if field_name == 'due_date' else "'is', 'contains'"
+            operator = self.prompt(f"Operator ({operators}): ").lower()
+            if operator == 'between' and field_name == 'due_date':
+                value = [self.prompt("First value: "), self.prompt("Second value: ")]
+            elif operator in ('is', 'contains'):
+                operator = "==" if operator == "is" else operator
+                value = alias_priority(field_name, self.prompt("Value to filter by: "))
+            else:
+                self.set_status("(!) Invalid operator.")
+                return
+            filter_list.append({"field_name": field_name, "operator": operator, "value": value})
+            if self.prompt("Add another filter? (y/n): ").upper() != 'Y':
+                break
+        if not filter_list:
+            return
+
+        match = self.prompt("Match ALL filters ('all') or ANY filters ('any'): ").upper()
+        logical_op = "OR" if match in ('ANY', 'OR') else "AND"
+        self.busy("Filtering...")
+        result_list = run_filter(self.user_list, filter_list, logical_op)
+        self.show_results("FILTERED TASKS", result_list)
+        self.set_status(f"{len(self.task_ids)} task(s). 'b' to go back.")
+
+    def open_saved_view(self):
+        saved_views = get_saved_views(self.filename)
+        names = saved_views.names()
+        if not names:
+            self.set_status("You have no saved views yet.")
+            return
+        self.show_text("SAVED VIEWS", [f"{num}. {name}" for num, name in enumerate(names, start=1)])
+        self.render()
+        choice = self.prompt("View number to open: ")
+        if not choice.isdigit() or not 1 <= int(choice) <= len(names):
+            self.show_saved_list()
+            return
+        name = names[int(choice) - 1]
+        tasks = get_saved_view_tasks(saved_views, name, self.user_list)
+        # Dictionary keeps the view's sort order
+        self.show_results(f"VIEW: {name}", {task.id: task for task in tasks})
@@ -0,0 +1,351 @@
+# Description:  Saved views: named filter lists (+ logical_op and sort order) whose
+#               matching tasks are kept as live result sets. Each add/edit/complete is
+#               tested against every view's predicate, so membership stays current
+#               without re-running the filter. Persisted in a side file next to the list,
+#               with membership changes appended to a log file (<list>.views.log) and folded
+#               into the views file every VIEWS_LOG_LIMIT changes, so a change costs
+#               O(changed tasks) to persist, not O(members of every view).
+#
+#               The predicates here are used wherever filters are tested locally (views,
+#               daemon, recurring task occurrences). They follow the Filter Service:
+#               case-insensitive, 'is' an exact match, 'contains' a substring match, except
+#               that due date 'between' compares dates, with 'YYYY' or 'YYYY-MM' bounds
+#               covering the whole year or month (the window due_date_window and shards use).
+
+
+import calendar, os, pickle
+from datetime import date
+
+
+VIEWS_LOG_LIMIT = 200       # Logged changes kept before folding them into the views file
+
+_saved_views = {}
+
+
+def views_path(filename):
+    """
+    Get filepath of the saved views that belong to a saved list.
+
+    :param filename:    Filepath of saved list
+    :return:            Filepath of saved views (str)
+    """
+    return os.path.splitext(filename)[0] + '.views'
+
+
+def views_log_path(filename):
+    """
+    Get filepath of the log of membership changes not yet folded into the saved views.
+
+    :param filename:    Filepath of saved list
+    :return:            Filepath of views log (str)
+    """
+    return views_path(filename) + '.log'
+
+
+def get_saved_views(filename):
+    """
+    Get saved views of saved list, loading them from file the first time.
+
+    :param filename:    Filepath of saved list
+    :return:            SavedViews
+    """
+    if filename not in _saved_views:
+        _saved_views[filename] = SavedViews.load(filename)
+    return _saved_views[filename]
+
+
+def drop_saved_views(filename):
+    """
+    Forget loaded saved views of saved list (e.g. when the list is closed).
+    They are loaded from file again on next use.
+
+    :param filename:    Filepath of saved list
+    """
+    _saved_views.pop(filename, None)
+
+
+def get_field_value(task, field_name):
+    """
+    Get task field as a string, formatted the way tasks are sent to the Filter Service.
+
+    :param task:        Task object
+    :param field_name:  Name of field
+    :return:            Field value (str)
+    """
+    value = task.get_attribute(field_name)
+    if field_name == 'due_date':
+        return value.strftime("%Y-%m-%d") if value else ""
+    return str(value) if value not in (None, "") else ""
+
+
+def parse_window_bound(value, last):
+    """
+    Get date from a 'between' filter value ('YYYY', 'YYYY-MM' or 'YYYY-MM-DD').
+
+    :param value:   Filter value
+    :param last:    If True, get last date the value covers, else first
+    :return:        Date, or None if value is not a date
+    """
+    parts = str(value).strip().split('-')
+    try:
+        year = int(parts[0])
+        month = int(parts[1]) if len(parts) > 1 else (12 if last else 1)
+        days = calendar.monthrange(year, month)[1]
+        day = int(parts[2][:2]) if len(parts) > 2 else (days if last else 1)
+        return date(year, month, min(day, days))
+    except (ValueError, IndexError):
+        return None
+
+
+def task_matches_filter(task, task_filter):
+    """
+    Test task against a single filter from get_filter_list.
+    Comparisons are case-insensitive; 'between' is inclusive, and compares due dates as dates
+    (bounds that are not dates fall back to comparing strings).
+
+    :param task:        Task object
+    :param task_filter: Dictionary with field_name, operator, value
+    :return:            True if task matches filter
+    """
+    field_name = task_filter["field_name"]
+    operator = task_filter["operator"]
+
+    if operator == "between" and field_name == 'due_date':
+        due_date = task.get_attribute('due_date')
+        low, high = task_filter["value"]
+        low, high = parse_window_bound(low, last=False), parse_window_bound(high, last=True)
+        if low is not None and high is not None:
+            return bool(due_date) and low <= due_date <= high
+
+    field_value = get_field_value(task, field_name).lower()
+    if operator == "between":
+        low, high = (str(value).strip().lower() for value in task_filter["value"])
+        return field_value != "" and low <= field_value <= high
+    value = str(task_filter["value"]).strip().lower()
+    if operator == "contains":
+        return value in field_value
+    return field_value == value
+
+
+def task_matches_view(task, view):
+    """
+    Test task against all filters of a view, combined by its logical_op.
+    Only incomplete tasks are members of a view.
+
+    :param task:    Task object
+    :param view:    View dictionary
+    :return:        True if task belongs in view
+    """
+    if task.status != 'incomplete':
+        return False
+    return task_matches_filters(task, view["filters"], view["logical_op"])
+
+
+def task_matches_filters(task, filters, logical_op):
+    """
+    Test task against a list of filters, combined by logical_op.
+
+    :param task:        Task object
+    :param filters:     List of filters from get_filter_list
+    :param logical_op:  'AND' or 'OR'
+    :return:            True if task matches
+    """
+    matches = (task_matches_filter(task, task_filter) for task_filter in filters)
+    return all(matches) if logical_op == "AND" else any(matches)
+
+
+def view_sort_key(field_name):
+    """
+    Get sort key function for a view's sort field. Blank values sort last.
+
+    :param field_name:  Name of field to sort by
+    :return:            Key function for sorted()
+    """
+    def sort_key(task):
+        value = task.get_attribute(field_name)
+        if value in (None, ""):
+            return True, ""
+        if field_name in ('id', 'priority'):
+            return False, int(value)
+        if field_name == 'due_date':
+            return False, value.toordinal()
+        return False, str(value).lower()
+    return sort_key
+
+
+class SavedViews:
+    """
+    Saved views of one saved list, with the TaskIDs currently in each view.
+    """
+    def __init__(self, filename, views=None, synced_mtime=None, logged=0):
+        self.filename = filename
+        self.views = views if views is not None else {}
+        # mtime of saved list when membership was last brought up to date
+        self.synced_mtime = synced_mtime
+        # Changes in the views log, not yet folded into the views file
+        self.logged = logged
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load saved views from file, then replay the changes logged since.
+        A change cut short (e.g. by a crash) ends the replay; the views then show as
+        stale and are rebuilt.
+        Requires pickle module.
+
+        :param filename:    Filepath of saved list
+        :return:            SavedViews
+        """
+        try:
+            with open(views_path(filename), 'rb') as readfile:
+                data = pickle.load(readfile)
+        except (FileNotFoundError, EOFError):
+            return cls(filename)
+        saved_views = cls(filename, data["views"], data["synced_mtime"])
+        try:
+            with open(views_log_path(filename), 'rb') as readfile:
+                while True:
+                    synced_mtime, changes = pickle.load(readfile)
+                    saved_views.apply_changes(changes)
+                    saved_views.synced_mtime = synced_mtime
+                    saved_views.logged += 1
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+            pass
+        return saved_views
+
+    def list_mtime(self):
+        """
+        Get mtime of saved list (None if not saved).
+        """
+        try:
+            return os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return None
+
+    def save(self):
+        """
+        Save views and membership, stamped with the saved list's current mtime,
+        and clear the views log.
+        Requires pickle module.
+        """
+        self.synced_mtime = self.list_mtime()
+        with open(views_path(self.filename), 'wb') as outputfile:
+            pickle.dump({"views": self.views, "synced_mtime": self.synced_mtime}, outputfile)
+        try:
+            os.remove(views_log_path(self.filename))
+        except FileNotFoundError:
+            pass
+        self.logged = 0
+
+    def log_changes(self, changes):
+        """
+        Append membership changes to the views log, stamped with the saved list's current mtime.
+        Every VIEWS_LOG_LIMIT changes the log is folded into the views file instead.
+        Requires pickle module.
+
+        :param changes:     List of (view name, TaskID, True if added / False if removed)
+        """
+        if self.logged >= VIEWS_LOG_LIMIT:
+            self.save()
+            return
+        self.synced_mtime = self.list_mtime()
+        with open(views_log_path(self.filename), 'ab') as outputfile:
+            pickle.dump((self.synced_mtime, changes), outputfile)
+        self.logged += 1
+
+    def apply_changes(self, changes):
+        """
+        Apply logged membership changes to views (changes to deleted views are skipped).
+
+        :param changes:     List of (view name, TaskID, True if added / False if removed)
+        """
+        for name, task_id, added in changes:
+            view = self.views.get(name)
+            if view is None:
+                continue
+            if added:
+                view["members"].add(task_id)
+            else:
+                view["members"].discard(task_id)
+
+    def is_stale(self):
+        """
+        Check if saved list was changed without updating the views (e.g. by another process).
+        """
+        try:
+            return self.synced_mtime != os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return False
+
+    def names(self):
+        """
+        Get names of saved views, in order created.
+        """
+        return list(self.views)
+
+    def members(self, name):
+        """
+        Get TaskIDs in view.
+        """
+        return self.views[name]["members"]
+
+    def add_view(self, name, filters, logical_op, sort_field, sort_order, task_list):
+        """
+        Save new view (or replace view with same name), and fill it from task list.
+
+        :param name:        Name of view
+        :param filters:     List of filters from get_filter_list
+        :param logical_op:  'AND' or 'OR'
+        :param sort_field:  Field to sort view by, or None
+        :param sort_order:  'asc' or 'desc'
+        :param task_list:   Dictionary of user tasks
+        """
+        view = {
+            "filters": filters,
+            "logical_op": logical_op,
+            "sort_field": sort_field,
+            "sort_order": sort_order
+        }
+        view["members"] = {task_id for task_id, task in task_list.items() if task_matches_view(task, view)}
+        self.views[name] = view
+        self.save()
+
+    def remove_view(self, name):
+        """
+        Delete saved view.
+        """
+        del self.views[name]
+        self.save()
+
+    def rebuild(self, task_list):
+        """
+        Recompute membership of every view from the whole task list.
+
+        :param task_list:   Dictionary of user tasks
+        """
+        if not self.views:
+            return
+        for view in self.views.values():
+            view["members"] = {task_id for task_id, task in task_list.items() if task_matches_view(task, view)}
+        self.save()
+
+    def update(self, task_list, task_ids):
+        """
+        Update membership of every view for tasks that were added or changed,
+        and log the changes. Costs O(views) per changed task.
+
+        :param task_list:   Dictionary of user tasks
+        :param task_ids:    TaskIDs of added/changed tasks
+        """
+        if not self.views:
+            return
+        changes = []
+        for task_id in task_ids:
+            task = task_list.get(task_id)
+            for name, view in self.views.items():
+                member = task is not None and task_matches_view(task, view)
+                if member != (task_id in view["members"]):
+                    changes.append((name, task_id, member))
+        self.apply_changes(changes)
+        # Logged even without changes, to stamp the views as up to date with the list
+        self.log_changes(changes)
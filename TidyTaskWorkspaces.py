@@ -0,0 +1,179 @@
+# Description:  Workspaces: named task lists, one saved list each. The 'default' workspace is
+#               the original userlist.pkl; others are saved in the lists/ folder.
+#               Open lists are kept in memory in an LRU, bounded by number of lists and their
+#               estimated size, so switching between recently used lists is instant. Evicted lists drop
+#               their in-memory saved views, next-up ranking, duplicate index, undo history and
+#               description cache; they are already saved, since every change is written through
+#               when it is made.
+
+
+import os, re
+from collections import OrderedDict
+from TidyTaskBodies import drop_body_store
+from TidyTaskCache import store_revision
+from TidyTaskDuplicates import drop_duplicate_index
+from TidyTaskHistory import drop_history
+from TidyTaskNextUp import drop_next_up
+from TidyTaskViews import drop_saved_views
+
+
+DEFAULT_WORKSPACE = 'default'
+DEFAULT_FILE = 'userlist.pkl'
+WORKSPACE_DIR = 'lists'
+NAME_PATTERN = re.compile(r'^[\w-]{1,40}$')
+TASK_BYTES = 400            # Approximate size of a loaded Task (object, attributes, dict entry), without text
+INDEX_BYTES = 20            # Size of description file index entry of a description not in memory
+
+
+def workspace_path(name):
+    """
+    Get filepath of saved list of workspace.
+
+    :param name:    Name of workspace
+    :return:        Filepath (str)
+    """
+    if name == DEFAULT_WORKSPACE:
+        return DEFAULT_FILE
+    return os.path.join(WORKSPACE_DIR, name + '.pkl')
+
+
+def list_workspaces():
+    """
+    Get names of all workspaces, 'default' first.
+    """
+    try:
+        names = sorted(name[:-len('.pkl')] for name in os.listdir(WORKSPACE_DIR) if name.endswith('.pkl'))
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_WORKSPACE] + [name for name in names if name != DEFAULT_WORKSPACE]
+
+
+def estimate_list_bytes(task_list):
+    """
+    Estimate memory taken by loaded task list: a fixed size per task, plus its title and
+    description. Descriptions of split lists are not in memory, so only their index entry counts.
+
+    :param task_list:   Dictionary of user tasks
+    :return:            Estimated size in bytes (int)
+    """
+    size = TASK_BYTES * len(task_list)
+    for task in task_list.values():
+        size += len(task.task_name)
+        size += INDEX_BYTES if task.deferred_description is not None else len(task.description or '')
+    return size
+
+
+def validate_workspace_name(name):
+    """
+    Validate name of new workspace (letters, numbers, '-' and '_', up to 40 characters).
+    Raise ValueError if invalid.
+
+    :param name:    Name of workspace
+    :return:        Name (str)
+    """
+    name = name.strip()
+    if not NAME_PATTERN.match(name):
+        raise ValueError("Use up to 40 letters, numbers, '-' or '_' for a list name.")
+    return name
+
+
+class WorkspaceManager:
+    """
+    Tracks the current workspace and keeps recently used lists loaded (LRU).
+    """
+    def __init__(self, loader, max_open=16, max_bytes=128 * 2**20):
+        self._loader = loader           # Function(filename) -> task list (import_list)
+        self.max_open = max_open
+        self.max_bytes = max_bytes      # Budget for estimated size of open lists (estimate_list_bytes)
+        self.current = DEFAULT_WORKSPACE
+        self._open = OrderedDict()      # filename -> [task list, revision when loaded/last seen, estimated size]
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def current_file(self):
+        """
+        Filepath of the current workspace's saved list.
+        """
+        return workspace_path(self.current)
+
+    def switch(self, name):
+        """
+        Make workspace current (creating its list if new) and get its list.
+
+        :param name:    Name of workspace
+        :return:        Task list
+        """
+        if name != DEFAULT_WORKSPACE:
+            os.makedirs(WORKSPACE_DIR, exist_ok=True)
+        self.current = name
+        return self.current_list()
+
+    def current_list(self):
+        """
+        Get task list of current workspace.
+        """
+        return self.get(self.current_file)
+
+    def get(self, filename):
+        """
+        Get loaded list, loading it if not open (or if changed by another process since).
+        Its size is estimated again only when it was saved since last seen.
+        Marks it most recently used and evicts cold lists past the budget.
+
+        :param filename:    Filepath of saved list
+        :return:            Task list
+        """
+        revision = store_revision(filename)
+        entry = self._open.get(filename)
+        if entry is not None:
+            saves, mtime = revision
+            last_saves, last_mtime = entry[1]
+            # File changed without a save from this process: reload
+            if mtime != last_mtime and saves == last_saves:
+                entry = None
+            elif revision != entry[1]:
+                entry[1:] = [revision, estimate_list_bytes(entry[0])]
+        if entry is None:
+            task_list = self._loader(filename)
+            entry = [task_list, store_revision(filename), estimate_list_bytes(task_list)]
+            self.loads += 1
+        self._open[filename] = entry
+        self._open.move_to_end(filename)
+        self._evict(keep=filename)
+        return entry[0]
+
+    def _evict(self, keep):
+        """
+        Close least recently used lists until within max_open and max_bytes.
+        """
+        while len(self._open) > 1 and (len(self._open) > self.max_open or self.open_bytes() > self.max_bytes):
+            filename = next(iter(self._open))
+            if filename == keep:
+                break
+            self.close(filename)
+
+    def close(self, filename):
+        """
+        Drop list and its in-memory saved views, next-up ranking, duplicate index, undo history and
+        description cache.
+        """
+        if self._open.pop(filename, None) is not None:
+            drop_saved_views(filename)
+            drop_next_up(filename)
+            drop_duplicate_index(filename)
+            drop_history(filename)
+            drop_body_store(filename)
+            self.evictions += 1
+
+    def open_files(self):
+        """
+        Get filepaths of open lists, most recently used last.
+        """
+        return list(self._open)
+
+    def open_bytes(self):
+        """
+        Get total estimated size of open lists, as of when each was loaded or last saved.
+        """
+        return sum(entry[2] for entry in self._open.values())
@@ -0,0 +1,36 @@
+# Description:  Shared fixtures for the Tidy Task tests. Modules live at the top of the repo,
+#               so it is put on the import path. Every test runs in its own temp folder.
+
+
+import os, sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TidyTaskModules import add_new_tasks, record_task_changes, save_list
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    """
+    Run test in its own temp folder, so saved lists never touch the repo.
+    """
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def new_list(tmp_path):
+    """
+    Make a saved list from rows of task data.
+
+    :return:    Function(rows, name='userlist.pkl') -> (task list, filepath)
+    """
+    def make(rows=(), name='userlist.pkl'):
+        filename = str(tmp_path / name)
+        task_list = {}
+        save_list(task_list, filename)
+        if rows:
+            task_ids = add_new_tasks(task_list, list(rows))
+            record_task_changes(task_list, task_ids, filename)
+        return task_list, filename
+    return make
@@ -0,0 +1,49 @@
+from datetime import date, datetime
+import pytest
+
+np = pytest.importorskip("numpy")
+from TidyTaskAnalytics import (burndown, columns_from_tasks, load_columns, mean_time_to_complete, overdue_aging,
+                               weekly_throughput)
+from TidyTaskModules import save_list
+
+TODAY = date(2026, 11, 18)      # A Wednesday
+
+
+@pytest.fixture
+def columns_list(new_list):
+    task_list, filename = new_list([("Open", "", date(2026, 11, 17), 1), ("Late", "", date(2026, 10, 1), 2),
+                                    ("Done", "", "", 3), ("Done early", "", "", 3), ("Done undated", "", "", 1)])
+    for task_id, created, completed in [(1, 10, None), (2, 12, None), (3, 10, 16), (4, 12, 13), (5, None, None)]:
+        task = task_list[task_id]
+        task.created_at = datetime(2026, 11, created, 12) if created else None
+        if task_id >= 3:
+            task.set_complete()
+            task.completed_at = datetime(2026, 11, completed, 12) if completed else None
+    save_list(task_list, filename)
+    return task_list, filename
+
+
+def test_snapshot_columns_match_task_columns(columns_list):
+    task_list, filename = columns_list
+    from_snapshot, from_tasks = load_columns(filename, task_list), columns_from_tasks(task_list)
+    assert from_snapshot.keys() == from_tasks.keys()
+    for name in from_tasks:
+        assert np.array_equal(from_snapshot[name], from_tasks[name]), name
+
+
+def test_metrics(columns_list):
+    task_list, _ = columns_list
+    columns = columns_from_tasks(task_list)
+    today = TODAY.toordinal()
+
+    days, open_counts = burndown(columns, today, days=9)
+    assert days[0] == date(2026, 11, 10).toordinal()
+    # Nov 10: 2 created; Nov 12: +2; Nov 13: -1; Nov 16: -1
+    assert list(open_counts) == [2, 2, 4, 3, 3, 3, 2, 2, 2]
+
+    weeks, counts = weekly_throughput(columns, today, weeks=2)
+    assert [date.fromordinal(int(week)) for week in weeks] == [date(2026, 11, 9), date(2026, 11, 16)]
+    assert list(counts) == [1, 1]
+
+    assert mean_time_to_complete(columns) == {3: (3.5, 2)}
+    assert overdue_aging(columns, today) == [((1, 7), 1), ((8, 30), 0), ((31, None), 1)]
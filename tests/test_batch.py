@@ -0,0 +1,94 @@
+import functools, json, socket, threading
+import pytest, zmq
+import TidyTaskBatch, TidyTaskModules
+from TidyTaskBatch import (BATCH_TAG, RequestBatch, decode_batch, encode_batch, error_reply, forward_handlers,
+                           handle_batch, serve_batch_gateway)
+from TidyTaskModules import run_queries
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def serve_replies(port, reply=True):
+    """
+    Run a single-request service on port that answers every request (or never answers).
+    """
+    def serve():
+        service = zmq.Context.instance().socket(zmq.REP)
+        service.bind(f"tcp://*:{port}")
+        while True:
+            service.recv_multipart()
+            if not reply:
+                return
+            service.send_json({"status": "success", "results": []})
+    threading.Thread(target=serve, daemon=True).start()
+
+
+def test_envelope_round_trip():
+    operations = [{"op": "search", "params": {"field": "task_name", "term": "milk"}}]
+    assert decode_batch(encode_batch(operations, [{"id": 1}])) == (operations, [{"id": 1}])
+    with pytest.raises(ValueError):
+        decode_batch([b'other', b'[]', b'[]'])
+
+
+def test_each_operation_answered_in_order():
+    def failing(request):
+        raise RuntimeError("boom")
+    frames = encode_batch([{"op": "search", "params": {"field": "task_name", "term": "a"}},
+                           {"op": "sort", "params": {"type": "a", "field": "b", "order": "asc"}},
+                           {"op": "overdue", "params": {}}], [])
+    reply = handle_batch(frames, {"search": lambda request: {"status": "success", "term": request["search_term"]},
+                                  "sort": failing})
+    responses = json.loads(reply[1])
+    assert responses[0] == {"status": "success", "term": "a"}
+    assert responses[1] == {"status": "error", "message": "boom"}
+    assert responses[2]["status"] == "error"
+
+
+def test_error_reply_has_one_entry_per_operation():
+    frames = encode_batch([{"op": "search"}, {"op": "sort"}], [])
+    assert len(json.loads(error_reply(frames, "bad")[1])) == 2
+    assert len(json.loads(error_reply([b'junk'], "bad")[1])) == 1
+
+
+def test_gateway_fails_only_silent_services(monkeypatch):
+    search_port, sort_port, gateway_port = free_port(), free_port(), free_port()
+    monkeypatch.setattr(TidyTaskBatch, 'SERVICE_PORTS', {"search": search_port, "sort": sort_port})
+    monkeypatch.setattr(TidyTaskBatch, 'forward_handlers', functools.partial(forward_handlers, timeout=200))
+    serve_replies(search_port)
+    threading.Thread(target=serve_batch_gateway, args=(gateway_port,), daemon=True).start()
+
+    batch = RequestBatch([])
+    batch.add("search", {"field": "task_name", "term": "milk"})
+    batch.add("sort", {"type": "a", "field": "b", "order": "asc"})
+    (search, _), (sort, _) = batch.send(gateway_port, connect_timeout=2000)
+    assert search["status"] == "success"
+    assert sort["status"] == "error"
+
+    # Malformed operations still get one reply each
+    batch = RequestBatch([])
+    batch.operations = [{"params": {}}, {"params": {}}]
+    responses = batch.send(gateway_port, connect_timeout=2000)
+    assert [response["status"] for response, _ in responses] == ["error", "error"]
+
+
+def test_send_times_out_on_stalled_gateway():
+    port = free_port()
+    serve_replies(port, reply=False)
+    batch = RequestBatch([])
+    batch.add("search", {"field": "task_name", "term": "milk"})
+    with pytest.raises(ConnectionError):
+        batch.send(port, connect_timeout=2000, reply_timeout=200)
+
+
+def test_short_batch_reply_falls_back_to_single_requests(new_list, monkeypatch):
+    task_list, filename = new_list([("Buy milk", "", "", 1)])
+    monkeypatch.setattr(RequestBatch, 'send', lambda self: [({"status": "error", "message": "bad"}, 10)])
+    monkeypatch.setattr(TidyTaskModules, 'request_microservice',
+                        lambda port, request: ({"status": "success", "result": 1.0, "notifications": []}, 10))
+    completion_rate, overdue = run_queries(task_list, [("completion_rate", {}), ("overdue", {})], filename)
+    assert completion_rate == "100% of tasks completed"
+    assert overdue == []
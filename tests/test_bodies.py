@@ -0,0 +1,53 @@
+import os
+from datetime import date
+from TidyTaskBodies import BodyStore, bodies_path, get_body_store
+from TidyTaskModules import import_list, load_list, record_task_changes, set_list_bodies
+from TidyTaskSnapshot import snapshot_path
+
+ROWS = [("Call", "About the lease", date(2026, 11, 2), 3), ("Read", "", "", 1), ("Plan", "Trip ✈", "", 2)]
+
+
+def test_split_list_loads_without_descriptions(new_list):
+    _, filename = new_list(ROWS)
+    assert set_list_bodies(filename, split=True)
+    assert os.path.exists(bodies_path(filename))
+    assert b"About the lease" not in open(filename, 'rb').read()
+    assert b"About the lease" not in open(snapshot_path(filename), 'rb').read()
+
+    task_list = load_list(filename)
+    assert all(task.deferred_description is not None for task in task_list.values())
+    assert [task.description for task in task_list.values()] == ["About the lease", "", "Trip ✈"]
+    assert get_body_store(filename).stats()["descriptions"] == 2
+
+
+def test_edited_description_saved_to_description_file(new_list):
+    _, filename = new_list(ROWS)
+    set_list_bodies(filename, split=True)
+    task_list = import_list(filename)
+    task_list[2].description = "Chapter 3"
+    record_task_changes(task_list, [2], filename)
+
+    # Read through a fresh store, as another process would
+    store = BodyStore(filename)
+    assert [store.get(task_id) for task_id in (1, 2, 3)] == ["About the lease", "Chapter 3", "Trip ✈"]
+    store.close()
+
+
+def test_cache_is_bounded(new_list):
+    _, filename = new_list([(f"Task {n}", "x" * 100, "", 1) for n in range(50)])
+    set_list_bodies(filename, split=True)
+    store = BodyStore(filename, cache_entries=10, cache_bytes=500)
+    for task_id in range(1, 51):
+        assert store.get(task_id) == "x" * 100
+    assert store.stats()["bytes"] <= 500
+    store.close()
+
+
+def test_unsplit_puts_descriptions_back(new_list):
+    _, filename = new_list(ROWS)
+    set_list_bodies(filename, split=True)
+    set_list_bodies(filename, split=False)
+    assert not os.path.exists(bodies_path(filename))
+    task_list = load_list(filename)
+    assert all(task.deferred_description is None for task in task_list.values())
+    assert [task.description for task in task_list.values()] == ["About the lease", "", "Trip ✈"]
@@ -0,0 +1,56 @@
+import pytest
+import TidyTaskModules
+from TidyTaskCache import QueryCache
+from TidyTaskModules import record_task_changes, run_queries
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """
+    Stand-in for the microservices: answers completion rate queries with the next reply queued.
+    """
+    calls = []
+    replies = []
+
+    def request_microservice(port, request):
+        calls.append(request)
+        response = replies.pop(0) if replies else {"status": "success", "result": 0.5}
+        return response, len(str(response))
+    monkeypatch.setattr(TidyTaskModules, 'request_microservice', request_microservice)
+    return calls, replies
+
+
+def test_lru_evicts_past_entry_and_byte_budget():
+    cache = QueryCache(max_entries=2, max_bytes=100)
+    cache.store('a', 1, 10)
+    cache.store('b', 2, 10)
+    cache.lookup('a')
+    cache.store('c', 3, 10)
+    assert cache.lookup('b') == (False, None)
+    assert cache.lookup('a') == (True, 1)
+    cache.store('d', 4, 95)
+    assert cache.total_bytes <= 100
+
+
+def test_result_reused_until_list_is_saved(new_list, service):
+    calls, _ = service
+    task_list, filename = new_list([("Buy milk", "", "", 1)])
+    query = [("completion_rate", {})]
+    assert run_queries(task_list, query, filename) == ["50% of tasks completed"]
+    run_queries(task_list, query, filename)
+    assert len(calls) == 1
+
+    task_list[1].set_complete()
+    record_task_changes(task_list, [1], filename)
+    run_queries(task_list, query, filename)
+    assert len(calls) == 2
+
+
+def test_error_reply_is_not_cached(new_list, service):
+    calls, replies = service
+    task_list, filename = new_list([("Buy milk", "", "", 1)])
+    replies.append({"status": "error", "message": "Service down."})
+    query = [("completion_rate", {})]
+    assert run_queries(task_list, query, filename) == ["Error analyzing completion rate."]
+    assert run_queries(task_list, query, filename) == ["50% of tasks completed"]
+    assert len(calls) == 2
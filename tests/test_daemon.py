@@ -0,0 +1,56 @@
+import socket, threading
+from datetime import date
+import pytest
+from TidyTaskDaemon import DaemonClient, TaskDaemon
+from TidyTaskModules import import_list, main_menu_route, use_daemon
+
+
+def free_endpoint():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return f"tcp://127.0.0.1:{probe.getsockname()[1]}"
+
+
+@pytest.fixture
+def daemon(new_list):
+    _, filename = new_list([("Buy milk", "", date(2026, 11, 2), 1)])
+    task_daemon = TaskDaemon(filename, free_endpoint(), workers=2, commit_window=0.001)
+    threading.Thread(target=task_daemon.serve, daemon=True).start()
+    return task_daemon, DaemonClient(task_daemon.endpoint, timeout=5000)
+
+
+def test_edit_applies_and_is_saved(daemon):
+    task_daemon, client = daemon
+    task = client.edit_task(1, {"task_name": "Buy oat milk", "priority": 2})
+    assert (task.task_name, task.priority) == ("Buy oat milk", 2)
+    assert import_list(task_daemon.filename)[1].task_name == "Buy oat milk"
+
+
+def test_invalid_edit_changes_nothing(daemon):
+    task_daemon, client = daemon
+    with pytest.raises(RuntimeError, match="priority"):
+        client.edit_task(1, {"task_name": "Changed", "priority": "x"})
+    assert client.fetch_list()[1].task_name == "Buy milk"
+    assert client.fetch_list()[1].priority == 1
+
+
+def test_missing_task_is_readable_error(daemon):
+    _, client = daemon
+    with pytest.raises(RuntimeError, match="Task not found: 9999"):
+        client.complete_task(9999)
+
+
+def test_client_times_out_without_daemon():
+    client = DaemonClient(free_endpoint(), timeout=200)
+    with pytest.raises(RuntimeError, match="did not respond"):
+        client.fetch_list()
+
+
+def test_menu_survives_dead_daemon(monkeypatch, capsys):
+    monkeypatch.setattr('builtins.input', lambda prompt='': '')
+    use_daemon(DaemonClient(free_endpoint(), timeout=200))
+    try:
+        assert main_menu_route('V', {}) is True
+    finally:
+        use_daemon(None)
+    assert "did not respond" in capsys.readouterr().out
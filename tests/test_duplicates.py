@@ -0,0 +1,67 @@
+import threading
+from datetime import date
+import TidyTaskDuplicates
+from TidyTaskDaemon import DaemonClient, TaskDaemon
+from TidyTaskDuplicates import DuplicateIndex, find_duplicates, get_duplicate_index, use_near_duplicates
+from TidyTaskModules import add_new_tasks, record_task_changes
+from test_daemon import free_endpoint
+
+DUE = date(2026, 11, 2)
+
+
+def count_rebuilds(monkeypatch):
+    rebuilds = []
+    for name in ('from_rows', 'from_task_list'):
+        build = getattr(DuplicateIndex, name).__func__
+        monkeypatch.setattr(DuplicateIndex, name,
+                            classmethod(lambda cls, *args, build=build, **kwargs: rebuilds.append(1) or build(cls, *args, **kwargs)))
+    return rebuilds
+
+
+def test_exact_duplicate_ignores_case_and_punctuation(new_list):
+    task_list, filename = new_list([("Buy milk", "", DUE, 1)])
+    matches = find_duplicates(get_duplicate_index(filename, task_list),
+                              [("buy milk!", "", DUE, 2), ("Buy milk", "", "", 2), ("Walk dog", "", DUE, 2),
+                               ("walk dog", "", DUE, 2)])
+    assert matches == [('exact', 1), None, None, ('exact', None)]
+
+
+def test_index_updated_in_place_on_changes(new_list, monkeypatch):
+    task_list, filename = new_list([("Buy milk", "", DUE, 1)])
+    get_duplicate_index(filename, task_list)
+    rebuilds = count_rebuilds(monkeypatch)
+
+    task_ids = add_new_tasks(task_list, [("Walk dog", "", DUE, 2)])
+    record_task_changes(task_list, task_ids, filename)
+    task_list[1].set_complete()
+    record_task_changes(task_list, [1], filename)
+
+    index = get_duplicate_index(filename, task_list)
+    assert index.find("walk dog", DUE) == ('exact', 2)
+    assert index.find("buy milk", DUE) is None
+    assert not rebuilds
+
+
+def test_near_duplicates(new_list):
+    use_near_duplicates(True)
+    try:
+        task_list, filename = new_list([("Call mom about dinner plans", "", DUE, 1)])
+        index = get_duplicate_index(filename, task_list)
+        assert index.find("call mom re: dinner plans", DUE) == ('near', 1)
+        assert index.find("file taxes", DUE) is None
+    finally:
+        use_near_duplicates(False)
+
+
+def test_daemon_checks_with_its_own_index(new_list, monkeypatch):
+    _, filename = new_list([("Buy milk", "", DUE, 1)])
+    task_daemon = TaskDaemon(filename, free_endpoint(), workers=1, commit_window=0.001)
+    threading.Thread(target=task_daemon.serve, daemon=True).start()
+    client = DaemonClient(task_daemon.endpoint, timeout=5000)
+
+    assert client.check_duplicates([("BUY MILK", "", DUE, 1)]) == [('exact', 1)]
+    rebuilds = count_rebuilds(monkeypatch)
+    client.add_tasks([("Walk dog", "", DUE, 2)])
+    assert client.check_duplicates([("walk dog", "", DUE, 1), ("Other", "", DUE, 1)]) == [('exact', 2), None]
+    assert not rebuilds
+    assert TidyTaskDuplicates._duplicate_indexes[filename] is get_duplicate_index(filename, task_daemon.task_list)
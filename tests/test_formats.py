@@ -0,0 +1,44 @@
+import os, pickle
+from datetime import date
+import pytest
+from TidyTaskFormats import FORMAT_MAGIC, available_formats, dump_list, format_name, load_list_data
+from TidyTaskModules import get_list_format, import_list, load_list, parse_recurrence, save_list, task_from_row
+from TidyTaskSync import task_hash
+
+
+@pytest.mark.parametrize('list_format', available_formats(), ids=format_name)
+def test_every_format_round_trips(new_list, list_format):
+    task_list, filename = new_list([("Buy milk", "2%", date(2026, 11, 2), 1, parse_recurrence("weekly")),
+                                    ("Walk dog", "", "", "")])
+    task_list[2].set_complete()
+    save_list(task_list, filename, list_format)
+    assert get_list_format(filename) == list_format
+
+    loaded = load_list(filename)
+    assert list(loaded) == [1, 2]
+    assert all(task_hash(loaded[task_id]) == task_hash(task_list[task_id]) for task_id in task_list)
+
+
+def test_list_without_header_is_old_pickle(new_list):
+    task_list, filename = new_list([("Buy milk", "", "", 1)])
+    with open(filename, 'wb') as outputfile:
+        pickle.dump(dict(task_list), outputfile)
+    assert load_list(filename)[1].task_name == "Buy milk"
+
+
+def test_unknown_format_is_value_error():
+    data = dump_list({}).replace(b'pickle', b'nosuch', 1)
+    assert data.startswith(FORMAT_MAGIC)
+    with pytest.raises(ValueError):
+        load_list_data(data, task_from_row)
+    with pytest.raises(EOFError):
+        load_list_data(b'', task_from_row)
+
+
+def test_unreadable_list_is_moved_aside(tmp_path, capsys):
+    filename = str(tmp_path / 'userlist.pkl')
+    with open(filename, 'wb') as outputfile:
+        outputfile.write(FORMAT_MAGIC + b'garbage that is no list')
+    assert import_list(filename) == {}
+    assert os.path.exists(filename + '.unreadable')
+    assert "could not be read" in capsys.readouterr().out
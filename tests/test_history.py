@@ -0,0 +1,41 @@
+from TidyTaskHistory import begin_change, get_history
+from TidyTaskModules import import_list, record_task_changes
+from TidyTaskSync import LocalTransport, sync_lists
+
+
+def edit(task_list, filename, task_id, **updates):
+    change = begin_change(f"edit task {task_id}", task_list, [task_id])
+    for attribute, value in updates.items():
+        task_list[task_id].set_attribute(attribute, value)
+    record_task_changes(task_list, [task_id], filename, change)
+
+
+def test_undo_and_redo_restore_only_changed_tasks(new_list):
+    task_list, filename = new_list([("Buy milk", "", "", 1), ("Call mum", "", "", 2)])
+    edit(task_list, filename, 1, task_name="Buy oat milk")
+
+    history = get_history(filename)
+    change = history.undo(task_list)
+    record_task_changes(task_list, change.task_ids, filename, change)
+    assert task_list[1].task_name == "Buy milk"
+    assert task_list[2].task_name == "Call mum"
+    assert not history.can_undo() and history.can_redo()
+
+    change = get_history(filename).redo(task_list)
+    record_task_changes(task_list, change.task_ids, filename, change)
+    assert import_list(filename)[1].task_name == "Buy oat milk"
+
+
+def test_undo_is_newer_change_for_sync(new_list):
+    task_list, filename = new_list([("Buy milk", "", "", 1)])
+    _, peer = new_list(name='peer.pkl')
+    edit(task_list, filename, 1, task_name="Buy oat milk")
+    sync_lists(filename, LocalTransport(peer))
+
+    change = get_history(filename).undo(task_list)
+    record_task_changes(task_list, change.task_ids, filename, change)
+    assert task_list[1].revision > 1
+
+    sync_lists(filename, LocalTransport(peer))
+    assert import_list(filename)[1].task_name == "Buy milk"
+    assert import_list(peer)[1].task_name == "Buy milk"
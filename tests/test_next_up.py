@@ -0,0 +1,33 @@
+from datetime import date
+from TidyTaskModules import Task, get_next_up_tasks, import_list, record_task_changes
+from TidyTaskNextUp import NextUpHeap
+
+ROWS = [("Low, soon", "", date(2026, 11, 1), 3), ("High, late", "", date(2026, 12, 1), 1),
+        ("High, soon", "", date(2026, 11, 1), 1), ("No priority", "", date(2026, 10, 1), ""),
+        ("High, undated", "", "", 1), ("Medium", "", date(2026, 11, 5), 2)]
+
+
+def test_ranked_by_priority_then_due_date(new_list):
+    task_list, filename = new_list(ROWS)
+    assert list(get_next_up_tasks(task_list, 5, filename)) == [3, 2, 5, 6, 1]
+    # Snapshot-backed list ranks the same, reading only the top tasks
+    assert list(get_next_up_tasks(import_list(filename), 6, filename)) == [3, 2, 5, 6, 1, 4]
+
+
+def test_ranking_follows_changes(new_list):
+    task_list, filename = new_list(ROWS)
+    get_next_up_tasks(task_list, 5, filename)
+    task_list[3].set_complete()
+    task_list[1].priority = 1
+    record_task_changes(task_list, [1, 3], filename)
+    assert list(get_next_up_tasks(task_list, 3, filename)) == [1, 2, 5]
+
+
+def test_key_changed_and_back_is_ranked_once():
+    task_list = {task_id: Task(task_id, "Task", "", date(2026, 11, task_id), 2) for task_id in (1, 2, 3)}
+    heap = NextUpHeap.from_task_list(task_list)
+    for priority in (1, 2):
+        task_list[3].priority = priority
+        heap.update(task_list, [3])
+    assert heap.top(3) == [1, 2, 3]
+    assert heap.top(3) == [1, 2, 3]
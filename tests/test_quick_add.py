@@ -0,0 +1,30 @@
+from datetime import date
+import TidyTaskModules
+from TidyTaskModules import add_task_quick_batch, import_list, parse_quick_add_batch, read_quick_add_file
+
+
+def test_invalid_and_blank_lines_reported_by_line_number():
+    rows, errors = parse_quick_add_batch(["Call/About the lease/2026-11-02/3", "", "Read//someday/1",
+                                          "Water plants//2026-11-02/2/weekly"], '/')
+    assert [row[:4] for row in rows] == [("Call", "About the lease", date(2026, 11, 2), 3),
+                                         ("Water plants", "", date(2026, 11, 2), 2)]
+    assert str(rows[1][4]) == "weekly"
+    assert [line_num for line_num, _ in errors] == [3]
+
+
+def test_batch_saved_with_one_write(new_list, tmp_path, monkeypatch, capsys):
+    task_list, filename = new_list([("Call", "", date(2026, 11, 2), 3)])
+    monkeypatch.setattr(TidyTaskModules.workspaces, 'current', 'default')
+    monkeypatch.setattr('builtins.input', lambda prompt="": "")
+    monkeypatch.setattr(TidyTaskModules, 'clear_screen', lambda: None)
+    saves = []
+    save_list = TidyTaskModules.save_list
+    monkeypatch.setattr(TidyTaskModules, 'save_list', lambda *args, **kwargs: saves.append(args) or
+                        save_list(*args, **kwargs))
+    (tmp_path / "tasks.txt").write_text("Read//2026-11-03/1\ncall/dup/2026-11-02/1\nbad line\nPay rent//2026-11-01/3\n")
+
+    add_task_quick_batch(task_list, read_quick_add_file("tasks.txt"))
+    assert len(saves) == 1
+    assert [task.task_name for task in import_list(filename).values()] == ["Call", "Read", "Pay rent"]
+    output = capsys.readouterr().out
+    assert "2 tasks added" in output and "Line 3" in output and "duplicate" in output.lower()
@@ -0,0 +1,76 @@
+from datetime import date
+import TidyTaskModules
+from TidyTaskModules import (Task, TABLE_COL_WIDTHS, get_task_row_data, format_table_row, parse_recurrence,
+                             run_filter, table_col_widths)
+from TidyTaskRecurrence import (RecurrenceRule, expand_occurrences, matching_occurrences, occurrence_key,
+                                open_occurrences, split_task_key)
+
+START = date(2026, 11, 2)
+
+
+def weekly_task(task_id=1, due_date=START):
+    task = Task(task_id, "Water plants", "", due_date, 2)
+    task.set_recurrence(parse_recurrence("weekly"))
+    return task
+
+
+def test_occurrences_generated_only_inside_window():
+    task = weekly_task()
+    assert list(open_occurrences(task, date(2026, 11, 10), date(2026, 11, 30))) == [
+        date(2026, 11, 16), date(2026, 11, 23), date(2026, 11, 30)]
+    monthly = RecurrenceRule('month', anchor=date(2026, 1, 31))
+    assert list(monthly.occurrences(end=date(2026, 3, 31))) == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)]
+    assert RecurrenceRule.from_spec(monthly.spec()) == monthly
+
+
+def test_completing_occurrence_records_exception_and_moves_due_date():
+    task = weekly_task()
+    task.set_complete(date(2026, 11, 16))
+    assert task.exceptions == {date(2026, 11, 16): 'complete'}
+    assert list(open_occurrences(task, end=date(2026, 11, 23))) == [date(2026, 11, 2), date(2026, 11, 9),
+                                                                    date(2026, 11, 23)]
+    task.set_complete()
+    task.set_complete()
+    # Due date skips the completed occurrence, and exceptions before it are dropped
+    assert task.due_date == date(2026, 11, 23)
+    assert task.exceptions == {}
+    assert task.status == 'incomplete'
+
+
+def test_expanded_list_keys_occurrences():
+    expanded = expand_occurrences({1: weekly_task(), 2: Task(2, "Once", "", "", 1)}, end=date(2026, 11, 9))
+    assert list(expanded) == ['1@2026-11-02', '1@2026-11-09', 2]
+    assert expanded['1@2026-11-09'].due_date == date(2026, 11, 9)
+    assert split_task_key(occurrence_key(1, START)) == (1, START)
+    assert split_task_key("7") == (7, None)
+
+
+def test_between_filter_matches_occurrences():
+    due_filter = [{"field_name": "due_date", "operator": "between", "value": ["2026-11-05", "2026-11"]}]
+    matches = matching_occurrences({1: weekly_task()}, due_filter, "AND", (date(2026, 11, 5), date(2026, 11, 30)))
+    assert list(matches) == ['1@2026-11-09', '1@2026-11-16', '1@2026-11-23', '1@2026-11-30']
+
+
+def test_run_filter_leaves_cached_result_alone(new_list, monkeypatch):
+    monkeypatch.setattr(TidyTaskModules, 'request_microservice',
+                        lambda port, request: ({"status": "success", "results": []}, 10))
+    task_list, filename = new_list()
+    task_list[1] = weekly_task()
+    monkeypatch.setattr(TidyTaskModules.workspaces, 'current', 'default')
+    monkeypatch.setattr(type(TidyTaskModules.workspaces), 'current_file', property(lambda self: filename))
+    due_filter = [{"field_name": "due_date", "operator": "between", "value": ["2026-11-01", "2026-11-10"]}]
+    first = run_filter(task_list, due_filter, "AND")
+    assert list(first) == ['1@2026-11-02', '1@2026-11-09']
+    other_filter = [{"field_name": "due_date", "operator": "between", "value": ["2026-11-01", "2026-11-03"]}]
+    assert list(run_filter(task_list, other_filter, "AND")) == ['1@2026-11-02']
+    assert list(run_filter(task_list, due_filter, "AND")) == ['1@2026-11-02', '1@2026-11-09']
+
+
+def test_table_fits_occurrence_keys():
+    key = occurrence_key(12, START)
+    col_widths = table_col_widths([1, key])
+    assert col_widths[0] == len(key) and col_widths[1:] == TABLE_COL_WIDTHS[1:]
+    assert table_col_widths([1, 2]) == TABLE_COL_WIDTHS
+    row = format_table_row(get_task_row_data(key, weekly_task(12)), col_widths)
+    header = format_table_row(["TaskID", "Task"], col_widths[:2])
+    assert row.index("Water plants") == header.index(" Task") + 1 == len(key) + 1
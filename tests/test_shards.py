@@ -0,0 +1,58 @@
+from datetime import date
+import TidyTaskShards
+from TidyTaskModules import import_list, record_task_changes, set_list_storage
+from TidyTaskShards import ShardedTaskList, filter_shard_keys, shard_path
+
+ROWS = [("October", "", date(2026, 10, 5), 1), ("November", "", date(2026, 11, 2), 2),
+        ("Also November", "", date(2026, 11, 20), 3), ("Undated", "", "", 1)]
+
+
+def test_shards_load_only_when_their_tasks_are_needed(new_list):
+    _, filename = new_list(ROWS)
+    set_list_storage(filename, sharded=True)
+    task_list = import_list(filename)
+    assert isinstance(task_list, ShardedTaskList)
+    assert list(task_list) == [1, 2, 3, 4] and task_list.incomplete_ids() == [1, 2, 3, 4]
+    assert task_list.loaded_shard_keys() == set()
+    assert task_list[2].task_name == "November"
+    assert task_list.loaded_shard_keys() == {'2026-11'}
+
+
+def test_save_rewrites_only_changed_shards(new_list, monkeypatch):
+    _, filename = new_list(ROWS)
+    set_list_storage(filename, sharded=True)
+    task_list = import_list(filename)
+    written = []
+    write_file = TidyTaskShards.write_file
+    monkeypatch.setattr(TidyTaskShards, 'write_file', lambda path, data: written.append(path) or write_file(path, data))
+
+    task_list[2].task_name = "Edited"
+    record_task_changes(task_list, [2], filename)
+    assert written == [shard_path(filename, '2026-11'), filename]
+
+    # Completed task moves to the archive
+    written.clear()
+    task_list[1].set_complete()
+    record_task_changes(task_list, [1], filename)
+    assert sorted(written) == sorted([shard_path(filename, 'archive'), filename])
+    assert task_list.loaded_shard_keys() == {'2026-10', '2026-11', 'archive'}
+
+    reopened = import_list(filename)
+    assert reopened[2].task_name == "Edited" and reopened[1].status == 'complete'
+
+
+def test_due_date_filters_pick_month_shards():
+    keys = {'2026-10', '2026-11', '2026-12', 'undated', 'archive', 'recurring'}
+    between = {"field_name": "due_date", "operator": "between", "value": ["2026-11-01", "2026-12"]}
+    title = {"field_name": "task_name", "operator": "contains", "value": "x"}
+    assert filter_shard_keys(keys, [between, title], "AND") == {'2026-11', '2026-12', 'recurring'}
+    assert filter_shard_keys(keys, [between, title], "OR") is None
+
+
+def test_unshard_round_trips(new_list):
+    _, filename = new_list(ROWS)
+    set_list_storage(filename, sharded=True)
+    set_list_storage(filename, sharded=False)
+    task_list = import_list(filename)
+    assert not isinstance(task_list, ShardedTaskList)
+    assert [task.task_name for task in task_list.values()] == [row[0] for row in ROWS]
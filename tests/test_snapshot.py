@@ -0,0 +1,44 @@
+import os
+from datetime import date, datetime
+from TidyTaskModules import Task, import_list, load_tasks_by_id, parse_recurrence, save_list
+from TidyTaskSnapshot import SnapshotTaskList, open_snapshot, snapshot_path
+
+DUE = date(2026, 11, 2)
+
+
+def test_snapshot_round_trips_every_field(new_list):
+    task_list, filename = new_list([("Call", "About the lease", DUE, 3), ("Read", "", "", 1)])
+    task = task_list[2]
+    task.set_complete()
+    task.created_at = datetime(2026, 10, 1, 9, 30)
+    task.set_recurrence(parse_recurrence("weekly"))
+    save_list(task_list, filename)
+
+    with open_snapshot(filename) as snapshot:
+        assert len(snapshot) == 2
+        assert [snapshot.status_at(row) for row in range(2)] == ['incomplete', 'complete']
+        assert Task(*snapshot.get(1)).__dict__ == task_list[1].__dict__
+        assert Task(*snapshot.get(2)).__dict__ == task.__dict__
+        assert snapshot.get(3) is None
+
+
+def test_list_read_from_snapshot_without_full_load(new_list):
+    _, filename = new_list([("Call", "", DUE, 3), ("Read", "", DUE, 1)])
+    user_list = import_list(filename)
+    assert isinstance(user_list, SnapshotTaskList)
+    assert list(user_list) == [1, 2] and 2 in user_list
+    assert user_list.incomplete_ids() == [1, 2]
+    assert user_list._tasks is None
+    assert user_list[2].task_name == "Read"
+
+
+def test_stale_snapshot_is_ignored_and_regenerated(new_list):
+    task_list, filename = new_list([("Call", "", DUE, 3)])
+    stat = os.stat(filename)
+    os.utime(snapshot_path(filename), ns=(stat.st_atime_ns, stat.st_mtime_ns - 10**9))
+    assert open_snapshot(filename) is None
+    # Falls back to the full saved list, then regenerates the snapshot
+    assert [task.task_name for task in load_tasks_by_id(filename, [1])] == ["Call"]
+    user_list = import_list(filename)
+    assert isinstance(user_list, dict) and user_list[1].task_name == "Call"
+    assert open_snapshot(filename) is not None
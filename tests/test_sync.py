@@ -0,0 +1,52 @@
+import shutil
+from datetime import date, datetime
+from TidyTaskModules import add_new_tasks, import_list, record_task_changes
+from TidyTaskSync import LocalTransport, sync_lists, task_hash
+from test_history import edit
+
+DUE = date(2026, 11, 2)
+
+
+def replicas(new_list, rows):
+    """
+    Make a saved list and a copy of it (the other replica).
+    """
+    task_list, filename = new_list(rows)
+    peer = filename.replace('userlist', 'peer')
+    shutil.copy(filename, peer)
+    return task_list, filename, import_list(peer), peer
+
+
+def hashes(filename):
+    return {task_id: task_hash(task) for task_id, task in import_list(filename).items()}
+
+
+def test_replicas_converge_exchanging_only_changed_tasks(new_list):
+    rows = [(f"Task {n}", "", DUE, 1) for n in range(300)]
+    task_list, filename, peer_list, peer = replicas(new_list, rows)
+    # Local edits task 5 twice, peer once: local wins. Peer alone edits task 200.
+    edit(task_list, filename, 5, task_name="Local")
+    edit(task_list, filename, 5, priority=3)
+    edit(peer_list, peer, 5, task_name="Peer")
+    edit(peer_list, peer, 200, task_name="Peer only")
+
+    stats = sync_lists(filename, LocalTransport(peer))
+    assert (stats["pulled"], stats["pushed"]) == (1, 1)
+    assert hashes(filename) == hashes(peer)
+    assert import_list(peer)[5].task_name == "Local"
+    assert import_list(filename)[200].task_name == "Peer only"
+
+    stats = sync_lists(filename, LocalTransport(peer))
+    assert (stats["pulled"], stats["pushed"]) == (0, 0)
+
+
+def test_tasks_added_on_both_under_same_id_are_both_kept(new_list):
+    task_list, filename, peer_list, peer = replicas(new_list, [("Shared", "", DUE, 1)])
+    for replica, name, filepath in [(task_list, "Local new", filename), (peer_list, "Peer new", peer)]:
+        task_ids = add_new_tasks(replica, [(name, "", DUE, 2)])
+        replica[task_ids[0]].created_at = datetime(2026, 10, 1 if name == "Local new" else 2)
+        record_task_changes(replica, task_ids, filepath)
+
+    sync_lists(filename, LocalTransport(peer))
+    assert hashes(filename) == hashes(peer)
+    assert sorted(task.task_name for task in import_list(peer).values()) == ["Local new", "Peer new", "Shared"]
@@ -0,0 +1,42 @@
+import sys
+import pytest
+import TidyTask, TidyTaskTUI
+from TidyTaskTUI import TaskScreen
+
+
+class FakeScreen:
+    """
+    Stands in for a curses window: a fixed size, and drawing does nothing.
+    """
+    def getmaxyx(self):
+        return 24, 100
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.fixture
+def screen(new_list, monkeypatch):
+    monkeypatch.setattr(TaskScreen, 'render', lambda self: None)
+    task_list, filename = new_list([("Buy milk", "", "", 1), ("Walk dog", "", "", 2)])
+    return TaskScreen(FakeScreen(), task_list, filename)
+
+
+def test_shows_incomplete_tasks_of_saved_list(screen):
+    assert screen.task_ids == [1, 2]
+    screen.move_selection(1)
+    assert screen.selected_task_id() == 2
+
+
+def test_progress_shows_whole_report(screen, monkeypatch):
+    monkeypatch.setattr(TidyTaskTUI, 'get_progress_report',
+                        lambda user_list: ["\t 50% of tasks completed", "\n\t 1 overdue task:", "\t    Buy milk"])
+    screen.route('P')
+    assert screen.title == "PROGRESS"
+    assert screen.text_lines == ["     50% of tasks completed", "", "     1 overdue task:", "        Buy milk"]
+
+
+def test_tui_refuses_connect(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['TidyTask.py', '--tui', '--connect'])
+    with pytest.raises(SystemExit):
+        TidyTask.main()
@@ -0,0 +1,58 @@
+from datetime import date
+from TidyTaskModules import add_new_tasks, record_task_changes, save_list
+from TidyTaskViews import SavedViews, drop_saved_views, get_saved_views
+
+DUE = date(2026, 11, 2)
+URGENT = [{"field_name": "priority", "operator": "is", "value": "3"}]
+NOVEMBER = [{"field_name": "due_date", "operator": "between", "value": ["2026-11", "2026-11"]}]
+
+
+def test_membership_follows_adds_edits_and_completions(new_list):
+    task_list, filename = new_list([("Call", "", DUE, 3), ("Read", "", DUE, 1)])
+    saved_views = get_saved_views(filename)
+    saved_views.add_view("Urgent", URGENT, "AND", None, "asc", task_list)
+    assert saved_views.members("Urgent") == {1}
+
+    task_ids = add_new_tasks(task_list, [("Pay rent", "", DUE, 3)])
+    record_task_changes(task_list, task_ids, filename)
+    task_list[2].priority = 3
+    record_task_changes(task_list, [2], filename)
+    task_list[1].set_complete()
+    record_task_changes(task_list, [1], filename)
+    assert saved_views.members("Urgent") == {2, 3}
+
+
+def test_logged_changes_replayed_on_load(new_list):
+    task_list, filename = new_list([("Call", "", DUE, 3)])
+    get_saved_views(filename).add_view("Urgent", URGENT, "AND", None, "asc", task_list)
+    task_ids = add_new_tasks(task_list, [("Pay rent", "", DUE, 3)])
+    record_task_changes(task_list, task_ids, filename)
+
+    drop_saved_views(filename)
+    saved_views = SavedViews.load(filename)
+    assert saved_views.logged == 1
+    assert saved_views.members("Urgent") == {1, 2}
+    assert not saved_views.is_stale()
+
+
+def test_views_rebuilt_after_list_changed_elsewhere(new_list):
+    task_list, filename = new_list([("Call", "", DUE, 3)])
+    get_saved_views(filename).add_view("Urgent", URGENT, "AND", None, "asc", task_list)
+    # Another process saves the list without updating its views
+    task_list[1].priority = 1
+    save_list(task_list, filename)
+    drop_saved_views(filename)
+    saved_views = get_saved_views(filename)
+    assert saved_views.is_stale()
+
+    record_task_changes(task_list, [], filename)
+    assert saved_views.members("Urgent") == set()
+    assert not saved_views.is_stale()
+
+
+def test_between_compares_due_dates(new_list):
+    task_list, filename = new_list([("Call", "", date(2026, 11, 30), 1), ("Read", "", date(2026, 12, 1), 1),
+                                    ("Undated", "", "", 1)])
+    saved_views = get_saved_views(filename)
+    saved_views.add_view("November", NOVEMBER, "AND", None, "asc", task_list)
+    assert saved_views.members("November") == {1}
@@ -0,0 +1,43 @@
+from datetime import date
+from TidyTaskModules import Task, import_list, record_task_changes
+from TidyTaskWorkspaces import TASK_BYTES, WorkspaceManager, estimate_list_bytes
+
+DUE = date(2026, 11, 2)
+
+
+def test_size_estimate_counts_text():
+    short = {1: Task(1, "Call", "", DUE, 1)}
+    long = {1: Task(1, "Call", "x" * 10000, DUE, 1)}
+    assert estimate_list_bytes(short) == TASK_BYTES + len("Call")
+    assert estimate_list_bytes(long) == estimate_list_bytes(short) + 10000
+
+
+def test_lists_past_size_budget_are_evicted_least_recently_used(new_list):
+    _, small_a = new_list([("A", "", DUE, 1)], name='a.pkl')
+    _, small_b = new_list([("B", "", DUE, 1)], name='b.pkl')
+    _, big = new_list([("Big", "x" * 5000, DUE, 1)], name='big.pkl')
+    workspaces = WorkspaceManager(import_list, max_open=16, max_bytes=4000)
+
+    workspaces.get(small_a)
+    workspaces.get(small_b)
+    workspaces.get(small_a)
+    assert workspaces.open_files() == [small_b, small_a]
+    # One big list outweighs both small ones, though it has fewer tasks
+    workspaces.get(big)
+    assert workspaces.open_files() == [big]
+    assert workspaces.evictions == 2
+    # Most recently used list is kept even past the budget
+    assert workspaces.get(big) is workspaces.get(big)
+    assert workspaces.loads == 3
+
+
+def test_size_is_estimated_again_after_save(new_list):
+    task_list, filename = new_list([("A", "", DUE, 1)])
+    workspaces = WorkspaceManager(lambda _: task_list)
+    workspaces.get(filename)
+    before = workspaces.open_bytes()
+    task_list[1].description = "x" * 1000
+    record_task_changes(task_list, [1], filename)
+    workspaces.get(filename)
+    assert workspaces.open_bytes() == before + 1000
+    assert workspaces.loads == 1